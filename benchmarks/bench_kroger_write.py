@@ -0,0 +1,295 @@
+"""Benchmarks for kroger_write outside Nuke
+
+Runs the kroger_write hot paths against the in-memory nuke stand-in in
+benchmarks/stubs and prints the time each takes at 10, 100 and 1000 views:
+
+    python benchmarks/bench_kroger_write.py
+    python benchmarks/bench_kroger_write.py --views 100 --repeat 5 --only submit
+    python benchmarks/bench_kroger_write.py --save before.json
+    python benchmarks/bench_kroger_write.py --compare before.json
+
+Farm and publish calls return immediately unless --submit-latency,
+--publish-latency or --publish-delay is given, so the numbers are
+kroger_write's own overhead.
+The real PySide2 is used when it is installed, otherwise a stand-in that only
+lets kroger_write import.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+STUBS_DIR = os.path.join(BENCHMARKS_DIR, "stubs")
+
+sys.path.insert(0, os.path.dirname(BENCHMARKS_DIR))
+sys.path.insert(0, STUBS_DIR)
+try:
+    import PySide2  # noqa: F401
+except ImportError:
+    sys.path.append(os.path.join(BENCHMARKS_DIR, "qt_stubs"))
+
+import nuke  # noqa: E402
+import quick_write  # noqa: E402
+import hornet_deadline_utils  # noqa: E402
+import hornet_publish_utils  # noqa: E402
+import kroger_history  # noqa: E402
+import kroger_write  # noqa: E402
+
+
+DEFAULT_VIEW_COUNTS = [10, 100, 1000]
+
+# Saved script of the benchmark run, see bench_files
+SCRIPT_PATH = None
+
+
+@contextlib.contextmanager
+def bench_files():
+    """Temporary render history and saved script, removed afterwards
+
+    Keeps benchmark runs out of the user's render history. Submission
+    fingerprints hash the saved script, so the scripts get one.
+    """
+    global SCRIPT_PATH
+    history_path = kroger_history.HISTORY_DB_PATH
+    with tempfile.TemporaryDirectory(prefix="kroger_bench_") as bench_dir:
+        kroger_history.HISTORY_DB_PATH = os.path.join(bench_dir, "history.sqlite")
+        SCRIPT_PATH = os.path.join(bench_dir, "bench_shot_v001.nk")
+        with open(SCRIPT_PATH, "w") as script_file:
+            script_file.write("Root {\n inputs 0\n}\n" * 10000)
+        try:
+            yield bench_dir
+        finally:
+            kroger_history.HISTORY_DB_PATH = history_path
+            SCRIPT_PATH = None
+
+
+def new_script(view_count):
+    """Empty script with view_count views"""
+    nuke._reset([f"view{index:04d}" for index in range(view_count)])
+    if SCRIPT_PATH:
+        nuke.root().script_path = SCRIPT_PATH
+
+
+def new_kroger_write(view_count):
+    """Script with one kroger write node and its generated nodes"""
+    new_script(view_count)
+    return kroger_write.kroger_write_node(quick_write._quick_write_node)
+
+
+def dialog_data(kroger_node, bulk_submit=False, submit_workers=1, pack_target_minutes=0):
+    """What the submission dialog returns with every view selected"""
+    views = kroger_write.get_view_index(kroger_node).views()
+    return {
+        "job_name": "bench_shot_v001",
+        "global_frame_range": "1001-1100",
+        "global_priority": 60,
+        "chunk_size": 5,
+        "concurrent_tasks": 2,
+        "submit_workers": submit_workers,
+        "bulk_submit": bulk_submit,
+        "pack_target_minutes": pack_target_minutes,
+        # Every run submits the same jobs, don't skip them as unchanged
+        "skip_unchanged": False,
+        "pool": "nuke",
+        "group": "nuke",
+        "file_format": "exr",
+        "colorspace": "scene_linear",
+        "selected_views": views,
+        "view_data": {
+            view: {"frame_range": "1001-1100", "priority": 60} for view in views
+        },
+    }
+
+
+# Each benchmark is setup(view_count) -> state, run(state), only run is timed
+
+
+def setup_empty_group(view_count):
+    new_script(view_count)
+    group = nuke.createNode("Group")
+    group.addKnob(nuke.String_Knob("aspect", "Aspect", "16x9"))
+    with group:
+        nuke.createNode("Input", inpanel=False)
+    return group
+
+
+def setup_aspect_change(view_count):
+    kroger_node = new_kroger_write(view_count)
+    kroger_node["aspect"].setValue("2x1")
+    return kroger_node
+
+
+def regenerate(kroger_node, full=False):
+    with nuke._this_node(kroger_node):
+        kroger_write.regenerate_write_nodes(full=full)
+
+
+def setup_applied(view_count):
+    kroger_node = new_kroger_write(view_count)
+    view_to_node = kroger_write.get_view_index(kroger_node).mapping()
+    data = dialog_data(kroger_node)
+    kroger_write.apply_settings_to_nodes(view_to_node, data)
+    return view_to_node, data
+
+
+def setup_apply(view_count):
+    kroger_node = new_kroger_write(view_count)
+    return (
+        kroger_write.get_view_index(kroger_node).mapping(),
+        dialog_data(kroger_node),
+    )
+
+
+def setup_submit(bulk_submit=False, submit_workers=1, pack_target_minutes=0):
+    def setup(view_count):
+        kroger_node = new_kroger_write(view_count)
+        data = dialog_data(kroger_node, bulk_submit, submit_workers, pack_target_minutes)
+        return data, kroger_node
+
+    return setup
+
+
+def submit(state):
+    data, kroger_node = state
+    kroger_write.submit_renders(data, kroger_node, deadline_module=hornet_deadline_utils)
+
+
+def setup_publish(view_count):
+    kroger_node = new_kroger_write(view_count)
+    return kroger_write.get_view_index(kroger_node).views(), kroger_node
+
+
+def publish(state):
+    views, kroger_node = state
+    kroger_write.batch_publish(
+        selected_views=views,
+        kroger_node=kroger_node,
+        publish_module=hornet_publish_utils,
+    )
+
+
+BENCHMARKS = [
+    ("kroger_write_node", new_script, lambda _: kroger_write.kroger_write_node()),
+    (
+        "create_write_nodes_for_views",
+        setup_empty_group,
+        lambda group: kroger_write.create_write_nodes_for_views(
+            group, quick_write._quick_write_node
+        ),
+    ),
+    (
+        "create_write_nodes (per-node)",
+        setup_empty_group,
+        lambda group: kroger_write.create_write_nodes_for_views(
+            group, quick_write._quick_write_node, bulk=False
+        ),
+    ),
+    ("regenerate (unchanged)", new_kroger_write, regenerate),
+    ("regenerate (aspect change)", setup_aspect_change, regenerate),
+    ("regenerate (full)", new_kroger_write, lambda node: regenerate(node, full=True)),
+    (
+        "apply_settings (all changed)",
+        setup_apply,
+        lambda state: kroger_write.apply_settings_to_nodes(*state),
+    ),
+    (
+        "apply_settings (unchanged)",
+        setup_applied,
+        lambda state: kroger_write.apply_settings_to_nodes(*state),
+    ),
+    ("submit_renders (serial)", setup_submit(submit_workers=1), submit),
+    ("submit_renders (4 workers)", setup_submit(submit_workers=4), submit),
+    ("submit_renders (bulk)", setup_submit(bulk_submit=True), submit),
+    # 100 frames at the default estimate is 100 minutes, so 4 views per job
+    ("submit_renders (packed)", setup_submit(pack_target_minutes=400), submit),
+    ("batch_publish", setup_publish, publish),
+]
+
+
+def time_benchmark(setup, run, view_count, repeat):
+    """Seconds per run of run(setup(view_count)), repeat times"""
+    timings = []
+    for _ in range(repeat):
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            state = setup(view_count)
+            start = time.perf_counter()
+            run(state)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--views",
+        default=",".join(str(count) for count in DEFAULT_VIEW_COUNTS),
+        help="comma separated view counts (default: %(default)s)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark")
+    parser.add_argument(
+        "--only", default="", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument(
+        "--submit-latency", type=float, default=0.0, help="seconds per farm submit"
+    )
+    parser.add_argument(
+        "--publish-latency", type=float, default=0.0, help="seconds per publish"
+    )
+    parser.add_argument(
+        "--publish-delay",
+        type=float,
+        default=0.0,
+        help="kroger_write.PUBLISH_DELAY, seconds between published nodes",
+    )
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="show the change against a saved JSON file")
+    args = parser.parse_args(argv)
+
+    view_counts = [int(count) for count in args.views.split(",")]
+    hornet_deadline_utils.SUBMIT_LATENCY = args.submit_latency
+    os.environ["KROGER_STUB_SUBMIT_LATENCY"] = str(args.submit_latency)
+    hornet_publish_utils.PUBLISH_LATENCY = args.publish_latency
+    kroger_write.PUBLISH_DELAY = args.publish_delay
+    os.environ["DEADLINE_PATH"] = STUBS_DIR
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+
+    results = {}
+    print(f"{'benchmark':<32}{'views':>7}{'min':>11}{'median':>11}{'change':>9}")
+    with bench_files():
+        for name, setup, run in BENCHMARKS:
+            if args.only not in name:
+                continue
+            for view_count in view_counts:
+                timings = time_benchmark(setup, run, view_count, args.repeat)
+                key = f"{name} @ {view_count}"
+                results[key] = {
+                    "min": min(timings),
+                    "median": statistics.median(timings),
+                }
+
+                change = ""
+                if key in baseline and baseline[key]["min"] > 0:
+                    change = f"{min(timings) / baseline[key]['min'] - 1:+.0%}"
+                print(
+                    f"{name:<32}{view_count:>7}{min(timings) * 1000:>9.1f}ms"
+                    f"{statistics.median(timings) * 1000:>9.1f}ms{change:>9}"
+                )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as results_file:
+            json.dump(results, results_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
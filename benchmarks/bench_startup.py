@@ -0,0 +1,110 @@
+"""Startup cost of menu.py
+
+Runs menu.py in fresh Python processes against the stub nuke and reports
+how long it takes, and how long the first use of kroger_write takes after
+it. Next to it runs the eager menu.py it replaced, which imported
+quick_write and kroger_write at startup, what every Nuke launch paid:
+
+    python benchmarks/bench_startup.py [--repeat 20]
+
+The real PySide2 is used when it is installed, which is where most of the
+import time goes.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# menu.py before lazy loading, imports everything when Nuke starts
+EAGER_MENU = """
+import nuke
+import quick_write
+import kroger_write
+
+nodes_toolbar = nuke.toolbar("Nodes")
+project_toolbar = nodes_toolbar.addMenu("Kroger")
+project_toolbar.addCommand(
+    "Kroger Write Node",
+    "kroger_write.kroger_write_node(quick_write._quick_write_node)",
+    tooltip="Create a kroger write node that generates write nodes for all views",
+)
+project_toolbar.addCommand(
+    "Submit All Kroger Writes",
+    "kroger_write.submit_all_kroger_writes()",
+    tooltip="Submit every kroger write node in the script with its saved settings",
+)
+"""
+
+# Run in a fresh interpreter, prints "<menu seconds> <first use seconds>"
+_MEASURE = """
+import sys, time
+sys.path[:0] = [{repo!r}, {stubs!r}]
+try:
+    import PySide2
+except ImportError:
+    sys.path.append({qt_stubs!r})
+import __main__
+
+menu_code = {menu_code!r}
+start = time.perf_counter()
+exec(compile(menu_code, "menu.py", "exec"), __main__.__dict__)
+loaded = time.perf_counter()
+__main__.kroger_write.SUBMIT_MAX_WORKERS
+used = time.perf_counter()
+print(loaded - start, used - loaded)
+"""
+
+
+def measure_once(menu_code):
+    """(menu seconds, first kroger_write use seconds) in a fresh process"""
+    code = _MEASURE.format(
+        repo=REPO_DIR,
+        stubs=os.path.join(BENCHMARKS_DIR, "stubs"),
+        qt_stubs=os.path.join(BENCHMARKS_DIR, "qt_stubs"),
+        menu_code=menu_code,
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    menu_seconds, first_use_seconds = output.split()[-2:]
+    return float(menu_seconds), float(first_use_seconds)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20, help="processes to run")
+    args = parser.parse_args(argv)
+
+    with open(os.path.join(REPO_DIR, "menu.py"), encoding="utf-8") as menu_file:
+        lazy_menu = menu_file.read()
+
+    # Alternate the two so both see the same machine load
+    eager_timings = []
+    lazy_timings = []
+    for _ in range(args.repeat):
+        eager_timings.append(measure_once(EAGER_MENU))
+        lazy_timings.append(measure_once(lazy_menu))
+
+    print(f"{'':<36}{'min':>10}{'median':>10}")
+    for name, values in (
+        ("eager menu.py", [menu for menu, _ in eager_timings]),
+        ("lazy menu.py", [menu for menu, _ in lazy_timings]),
+        (
+            "lazy menu.py + first use",
+            [menu + first_use for menu, first_use in lazy_timings],
+        ),
+    ):
+        print(
+            f"{name:<36}{min(values) * 1000:>8.1f}ms"
+            f"{statistics.median(values) * 1000:>8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+from PySide2 import Anything, Signal  # noqa: F401
+
+
+def __getattr__(name):
+    return Anything
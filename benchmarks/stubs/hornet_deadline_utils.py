@@ -0,0 +1,18 @@
+"""Stand-in for hornet_deadline_utils, every submit takes SUBMIT_LATENCY seconds"""
+
+import threading
+import time
+
+
+SUBMIT_LATENCY = 0.0
+
+submitted = []
+_lock = threading.Lock()
+
+
+def deadlineNetworkSubmit(batch=None, silent=False, node=None):
+    if SUBMIT_LATENCY:
+        time.sleep(SUBMIT_LATENCY)
+    with _lock:
+        submitted.append((batch, node.name()))
+    return True
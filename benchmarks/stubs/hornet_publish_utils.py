@@ -0,0 +1,28 @@
+"""Stand-in for hornet_publish_utils, every node takes PUBLISH_LATENCY seconds"""
+
+import threading
+import time
+
+
+PUBLISH_LATENCY = 0.0
+
+published = []
+_lock = threading.Lock()
+
+
+def batch_publish_write_nodes(
+    write_nodes,
+    delay=1,
+    review=True,
+    review_farm=True,
+    integrate_farm=True,
+    burnin=True,
+    silent=True,
+):
+    for index, node in enumerate(write_nodes):
+        if index and delay:
+            time.sleep(delay)
+        if PUBLISH_LATENCY:
+            time.sleep(PUBLISH_LATENCY)
+        with _lock:
+            published.append(node.name())
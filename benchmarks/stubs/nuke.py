@@ -0,0 +1,500 @@
+"""In-memory stand-in for the parts of the nuke module kroger_write uses
+
+Nodes, knobs, groups and the group context stack are plain Python objects,
+so kroger_write can be driven and timed outside a Nuke session. Behaviour
+follows Nuke where kroger_write depends on it: unique node names per group,
+onCreate/onDestroy callbacks with thisNode() set, allNodes() of the current
+group context and "group.node" full names.
+
+Stand-in only helpers start with an underscore, e.g. _reset() and
+_this_node().
+"""
+
+import contextlib
+import itertools
+
+
+GUI = False
+EXE_PATH = "nuke"
+NUKE_VERSION_MAJOR = 15
+NUKE_VERSION_MINOR = 1
+
+READ_ONLY = 0x10000000
+INVISIBLE = 0x00000400
+
+_views = ["main"]
+_callbacks = {"create": [], "destroy": [], "knob": []}
+_context = []
+_this_nodes = []
+_this_knobs = []
+_messages = []
+
+
+class Knob:
+    def __init__(self, name, label=None, value=""):
+        self._name = name
+        self._label = label if label is not None else name
+        self._value = value
+        self._visible = True
+        self._flags = 0
+        self.node = None
+
+    def name(self):
+        return self._name
+
+    def label(self):
+        return self._label
+
+    def value(self):
+        return self._value
+
+    def getValue(self):
+        return self._value
+
+    def setValue(self, value):
+        self._value = value
+        return True
+
+    def evaluate(self):
+        return self._value
+
+    def setVisible(self, visible):
+        self._visible = visible
+
+    def setTooltip(self, tooltip):
+        self._tooltip = tooltip
+
+    def visible(self):
+        return self._visible
+
+    def setFlag(self, flag):
+        self._flags |= flag
+
+    def clearFlag(self, flag):
+        self._flags &= ~flag
+
+
+class String_Knob(Knob):
+    pass
+
+
+class Multiline_Eval_String_Knob(Knob):
+    pass
+
+
+class File_Knob(Knob):
+    pass
+
+
+class Text_Knob(Knob):
+    pass
+
+
+class PyScript_Knob(Knob):
+    pass
+
+
+class Int_Knob(Knob):
+    def __init__(self, name, label=None, value=0):
+        super().__init__(name, label, value)
+
+
+class Boolean_Knob(Knob):
+    def __init__(self, name, label=None, value=False):
+        super().__init__(name, label, value)
+
+
+class Enumeration_Knob(Knob):
+    def __init__(self, name, label=None, values=()):
+        super().__init__(name, label, values[0] if values else "")
+        self._values = list(values)
+
+    def values(self):
+        return list(self._values)
+
+
+class Node:
+    def __init__(self, node_class, parent=None):
+        self._class = node_class
+        self._parent = parent
+        self._knobs = {}
+        self._inputs = {}
+        self._children = [] if node_class in ("Group", "Root") else None
+        self._names = {}
+        self._numbers = {}
+        self._deleted = False
+        self._name = ""
+        for name in ("name", "xpos", "ypos"):
+            self.addKnob(Knob(name, value=0 if name != "name" else ""))
+
+    def Class(self):
+        return self._class
+
+    def name(self):
+        if self._deleted:
+            raise ValueError("A PythonObject is not attached to a node")
+        return self._name
+
+    def setName(self, name, uniquify=True):
+        parent = self._parent
+        if parent is not None:
+            parent._names.pop(self._name, None)
+            if uniquify and name in parent._names:
+                base = name.rstrip("0123456789") or name
+                for number in itertools.count(parent._numbers.get(base, 1)):
+                    candidate = f"{base}{number}"
+                    if candidate not in parent._names:
+                        parent._numbers[base] = number + 1
+                        name = candidate
+                        break
+            parent._names[name] = self
+        self._name = name
+        self._knobs["name"]._value = name
+
+    def fullName(self):
+        if self._parent is None or self._parent._class == "Root":
+            return self._name
+        return f"{self._parent.fullName()}.{self._name}"
+
+    def knob(self, name):
+        return self._knobs.get(name)
+
+    def knobs(self):
+        return dict(self._knobs)
+
+    def __getitem__(self, name):
+        knob = self._knobs.get(name)
+        if knob is None:
+            raise NameError(f"knob {name} does not exist")
+        return knob
+
+    def addKnob(self, knob):
+        knob.node = self
+        self._knobs[knob.name()] = knob
+
+    def removeKnob(self, knob):
+        self._knobs.pop(knob.name(), None)
+
+    def input(self, index):
+        return self._inputs.get(index)
+
+    def setInput(self, index, node):
+        if node is None:
+            self._inputs.pop(index, None)
+        else:
+            self._inputs[index] = node
+        return True
+
+    def inputs(self):
+        return max(self._inputs) + 1 if self._inputs else 0
+
+    def xpos(self):
+        return self._knobs["xpos"]._value
+
+    def ypos(self):
+        return self._knobs["ypos"]._value
+
+    def setXYpos(self, x, y):
+        self._knobs["xpos"]._value = x
+        self._knobs["ypos"]._value = y
+
+    def showControlPanel(self):
+        pass
+
+    def hideControlPanel(self):
+        pass
+
+    # Group context, "with group.begin():" enters the group once like Nuke
+    def begin(self):
+        _context.append(self)
+        self._begun = True
+        return self
+
+    def end(self):
+        _context.pop()
+
+    def __enter__(self):
+        if not getattr(self, "_begun", False):
+            _context.append(self)
+        self._begun = False
+        return self
+
+    def __exit__(self, *exc_info):
+        self.end()
+
+    def nodes(self):
+        return list(self._children or [])
+
+    def __repr__(self):
+        return f"<{self._class} {self.fullName()}>"
+
+
+class _Root(Node):
+    def __init__(self):
+        super().__init__("Root")
+        self._name = "root"
+        self.addKnob(Knob("first_frame", value=1001))
+        self.addKnob(Knob("last_frame", value=1100))
+        self.script_path = "/tmp/kroger_bench/bench_shot_v001.nk"
+        self._modified = False
+
+    def name(self):
+        return self.script_path
+
+    def fullName(self):
+        return "root"
+
+    def firstFrame(self):
+        return self["first_frame"].value()
+
+    def lastFrame(self):
+        return self["last_frame"].value()
+
+    def modified(self):
+        return self._modified
+
+    def setModified(self, modified):
+        self._modified = modified
+
+
+_root = _Root()
+
+
+# Default knobs of the node classes kroger_write creates
+_CLASS_KNOBS = {
+    "OneView": [("view", "main")],
+    "Write": [
+        ("file", ""),
+        ("file_type", "exr"),
+        ("colorspace", "scene_linear"),
+        ("views", "main"),
+    ],
+}
+
+
+def _current_group():
+    return _context[-1] if _context else _root
+
+
+def _run_callbacks(kind, node, knob=None):
+    for callback, args, kwargs, node_class in _callbacks[kind]:
+        if node_class and node.Class() != node_class:
+            continue
+        _this_nodes.append(node)
+        if knob is not None:
+            _this_knobs.append(knob)
+        try:
+            callback(*args, **kwargs)
+        finally:
+            _this_nodes.pop()
+            if knob is not None:
+                _this_knobs.pop()
+
+
+def _create(node_class, knob_values=None):
+    parent = _current_group()
+    node = Node(node_class, parent)
+    for name, value in _CLASS_KNOBS.get(node_class, ()):
+        node.addKnob(Knob(name, value=value))
+    node.setName(f"{node_class}1")
+    parent._children.append(node)
+    for name, value in (knob_values or {}).items():
+        if name == "name":
+            node.setName(value)
+        elif node.knob(name) is not None:
+            node[name].setValue(value)
+    _run_callbacks("create", node)
+    return node
+
+
+def createNode(node_class, knobs="", inpanel=True):
+    return _create(node_class)
+
+
+class _Nodes:
+    """nuke.nodes.<Class>(**knobs)"""
+
+    def __getattr__(self, node_class):
+        def create(**knob_values):
+            return _create(node_class, knob_values)
+
+        return create
+
+
+nodes = _Nodes()
+
+
+def delete(node):
+    _run_callbacks("destroy", node)
+    parent = node._parent
+    parent._children.remove(node)
+    parent._names.pop(node._name, None)
+    node._deleted = True
+    for other in parent._children:
+        for index, input_node in list(other._inputs.items()):
+            if input_node is node:
+                del other._inputs[index]
+
+
+def allNodes(filter=None, group=None, recurseGroups=False):
+    group = group or _current_group()
+    found = []
+    for node in group._children:
+        if filter is None or node.Class() == filter:
+            found.append(node)
+        if recurseGroups and node._children is not None:
+            found.extend(allNodes(filter, node, recurseGroups))
+    return found
+
+
+def root():
+    return _root
+
+
+def toNode(name):
+    if name == "root":
+        return _root
+    node = _current_group()
+    for part in name.split("."):
+        node = node._names.get(part) if node._children is not None else None
+        if node is None:
+            return None
+    return node
+
+
+def thisNode():
+    return _this_nodes[-1] if _this_nodes else _root
+
+
+def thisKnob():
+    return _this_knobs[-1] if _this_knobs else None
+
+
+def thisGroup():
+    return _current_group()
+
+
+def views():
+    return list(_views)
+
+
+def filename(node, *args):
+    knob = node.knob("file")
+    return knob.value() if knob is not None else None
+
+
+def message(text):
+    _messages.append(text)
+
+
+def ask(text):
+    _messages.append(text)
+    return True
+
+
+def scriptSave(path=None):
+    _root.setModified(False)
+    return True
+
+
+def scriptName():
+    return _root.script_path
+
+
+def executeInMainThreadWithResult(function, args=(), kwargs=None):
+    return function(*args, **(kwargs or {}))
+
+
+def executeInMainThread(function, args=(), kwargs=None):
+    function(*args, **(kwargs or {}))
+
+
+def addOnCreate(callback, args=(), kwargs=None, nodeClass=None):
+    _callbacks["create"].append((callback, args, kwargs or {}, nodeClass))
+
+
+def addOnDestroy(callback, args=(), kwargs=None, nodeClass=None):
+    _callbacks["destroy"].append((callback, args, kwargs or {}, nodeClass))
+
+
+def addKnobChanged(callback, args=(), kwargs=None, nodeClass=None):
+    _callbacks["knob"].append((callback, args, kwargs or {}, nodeClass))
+
+
+def toolbar(name):
+    return _Menu(name)
+
+
+def menu(name):
+    return _Menu(name)
+
+
+class _Menu:
+    def __init__(self, name):
+        self.name = name
+        self.commands = {}
+
+    def addMenu(self, name, *args, **kwargs):
+        return _Menu(f"{self.name}/{name}")
+
+    def addCommand(self, name, command=None, *args, **kwargs):
+        self.commands[name] = command
+
+
+class Undo:
+    """Undo groups don't record anything here"""
+
+    def __init__(self, name=None):
+        self.name = name
+
+    def begin(self, name=None):
+        pass
+
+    def end(self):
+        pass
+
+    def cancel(self):
+        pass
+
+    def disable(self):
+        pass
+
+    def enable(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+# Stand-in only helpers
+
+
+def _reset(view_names=("main",)):
+    """Close the script like File > Close and set the views of the new one"""
+    global _root
+    for node in allNodes(group=_root, recurseGroups=True):
+        _run_callbacks("destroy", node)
+    _root = _Root()
+    _context.clear()
+    _this_nodes.clear()
+    _this_knobs.clear()
+    _messages.clear()
+    _views[:] = list(view_names)
+
+
+@contextlib.contextmanager
+def _this_node(node):
+    """Run a block as if called from a knob of node"""
+    _this_nodes.append(node)
+    try:
+        yield node
+    finally:
+        _this_nodes.pop()
+
+
+def _knob_changed(node, knob_name):
+    """Fire knobChanged callbacks as if knob_name was edited in the UI"""
+    _run_callbacks("knob", node, node[knob_name])
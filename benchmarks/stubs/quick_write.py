@@ -0,0 +1,36 @@
+"""Stand-in for quick_write: a Group with the render setting knobs and a Write inside"""
+
+import nuke
+
+
+# Knobs of a quick write group that kroger_write reads or writes
+_GROUP_KNOBS = {
+    "views": "main",
+    "file_type": "exr",
+    "Render Start": 1001,
+    "Render End": 1100,
+    "deadlinePriority": 50,
+    "concurrentTasks": 1,
+    "deadlineChunkSize": 10,
+    "deadlinePool": "",
+    "deadlineGroup": "",
+    "colorspace": "scene_linear",
+    "publish_instance": "",
+    "quick_publish": "",
+}
+
+
+def _quick_write_node(variant_name, inpanel=True):
+    group = nuke.createNode("Group", inpanel=inpanel)
+    group.setName(f"quick_write_{variant_name}")
+    for name, value in _GROUP_KNOBS.items():
+        group.addKnob(nuke.Knob(name, value=value))
+
+    with group:
+        input_node = nuke.createNode("Input", inpanel=False)
+        write = nuke.createNode("Write", inpanel=False)
+        write.setInput(0, input_node)
+        write["file"].setValue(
+            f"/tmp/kroger_bench/render/{variant_name}/{variant_name}.####.exr"
+        )
+    return group
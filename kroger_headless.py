@@ -0,0 +1,141 @@
+"""Submit kroger write renders without the UI
+
+Every kroger write node in a script is submitted with the settings last saved
+from its submission dialog. Run it over any number of scripts:
+
+    python kroger_headless.py shot010_v003.nk shot020_v007.nk ... [--workers 4]
+
+Each script is opened in its own `nuke -t` process, up to --workers at a
+time. The same file is the script those processes run:
+
+    nuke -t kroger_headless.py --in-nuke <script.nk>
+
+The Nuke executable is taken from --nuke, then $NUKE_EXE, then "nuke" on the
+PATH.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Number of scripts submitted at the same time, each one is a nuke -t process
+HEADLESS_MAX_WORKERS = 2
+
+# Prefix of the line a nuke -t process prints its result on
+RESULT_PREFIX = "KROGER_RESULT "
+
+
+def submit_script(script_path, dry_run=False):
+    """Open a script and submit every kroger write node in it
+
+    Runs inside nuke -t, through kroger_write.submit_all_kroger_writes: one
+    batch name for the script, duplicate outputs skipped, and only the views
+    whose settings failed to apply left out. Returns a dict of succeeded,
+    failed and skipped counts, or an error.
+    """
+    import nuke
+    import kroger_write
+
+    nuke.scriptOpen(script_path)
+    totals = kroger_write.submit_all_kroger_writes(dry_run=dry_run)
+    if totals is None:
+        return {"error": "nothing submitted, see the output above"}
+
+    return {
+        "succeeded": totals["succeeded"],
+        "failed": totals["failed"] + totals["cancelled"],
+        "skipped": sum(
+            totals[key] for key in ("skipped", "unchanged", "complete", "duplicates")
+        ),
+    }
+
+
+def run_script_in_nuke(nuke_exe, script_path, dry_run=False):
+    """Submit one script in a nuke -t process, returns its result dict"""
+    command = [nuke_exe, "-t", os.path.abspath(__file__), "--in-nuke", script_path]
+    if dry_run:
+        command.append("--dry-run")
+
+    process = subprocess.run(command, capture_output=True, text=True)
+
+    result = None
+    for line in process.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            result = json.loads(line[len(RESULT_PREFIX):])
+
+    if result is None:
+        output = (process.stdout + process.stderr).strip()
+        result = {"error": f"nuke exited with {process.returncode}:\n{output[-2000:]}"}
+    return result
+
+
+def submit_scripts(script_paths, nuke_exe, max_workers=HEADLESS_MAX_WORKERS, dry_run=False):
+    """Submit scripts in parallel nuke -t processes, returns {script: result}"""
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            script_path: executor.submit(
+                run_script_in_nuke, nuke_exe, script_path, dry_run
+            )
+            for script_path in script_paths
+        }
+        results = {}
+        for script_path, future in futures.items():
+            results[script_path] = future.result()
+            print(f"{script_path}: {_describe(results[script_path])}")
+    return results
+
+
+def _describe(result):
+    if "error" in result:
+        return f"error: {result['error']}"
+    return (
+        f"{result['succeeded']} submitted, {result['failed']} failed, "
+        f"{result['skipped']} skipped"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Submit the kroger write nodes of Nuke scripts to the farm"
+    )
+    parser.add_argument("scripts", nargs="+", help=".nk scripts to submit")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=HEADLESS_MAX_WORKERS,
+        help="scripts submitted at the same time (default: %(default)s)",
+    )
+    parser.add_argument("--nuke", default=os.environ.get("NUKE_EXE", "nuke"))
+    parser.add_argument(
+        "--dry-run", action="store_true", help="apply settings but don't submit"
+    )
+    parser.add_argument("--in-nuke", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.in_nuke:
+        # nuke -t doesn't put this file's directory on the path
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        for script_path in args.scripts:
+            try:
+                result = submit_script(script_path, args.dry_run)
+            except Exception as e:
+                result = {"error": f"{type(e).__name__}: {e}"}
+            print(RESULT_PREFIX + json.dumps(result))
+        return 0
+
+    results = submit_scripts(args.scripts, args.nuke, args.workers, args.dry_run)
+    failed = [
+        script_path
+        for script_path, result in results.items()
+        if "error" in result or result["failed"]
+    ]
+    print(f"{len(results) - len(failed)} of {len(results)} scripts submitted cleanly")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
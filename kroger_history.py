@@ -0,0 +1,243 @@
+"""Local render history for kroger write submissions
+
+A small SQLite database of what was submitted through kroger_write and how
+long frames took to render, used to estimate farm time and suggest chunk
+sizes in the submission dialog. It also keeps the fingerprints of recently
+submitted jobs so unchanged views aren't sent to the farm twice. Frame times
+come from the sample-frame profiler and from the farm: kroger_write reads
+them off the rendered files of finished submissions, see
+unmeasured_submissions. Anything else that learns render times (e.g. a
+Deadline event script) can report them with record_frame_times.
+"""
+
+import contextlib
+import math
+import os
+import sqlite3
+import time
+
+
+HISTORY_DB_PATH = os.environ.get(
+    "KROGER_HISTORY_DB",
+    os.path.join(os.path.expanduser("~"), ".kroger_nuke", "render_history.sqlite"),
+)
+
+# Farm cost per render hour, 0 hides the cost in the dialog
+FARM_COST_PER_HOUR = float(os.environ.get("KROGER_FARM_COST_PER_HOUR", "0"))
+
+# Chunk size suggestions aim for tasks of about this length
+TARGET_TASK_SECONDS = 600
+MAX_SUGGESTED_CHUNK_SIZE = 50
+
+# Only the most recent samples per view count towards its average
+RECENT_SAMPLES = 200
+
+# Submissions older than this are no longer checked for farm render times
+FARM_TIMES_MAX_AGE_HOURS = 7 * 24
+
+# Hours a submitted job fingerprint counts as already on the farm
+SUBMISSION_CACHE_HOURS = float(os.environ.get("KROGER_SUBMISSION_CACHE_HOURS", "24"))
+
+# SQLite limits the number of ? parameters in one statement
+_MAX_QUERY_PARAMETERS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    script TEXT NOT NULL,
+    batch_name TEXT,
+    view TEXT NOT NULL,
+    frame_count INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    file_format TEXT
+);
+CREATE TABLE IF NOT EXISTS frame_times (
+    id INTEGER PRIMARY KEY,
+    recorded_at REAL NOT NULL,
+    submission_id INTEGER REFERENCES submissions(id),
+    script TEXT NOT NULL,
+    view TEXT NOT NULL,
+    file_format TEXT,
+    frame INTEGER,
+    seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS frame_times_view ON frame_times (view, file_format, script);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint TEXT PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    script TEXT,
+    batch_name TEXT,
+    view TEXT
+);
+"""
+
+
+@contextlib.contextmanager
+def connect(path=None):
+    """Open the history database, creating it if needed
+
+    Use as a context manager, the changes are committed when the block ends
+    without an error and the connection is closed either way.
+    """
+    path = path or HISTORY_DB_PATH
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    with contextlib.closing(sqlite3.connect(path, timeout=5)) as connection:
+        connection.executescript(_SCHEMA)
+        with connection:
+            yield connection
+
+
+def record_submissions(rows, path=None):
+    """Record submitted views
+
+    rows are dicts with script, batch_name, view, frame_count, chunk_size and
+    file_format. Returns the new submission ids in the same order.
+    """
+    now = time.time()
+    ids = []
+    with connect(path) as connection:
+        for row in rows:
+            cursor = connection.execute(
+                "INSERT INTO submissions (submitted_at, script, batch_name, view,"
+                " frame_count, chunk_size, file_format) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    now,
+                    row["script"],
+                    row.get("batch_name"),
+                    row["view"],
+                    row["frame_count"],
+                    row["chunk_size"],
+                    row.get("file_format"),
+                ),
+            )
+            ids.append(cursor.lastrowid)
+    return ids
+
+
+def record_frame_times(
+    script, view, file_format, frame_seconds, submission_id=None, path=None
+):
+    """Record observed render times, frame_seconds maps frame -> seconds"""
+    now = time.time()
+    with connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO frame_times (recorded_at, submission_id, script, view,"
+            " file_format, frame, seconds) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (now, submission_id, script, view, file_format, frame, seconds)
+                for frame, seconds in frame_seconds.items()
+            ],
+        )
+
+
+def _average_seconds(connection, where, parameters):
+    """{view: average seconds} over each view's most recent samples"""
+    # One query per view, window functions need SQLite 3.25 and older Nuke
+    # builds ship an older sqlite3
+    views = connection.execute(
+        f"SELECT DISTINCT view FROM frame_times WHERE {where}", parameters
+    ).fetchall()
+    averages = {}
+    for (view,) in views:
+        (averages[view],) = connection.execute(
+            f"SELECT AVG(seconds) FROM (SELECT seconds FROM frame_times"
+            f" WHERE {where} AND view = ? ORDER BY recorded_at DESC LIMIT ?)",
+            list(parameters) + [view, RECENT_SAMPLES],
+        ).fetchone()
+    return averages
+
+
+def seconds_per_frame(script, file_format, path=None):
+    """{view: average seconds per frame} for a script's views
+
+    Views never rendered from this script fall back to their times in other
+    scripts, which usually means other versions of the same shot.
+    """
+    with connect(path) as connection:
+        any_script = _average_seconds(connection, "file_format = ?", [file_format])
+        this_script = _average_seconds(
+            connection, "file_format = ? AND script = ?", [file_format, script]
+        )
+    any_script.update(this_script)
+    return any_script
+
+
+def unmeasured_submissions(script, path=None):
+    """Recent submissions of script without farm render times yet
+
+    Returns dicts with id, submitted_at, view, frame_count, chunk_size and
+    file_format, newest first.
+    """
+    oldest = time.time() - FARM_TIMES_MAX_AGE_HOURS * 3600
+    columns = ("id", "submitted_at", "view", "frame_count", "chunk_size", "file_format")
+    with connect(path) as connection:
+        rows = connection.execute(
+            f"SELECT {', '.join(columns)} FROM submissions"
+            " WHERE script = ? AND submitted_at >= ? AND NOT EXISTS (SELECT 1"
+            " FROM frame_times WHERE frame_times.submission_id = submissions.id)"
+            " ORDER BY submitted_at DESC",
+            (script, oldest),
+        ).fetchall()
+    return [dict(zip(columns, row)) for row in rows]
+
+
+def suggest_chunk_size(per_frame_seconds):
+    """Chunk size that makes tasks about TARGET_TASK_SECONDS long"""
+    if not per_frame_seconds or per_frame_seconds <= 0:
+        return None
+    chunk_size = math.ceil(TARGET_TASK_SECONDS / per_frame_seconds)
+    return max(1, min(chunk_size, MAX_SUGGESTED_CHUNK_SIZE))
+
+
+def format_duration(seconds):
+    """Short human readable duration, e.g. 45s, 12m, 3.5h"""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds / 3600:.1f}h"
+
+
+def record_fingerprints(rows, path=None):
+    """Remember submitted jobs and drop expired ones
+
+    rows are dicts with fingerprint, script, batch_name and view.
+    """
+    now = time.time()
+    with connect(path) as connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO fingerprints (fingerprint, submitted_at, script,"
+            " batch_name, view) VALUES (?, ?, ?, ?, ?)",
+            [
+                (row["fingerprint"], now, row["script"], row["batch_name"], row["view"])
+                for row in rows
+            ],
+        )
+        connection.execute(
+            "DELETE FROM fingerprints WHERE submitted_at < ?",
+            (now - SUBMISSION_CACHE_HOURS * 3600,),
+        )
+
+
+def submitted_fingerprints(fingerprints, max_age_hours=None, path=None):
+    """{fingerprint: batch name} for fingerprints submitted in the last max_age_hours"""
+    if max_age_hours is None:
+        max_age_hours = SUBMISSION_CACHE_HOURS
+    oldest = time.time() - max_age_hours * 3600
+    fingerprints = list(fingerprints)
+
+    found = {}
+    with connect(path) as connection:
+        for start in range(0, len(fingerprints), _MAX_QUERY_PARAMETERS):
+            batch = fingerprints[start : start + _MAX_QUERY_PARAMETERS]
+            rows = connection.execute(
+                "SELECT fingerprint, batch_name FROM fingerprints"
+                f" WHERE submitted_at >= ? AND fingerprint IN ({','.join('?' * len(batch))})",
+                [oldest] + batch,
+            ).fetchall()
+            found.update(rows)
+    return found
@@ -0,0 +1,223 @@
+"""Sample-frame profiling for kroger write views
+
+Renders a few sample frames of each view in a separate `nuke -t` process,
+measures wall time and peak memory, and turns those numbers into proposed
+deadlineChunkSize / concurrentTasks values.
+
+The same file is the script run inside those processes:
+
+    nuke -t kroger_profile.py <script.nk> <write node> <view> <frames> <output dir>
+"""
+
+import math
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import nuke
+
+
+# Number of views profiled at the same time, each one is a full nuke process
+PROFILE_MAX_WORKERS = 2
+
+# Task startup should be at most this fraction of a task's render time
+PROFILE_TARGET_STARTUP_FRACTION = 0.1
+
+# Memory available to the tasks of one render node, in GB
+PROFILE_NODE_MEMORY_GB = float(os.environ.get("KROGER_NODE_MEMORY_GB", "64"))
+
+MAX_PROPOSED_CHUNK_SIZE = 50
+MAX_PROPOSED_CONCURRENT_TASKS = 16
+
+
+def _run_measured(command):
+    """Run command, returns (wall seconds, peak memory in bytes or None)"""
+    with tempfile.TemporaryFile() as log_file:
+        start = time.monotonic()
+        process = subprocess.Popen(
+            command, stdout=subprocess.DEVNULL, stderr=log_file
+        )
+
+        peak_memory = None
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = (
+                os.WEXITSTATUS(status) if os.WIFEXITED(status) else -1
+            )
+            # ru_maxrss is in KB on Linux and bytes on macOS
+            peak_memory = usage.ru_maxrss
+            if not sys.platform.startswith("darwin"):
+                peak_memory *= 1024
+        else:
+            try:
+                import psutil  # type: ignore
+
+                ps_process = psutil.Process(process.pid)
+                peak_memory = 0
+                while process.poll() is None:
+                    memory = ps_process.memory_info()
+                    peak_memory = max(
+                        peak_memory, getattr(memory, "peak_wset", memory.rss)
+                    )
+                    time.sleep(0.1)
+            except Exception:
+                pass
+            process.wait()
+
+        elapsed = time.monotonic() - start
+
+        if process.returncode != 0:
+            log_file.seek(0)
+            log = log_file.read().decode("utf-8", "replace").strip()
+            raise RuntimeError(
+                f"sample render exited with {process.returncode}:\n{log[-2000:]}"
+            )
+
+    return elapsed, peak_memory
+
+
+def sample_frames(frames):
+    """Pick the first, middle and last frame of a sorted frame list"""
+    samples = [frames[0], frames[len(frames) // 2], frames[-1]]
+    return sorted(set(samples))
+
+
+def profile_view(script_path, write_name, view, frames):
+    """Render sample frames of one view in background nuke processes
+
+    One process renders the middle frame alone and one renders the first,
+    middle and last frame, so the per-frame time and the task startup time can
+    be told apart. Returns a dict with per_frame_seconds, startup_seconds,
+    peak_memory (bytes or None) and frame_count.
+    """
+    samples = sample_frames(frames)
+    output_dir = tempfile.mkdtemp(prefix="kroger_profile_")
+
+    def render(render_frames):
+        command = [
+            nuke.EXE_PATH,
+            "-t",
+            os.path.abspath(__file__),
+            script_path,
+            write_name,
+            view,
+            ",".join(str(frame) for frame in render_frames),
+            output_dir,
+        ]
+        return _run_measured(command)
+
+    try:
+        single_time, single_memory = render([frames[len(frames) // 2]])
+
+        if len(samples) > 1:
+            multi_time, multi_memory = render(samples)
+            per_frame = max(0.0, (multi_time - single_time) / (len(samples) - 1))
+            startup = max(0.0, single_time - per_frame)
+        else:
+            multi_memory = None
+            per_frame = single_time
+            startup = 0.0
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    memories = [memory for memory in (single_memory, multi_memory) if memory]
+    return {
+        "per_frame_seconds": per_frame,
+        "startup_seconds": startup,
+        "peak_memory": max(memories) if memories else None,
+        "frame_count": len(frames),
+    }
+
+
+def profile_views(script_path, jobs, max_workers=PROFILE_MAX_WORKERS):
+    """Profile (view, write node name, frames) jobs in parallel
+
+    Returns {view: profile dict} for views that profiled, and
+    {view: exception} for those that failed, as (profiles, errors).
+    """
+    profiles = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            view: executor.submit(profile_view, script_path, write_name, view, frames)
+            for view, write_name, frames in jobs
+        }
+        for view, future in futures.items():
+            try:
+                profiles[view] = future.result()
+            except Exception as e:
+                errors[view] = e
+
+    return profiles, errors
+
+
+def propose_chunk_size(profile):
+    """Smallest chunk size that keeps startup under the target fraction of a task"""
+    per_frame = profile["per_frame_seconds"]
+    if per_frame <= 0:
+        chunk_size = MAX_PROPOSED_CHUNK_SIZE
+    else:
+        chunk_size = math.ceil(
+            profile["startup_seconds"] / (PROFILE_TARGET_STARTUP_FRACTION * per_frame)
+        )
+    return max(1, min(chunk_size, MAX_PROPOSED_CHUNK_SIZE, profile["frame_count"]))
+
+
+def propose_concurrent_tasks(profile, node_memory_gb=PROFILE_NODE_MEMORY_GB):
+    """How many tasks of this view fit in a render node's memory"""
+    if not profile["peak_memory"]:
+        return None
+    tasks = int(node_memory_gb * 1024**3 // profile["peak_memory"])
+    return max(1, min(tasks, MAX_PROPOSED_CONCURRENT_TASKS))
+
+
+def propose_settings(profiles):
+    """Turn per-view profiles into global chunk size and concurrent tasks
+
+    Chunk size is the median of the per-view proposals. Concurrent tasks
+    follow the heaviest view so it doesn't run nodes out of memory. Either
+    value is None if there is nothing to base it on.
+    """
+    chunk_sizes = [propose_chunk_size(profile) for profile in profiles.values()]
+    concurrent_tasks = [
+        tasks
+        for tasks in (propose_concurrent_tasks(p) for p in profiles.values())
+        if tasks is not None
+    ]
+    return {
+        "chunk_size": int(statistics.median(chunk_sizes)) if chunk_sizes else None,
+        "concurrent_tasks": min(concurrent_tasks) if concurrent_tasks else None,
+    }
+
+
+def _render_samples(script_path, write_name, view, frames, output_dir):
+    """Entry point inside the nuke -t process"""
+    nuke.scriptOpen(script_path)
+    write_node = nuke.toNode(write_name)
+    if write_node is None:
+        raise RuntimeError(f"write node '{write_name}' not found")
+
+    # Never overwrite the real output
+    extension = write_node["file_type"].value() or "exr"
+    output_path = os.path.join(output_dir, f"profile.####.{extension}")
+    write_node["file"].setValue(output_path.replace("\\", "/"))
+
+    for frame in frames:
+        nuke.execute(write_node, frame, frame, 1, views=[view])
+
+
+if __name__ == "__main__":
+    _script_path, _write_name, _view, _frames, _output_dir = sys.argv[1:6]
+    _render_samples(
+        _script_path,
+        _write_name,
+        _view,
+        [int(frame) for frame in _frames.split(",")],
+        _output_dir,
+    )
@@ -0,0 +1,135 @@
+"""Index of the versions already published for each variant
+
+The layout of the publish area comes from hornet_publish_utils, see
+publish_layout: its PUBLISH_ROOT, and parse_version(name) for the version
+an entry's name carries. What it doesn't define falls back to
+$KROGER_PUBLISH_ROOT and names like v003 or shot_v003. The area is read as
+<publish root>/<variant>/<entry>, one entry (a directory or file) per
+published version. One scan of the area builds the index, after that only
+the directories whose mtime changed are listed again. Without a publish
+root there is no index and nothing is known to be published.
+"""
+
+import os
+import re
+import threading
+
+
+PUBLISH_ROOT = os.environ.get("KROGER_PUBLISH_ROOT", "")
+
+_VERSION = re.compile(r"(?:^|[._-])v(\d+)(?=[._-]|$)", re.IGNORECASE)
+
+
+def parse_version(name):
+    """The version number in a file or directory name, or None"""
+    match = _VERSION.search(os.path.splitext(os.path.basename(name))[0])
+    return int(match.group(1)) if match else None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _list_versions(variant_dir, version_parser=parse_version):
+    """{version: path} of the published entries in one variant directory"""
+    versions = {}
+    try:
+        with os.scandir(variant_dir) as entries:
+            for entry in entries:
+                version = version_parser(entry.name)
+                if version is not None:
+                    versions.setdefault(version, entry.path)
+    except OSError:
+        pass
+    return versions
+
+
+def publish_layout(publish_module=None):
+    """(publish root, version parser) of the publish area
+
+    publish_module defaults to hornet_publish_utils when it can be imported.
+    """
+    if publish_module is None:
+        try:
+            import hornet_publish_utils as publish_module
+        except ImportError:
+            publish_module = None
+
+    root = getattr(publish_module, "PUBLISH_ROOT", None) or PUBLISH_ROOT
+    version_parser = getattr(publish_module, "parse_version", None) or parse_version
+    return root, version_parser
+
+
+class Published_version_index:
+    """Lookup of variant -> published versions under one publish root"""
+
+    def __init__(self, root, version_parser=parse_version):
+        self.root = root
+        self.version_parser = version_parser
+        self._lock = threading.Lock()
+        self._root_mtime = None
+        self._variants = {}  # variant -> (directory mtime, {version: path})
+
+    def _refresh(self):
+        root_mtime = _mtime(self.root)
+        if root_mtime is None:
+            self._root_mtime = None
+            self._variants = {}
+            return
+
+        if root_mtime != self._root_mtime:
+            # Variants added or removed, list the root again and keep what we
+            # already have for the variants still there
+            variants = {}
+            with os.scandir(self.root) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        variants[entry.name] = self._variants.get(entry.name)
+            self._variants = variants
+            self._root_mtime = root_mtime
+
+        for variant, cached in self._variants.items():
+            variant_dir = os.path.join(self.root, variant)
+            dir_mtime = _mtime(variant_dir)
+            if cached is None or cached[0] != dir_mtime:
+                self._variants[variant] = (
+                    dir_mtime,
+                    _list_versions(variant_dir, self.version_parser),
+                )
+
+    def versions(self, variant):
+        """{version: path} published for variant, current as of this call"""
+        with self._lock:
+            self._refresh()
+            cached = self._variants.get(variant)
+        return dict(cached[1]) if cached else {}
+
+    def conflicts(self, variants, version):
+        """{variant: path} for the variants that already have version"""
+        with self._lock:
+            self._refresh()
+            found = {}
+            for variant in variants:
+                cached = self._variants.get(variant)
+                if cached and version in cached[1]:
+                    found[variant] = cached[1][version]
+        return found
+
+
+# publish root -> Published_version_index
+_indexes = {}
+
+
+def get_publish_index(root=None):
+    """The shared index for root (default from publish_layout), or None"""
+    default_root, version_parser = publish_layout()
+    root = root or default_root
+    if not root:
+        return None
+    index = _indexes.get(root)
+    if index is None:
+        index = _indexes[root] = Published_version_index(root, version_parser)
+    return index
@@ -0,0 +1,177 @@
+"""Phase timing for the kroger write workflow
+
+Wrap a whole operation in trace() and its phases in span():
+
+    with kroger_trace.trace("submit"):
+        with kroger_trace.span("node scan"):
+            ...
+
+Spans from any thread are collected into the active trace, a trace started
+while another one is active, from any thread, is a span of it. When the trace
+ends a per-phase summary is printed and, if KROGER_TRACE_DIR is set, the
+trace is written there as Chrome trace JSON (open it in chrome://tracing or
+https://ui.perfetto.dev). The most recent trace is kept in last_trace.
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+TRACE_DIR = os.environ.get("KROGER_TRACE_DIR", "")
+
+# Guards _active, trace() checks and sets it from any thread
+_active_lock = threading.Lock()
+_active = None
+last_trace = None
+
+
+class Trace:
+    """Spans and counters recorded for one operation"""
+
+    def __init__(self, name):
+        self.name = name
+        self.spans = []  # (name, start, end, thread id, args)
+        self.counts = {}
+        self.started = time.perf_counter()
+        self.ended = None
+        self._lock = threading.Lock()
+
+    def add_span(self, name, start, end, args=None):
+        with self._lock:
+            self.spans.append((name, start, end, threading.get_ident(), args or {}))
+
+    def _spans(self):
+        """Copy of the spans, other threads may still be adding to them"""
+        with self._lock:
+            return list(self.spans)
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def _counts(self):
+        with self._lock:
+            return dict(self.counts)
+
+    def totals(self):
+        """{span name: (calls, total seconds)} in order of first appearance"""
+        totals = {}
+        for name, start, end, _, _ in self._spans():
+            calls, seconds = totals.get(name, (0, 0.0))
+            totals[name] = (calls + 1, seconds + end - start)
+        return totals
+
+    def summary(self):
+        elapsed = (self.ended or time.perf_counter()) - self.started
+        lines = [f"[trace] {self.name}: {elapsed:.3f}s"]
+        for name, (calls, seconds) in self.totals().items():
+            lines.append(f"[trace]   {name}: {calls}x, {seconds:.3f}s")
+        for name, amount in self._counts().items():
+            lines.append(f"[trace]   {name}: {amount}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self):
+        """The trace as a Chrome trace event dict"""
+        pid = os.getpid()
+        events = [
+            {
+                "name": self.name,
+                "ph": "X",
+                "ts": 0,
+                "dur": ((self.ended or time.perf_counter()) - self.started) * 1e6,
+                "pid": pid,
+                "tid": 0,
+            }
+        ]
+        for name, start, end, thread_id, args in self._spans():
+            events.append(
+                {
+                    "name": name,
+                    "ph": "X",
+                    "ts": (start - self.started) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": pid,
+                    "tid": thread_id,
+                    "args": args,
+                }
+            )
+        events.append(
+            {
+                "name": "counts",
+                "ph": "C",
+                "ts": 0,
+                "pid": pid,
+                "tid": 0,
+                "args": self._counts(),
+            }
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+        return path
+
+
+@contextmanager
+def trace(name, path=None):
+    """Record the spans of one operation
+
+    Nested inside another trace this is just a span of the outer one. The
+    trace is written to path, or to TRACE_DIR when that is set.
+    """
+    global _active, last_trace
+
+    with _active_lock:
+        outer = _active
+        if outer is None:
+            current = _active = Trace(name)
+
+    if outer is not None:
+        with span(name):
+            yield outer
+        return
+
+    try:
+        yield current
+    finally:
+        current.ended = time.perf_counter()
+        with _active_lock:
+            _active = None
+            last_trace = current
+        print(current.summary())
+
+        if path is None and TRACE_DIR:
+            stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(TRACE_DIR, f"kroger_{name}_{stamp}.json")
+        if path:
+            try:
+                print(f"[trace] written to {current.write(path)}")
+            except OSError as e:
+                print(f"[trace] could not write {path}: {e}")
+
+
+@contextmanager
+def span(name, **args):
+    """Time a phase of the active trace, does nothing without one"""
+    current = _active
+    if current is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        current.add_span(name, start, time.perf_counter(), args)
+
+
+def count(name, amount=1):
+    """Add to a counter of the active trace"""
+    current = _active
+    if current is not None:
+        current.count(name, amount)
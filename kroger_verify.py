@@ -0,0 +1,224 @@
+"""Integrity checks for rendered DPX and EXR frames
+
+Each frame is memory-mapped and its header checked against the file: the
+DPX file size field, the EXR offset table and the end of its last chunk. A
+frame that was cut short by a killed render or a full disk fails even though
+it exists and isn't empty. Other formats are only checked for being present
+and non-empty.
+"""
+
+import math
+import mmap
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Frames checked at the same time, the work is mostly waiting on storage
+VERIFY_MAX_WORKERS = 8
+
+DPX_MAGIC = {b"SDPX": ">", b"XPDS": "<"}
+DPX_GENERIC_HEADER_SIZE = 768 + 640  # file and image information headers
+
+EXR_MAGIC = b"\x76\x2f\x31\x01"
+EXR_TILED_FLAG = 0x200
+EXR_LONG_NAMES_FLAG = 0x400
+EXR_DEEP_FLAG = 0x800
+EXR_MULTIPART_FLAG = 0x1000
+
+# Scanlines per chunk for each EXR compression
+EXR_LINES_PER_CHUNK = {
+    0: 1,  # none
+    1: 1,  # rle
+    2: 1,  # zips
+    3: 16,  # zip
+    4: 32,  # piz
+    5: 16,  # pxr24
+    6: 32,  # b44
+    7: 32,  # b44a
+    8: 32,  # dwaa
+    9: 256,  # dwab
+}
+
+
+def check_dpx(data):
+    """Problem with a mapped DPX file, or None"""
+    endian = DPX_MAGIC.get(bytes(data[:4]))
+    if endian is None:
+        return "not a DPX file"
+    if len(data) < DPX_GENERIC_HEADER_SIZE:
+        return "truncated header"
+
+    image_offset, _, file_size = struct.unpack_from(f"{endian}I8sI", data, 4)
+    if file_size and len(data) < file_size:
+        return f"truncated, {len(data)} of {file_size} bytes"
+    if image_offset >= len(data):
+        return "no image data"
+    return None
+
+
+def _exr_attributes(data, offset, max_name):
+    """Read one EXR header, returns ({name: (type, value bytes)}, end offset)"""
+    attributes = {}
+    while True:
+        end = data.find(b"\0", offset, offset + max_name + 1)
+        if end < 0:
+            raise ValueError("truncated header")
+        name = bytes(data[offset:end]).decode("latin-1")
+        offset = end + 1
+        if not name:
+            return attributes, offset
+
+        end = data.find(b"\0", offset, offset + max_name + 1)
+        if end < 0:
+            raise ValueError("truncated header")
+        attribute_type = bytes(data[offset:end]).decode("latin-1")
+        (size,) = struct.unpack_from("<i", data, end + 1)
+        offset = end + 5
+        if size < 0 or offset + size > len(data):
+            raise ValueError("truncated header")
+        attributes[name] = (attribute_type, bytes(data[offset : offset + size]))
+        offset += size
+
+
+def _exr_chunk_count(attributes, tiled):
+    """Number of chunks in a part's offset table"""
+    if "chunkCount" in attributes:
+        return struct.unpack("<i", attributes["chunkCount"][1][:4])[0]
+
+    x_min, y_min, x_max, y_max = struct.unpack("<4i", attributes["dataWindow"][1][:16])
+    width = x_max - x_min + 1
+    height = y_max - y_min + 1
+
+    if tiled:
+        tile_width, tile_height, mode = struct.unpack(
+            "<IIB", attributes["tiles"][1][:9]
+        )
+        if mode & 0x0F != 0:
+            raise ValueError("mipmapped and ripmapped EXRs are not checked")
+        return math.ceil(width / tile_width) * math.ceil(height / tile_height)
+
+    compression = attributes["compression"][1][0]
+    return math.ceil(height / EXR_LINES_PER_CHUNK.get(compression, 1))
+
+
+def check_exr(data):
+    """Problem with a mapped EXR file, or None"""
+    if bytes(data[:4]) != EXR_MAGIC:
+        return "not an EXR file"
+    if len(data) < 8:
+        return "truncated header"
+
+    (flags,) = struct.unpack_from("<I", data, 4)
+    max_name = 255 if flags & EXR_LONG_NAMES_FLAG else 31
+    multipart = bool(flags & EXR_MULTIPART_FLAG)
+
+    try:
+        offset = 8
+        parts = []
+        while True:
+            attributes, offset = _exr_attributes(data, offset, max_name)
+            if not attributes:
+                break
+            parts.append(attributes)
+            if not multipart:
+                break
+
+        tiled_parts = []
+        deep_parts = []
+        chunk_counts = []
+        for attributes in parts:
+            part_type = attributes.get("type", ("", b""))[1].rstrip(b"\0")
+            if multipart:
+                tiled = part_type in (b"tiledimage", b"deeptile")
+                deep = part_type.startswith(b"deep")
+            else:
+                tiled = bool(flags & EXR_TILED_FLAG)
+                deep = bool(flags & EXR_DEEP_FLAG)
+            tiled_parts.append(tiled)
+            deep_parts.append(deep)
+            chunk_counts.append(_exr_chunk_count(attributes, tiled))
+    except (KeyError, struct.error, ValueError, IndexError) as e:
+        return str(e) if str(e) == "truncated header" else f"bad header ({e})"
+
+    table_size = sum(chunk_counts) * 8
+    if offset + table_size > len(data):
+        return "truncated offset table"
+    offsets = struct.unpack_from(f"<{sum(chunk_counts)}Q", data, offset)
+    chunks_start = offset + table_size
+
+    if any(chunk_offset == 0 for chunk_offset in offsets):
+        return "incomplete offset table, the render did not finish"
+    if any(not chunks_start <= chunk_offset < len(data) for chunk_offset in offsets):
+        return "truncated, chunks point past the end of the file"
+
+    # The chunk furthest into the file has to end inside it. Chunks start with
+    # the part number (multipart only), then the scanline y or 4 tile ints
+    position = max(offsets)
+    part = 0
+    try:
+        if multipart:
+            (part,) = struct.unpack_from("<i", data, position)
+            position += 4
+        if not 0 <= part < len(parts):
+            return "bad chunk part number"
+        position += 16 if tiled_parts[part] else 4
+
+        if deep_parts[part]:
+            table_bytes, data_bytes, _ = struct.unpack_from("<qqq", data, position)
+            end = position + 24 + table_bytes + data_bytes
+        else:
+            (size,) = struct.unpack_from("<i", data, position)
+            end = position + 4 + size
+    except struct.error:
+        return "truncated last chunk"
+    if end > len(data):
+        return f"truncated, last chunk ends at {end} of {len(data)} bytes"
+    return None
+
+
+CHECKS = {".dpx": check_dpx, ".exr": check_exr}
+
+
+def verify_frame(path):
+    """Problem with one rendered frame, or None if it looks complete"""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return "missing"
+    if size == 0:
+        return "empty"
+
+    check = CHECKS.get(os.path.splitext(path)[1].lower())
+    if check is None:
+        return None
+
+    try:
+        with open(path, "rb") as frame_file, mmap.mmap(
+            frame_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            return check(data)
+    except (OSError, ValueError) as e:
+        return f"unreadable ({e})"
+
+
+def verify_views(frame_paths, max_workers=VERIFY_MAX_WORKERS):
+    """Check every frame of every view in parallel
+
+    frame_paths is {view: {frame: path}}. Returns {view: {frame: problem}}
+    with only the bad frames of each view.
+    """
+    jobs = [
+        (view_name, frame, path)
+        for view_name, frames in frame_paths.items()
+        for frame, path in frames.items()
+    ]
+    bad_frames = {view_name: {} for view_name in frame_paths}
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        problems = executor.map(lambda job: verify_frame(job[2]), jobs)
+        for (view_name, frame, _), problem in zip(jobs, problems):
+            if problem is not None:
+                bad_frames[view_name][frame] = problem
+
+    return bad_frames
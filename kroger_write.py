@@ -1,11 +1,299 @@
 import nuke
 import ast
+import base64
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+import kroger_history
+import kroger_publish_index
+import kroger_trace
+import kroger_verify
+
+
+from PySide2 import QtWidgets, QtCore, QtGui  # type: ignore
 
 
-from PySide2 import QtWidgets, QtCore  # type: ignore
+COLORSPACE_LIST = ["Output - Rec.709", "Output - sRGB", "scene_linear", "Utility - Raw"]
+
+# Render setting knobs on the generated write nodes
+RENDER_SETTING_KNOBS = [
+    "file_type",
+    "Render Start",
+    "Render End",
+    "deadlinePriority",
+    "concurrentTasks",
+    "deadlineChunkSize",
+    "deadlinePool",
+    "deadlineGroup",
+    "colorspace",
+]
+
+# Seconds hornet_publish_utils waits between the nodes of a batch publish
+PUBLISH_DELAY = float(os.environ.get("KROGER_PUBLISH_DELAY", "0.25"))
+
+# Number of views submitted to Deadline at the same time. 1 submits each
+# view with deadlineNetworkSubmit in its group context on the main thread, as
+# hornet_deadline_utils expects. Keep it there until that is known to be
+# thread-safe, more workers submit payloads built by build_job_payload
+SUBMIT_MAX_WORKERS = 1
+
+# Shown wherever an option makes kroger_write build the Deadline jobs itself,
+# see build_job_payload
+PAYLOAD_WARNING = (
+    "Builds the Deadline jobs here instead of through hornet_deadline_utils, "
+    "NukeX, GPU and studio job defaults are not set"
+)
+
+# Output modes of a kroger write group, see create_write_nodes_for_views
+OUTPUT_MODE_PER_VIEW = "per view"
+OUTPUT_MODE_MULTIVIEW = "multi-view exr"
+OUTPUT_MODES = [OUTPUT_MODE_PER_VIEW, OUTPUT_MODE_MULTIVIEW]
+MULTIVIEW_VARIANT = "multiview"
+
+# Joins the views of a job that renders several, e.g. "left,right"
+JOB_VIEW_SEPARATOR = ","
+
+# Job packing, see pack_views. Views with no render history are estimated at
+# PACK_DEFAULT_SECONDS_PER_FRAME
+PACK_DEFAULT_SECONDS_PER_FRAME = 60
+
+# Pre-flight checks, see run_preflight
+PREFLIGHT_MAX_WORKERS = 8
+PREFLIGHT_CACHE_SECONDS = 600
+PREFLIGHT_MIN_FREE_GB = float(os.environ.get("KROGER_MIN_FREE_GB", "10"))
+
+# Colorspaces that make sense for each output file format
+FORMAT_COLORSPACES = {
+    "dpx": ["Output - Rec.709", "Output - sRGB", "Utility - Raw"],
+    "exr": ["scene_linear", "Utility - Raw"],
+}
+
+# Upper bound on the frames a single frame range expression may expand to
+MAX_FRAMES_PER_RANGE = 1000000
+
+# dialog_data knob format, see encode_dialog_data
+DIALOG_DATA_VERSION = 2
+DIALOG_DATA_PREFIX = "kw2:"
+DIALOG_DATA_COMPRESSED_PREFIX = "kw2z:"
+DIALOG_DATA_COMPRESS_THRESHOLD = 2048  # characters of JSON
+
+# Expected types of the global dialog_data values, unknown keys are passed through
+DIALOG_DATA_SCHEMA = {
+    "job_name": str,
+    "global_frame_range": str,
+    "global_priority": int,
+    "chunk_size": int,
+    "concurrent_tasks": int,
+    "submit_workers": int,
+    "bulk_submit": bool,
+    "skip_unchanged": bool,
+    "missing_frames_only": bool,
+    "pack_target_minutes": int,
+    "pool": str,
+    "group": str,
+    "file_format": str,
+    "colorspace": str,
+}
+
+
+class View_table_model(QtCore.QAbstractTableModel):
+    """Per-view rows for the submission and publish dialog tables
+
+    columns is a list of (key, header, kind) where kind is "text" (read-only),
+    "edit" (editable text), "priority" (int, edited through Priority_delegate)
+    or "check" (bool, drawn and toggled by Check_delegate). Each row is a dict
+    holding a value per column key, plus optional "tooltip" and "foreground"
+    (a QColor) for the whole row. Bulk changes go through set_column_values
+    so the view repaints once rather than once per row.
+    """
+
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self.column_keys = [key for key, _, _ in columns]
+        self.rows = []
 
+    def set_rows(self, rows):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
 
-COLORSPACE_LIST = ["Output - Rec.709", "Output - sRGB", "scene_linear", "Utility - Raw"]
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.columns[section][1]
+        return None
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        key, _, kind = self.columns[index.column()]
+        row = self.rows[index.row()]
+        value = row[key]
+
+        if role == QtCore.Qt.ToolTipRole:
+            return row.get("tooltip")
+        if role == QtCore.Qt.ForegroundRole:
+            return row.get("foreground")
+        if kind == "check":
+            if role == QtCore.Qt.CheckStateRole:
+                return QtCore.Qt.Checked if value else QtCore.Qt.Unchecked
+            return None
+
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return value
+        if role == QtCore.Qt.TextAlignmentRole and kind == "priority":
+            return QtCore.Qt.AlignCenter
+        return None
+
+    def flags(self, index):
+        flags = QtCore.Qt.ItemIsEnabled | QtCore.Qt.ItemIsSelectable
+        kind = self.columns[index.column()][2]
+        if kind in ("edit", "priority"):
+            flags |= QtCore.Qt.ItemIsEditable
+        elif kind == "check":
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+
+        key, _, kind = self.columns[index.column()]
+        if kind == "check" and role == QtCore.Qt.CheckStateRole:
+            value = value == QtCore.Qt.Checked
+        elif kind in ("edit", "priority") and role == QtCore.Qt.EditRole:
+            value = int(value) if kind == "priority" else str(value)
+        else:
+            return False
+
+        self.rows[index.row()][key] = value
+        self.dataChanged.emit(index, index, [role])
+        return True
+
+    def set_column_values(self, key, value):
+        """Set one column of every row, with a single change notification"""
+        for row in self.rows:
+            row[key] = value
+        self.column_changed(key)
+
+    def column_changed(self, key):
+        """Tell the view a column was changed directly in self.rows"""
+        if not self.rows:
+            return
+        column = self.column_keys.index(key)
+        self.dataChanged.emit(
+            self.index(0, column), self.index(len(self.rows) - 1, column), []
+        )
+
+    def checked_views(self, key):
+        return [row["view"] for row in self.rows if row[key]]
+
+
+class Priority_delegate(QtWidgets.QStyledItemDelegate):
+    """Edits the priority column with a spin box only while the cell is edited"""
+
+    def createEditor(self, parent, option, index):
+        editor = QtWidgets.QSpinBox(parent)
+        editor.setRange(1, 100)
+        editor.setAlignment(QtCore.Qt.AlignCenter)
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setValue(int(index.data(QtCore.Qt.EditRole)))
+
+    def setModelData(self, editor, model, index):
+        editor.interpretText()
+        model.setData(index, editor.value(), QtCore.Qt.EditRole)
+
+
+class Check_delegate(QtWidgets.QStyledItemDelegate):
+    """Draws a check column's state centered in the cell and toggles it on click"""
+
+    def _check_rect(self, option):
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        size = style.subElementRect(
+            QtWidgets.QStyle.SE_CheckBoxIndicator, QtWidgets.QStyleOptionButton()
+        ).size()
+        return QtWidgets.QStyle.alignedRect(
+            option.direction, QtCore.Qt.AlignCenter, size, option.rect
+        )
+
+    def paint(self, painter, option, index):
+        # Background and selection, without the default left-aligned indicator
+        item_option = QtWidgets.QStyleOptionViewItem(option)
+        self.initStyleOption(item_option, index)
+        item_option.features &= ~QtWidgets.QStyleOptionViewItem.HasCheckIndicator
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawControl(
+            QtWidgets.QStyle.CE_ItemViewItem, item_option, painter, option.widget
+        )
+
+        check_option = QtWidgets.QStyleOptionButton()
+        check_option.rect = self._check_rect(option)
+        check_option.state = QtWidgets.QStyle.State_Enabled
+        if index.data(QtCore.Qt.CheckStateRole) == QtCore.Qt.Checked:
+            check_option.state |= QtWidgets.QStyle.State_On
+        else:
+            check_option.state |= QtWidgets.QStyle.State_Off
+        style.drawPrimitive(
+            QtWidgets.QStyle.PE_IndicatorCheckBox, check_option, painter, option.widget
+        )
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QtCore.QEvent.MouseButtonRelease:
+            if not self._check_rect(option).contains(event.pos()):
+                return False
+        elif event.type() == QtCore.QEvent.MouseButtonDblClick:
+            return self._check_rect(option).contains(event.pos())
+        elif event.type() == QtCore.QEvent.KeyPress:
+            if event.key() not in (QtCore.Qt.Key_Space, QtCore.Qt.Key_Select):
+                return False
+        else:
+            return False
+
+        checked = index.data(QtCore.Qt.CheckStateRole) == QtCore.Qt.Checked
+        return model.setData(
+            index,
+            QtCore.Qt.Unchecked if checked else QtCore.Qt.Checked,
+            QtCore.Qt.CheckStateRole,
+        )
+
+
+def setup_view_table(view_table, model):
+    """Common settings for the model backed view tables"""
+    view_table.setModel(model)
+    view_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+    view_table.setAlternatingRowColors(True)
+    view_table.verticalHeader().setVisible(False)
+    # Fixed row heights, so hundreds of rows never need measuring
+    view_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.Fixed)
+    view_table.verticalHeader().setDefaultSectionSize(
+        view_table.fontMetrics().height() + 10
+    )
+
+    for column, (_, _, kind) in enumerate(model.columns):
+        if kind == "priority":
+            view_table.setItemDelegateForColumn(column, Priority_delegate(view_table))
+        elif kind == "check":
+            view_table.setItemDelegateForColumn(column, Check_delegate(view_table))
 
 
 class Render_submission_dialog(QtWidgets.QDialog):
@@ -13,9 +301,18 @@ class Render_submission_dialog(QtWidgets.QDialog):
         super().__init__(parent)
         self.saved_data = saved_data or {}
         self.kroger_node = kroger_node
+        self.multiview = (
+            kroger_node is not None
+            and get_output_mode(kroger_node) == OUTPUT_MODE_MULTIVIEW
+        )
+        self.history_seconds = {}
         self.setup_ui()
         self.populate_view_table()
         self.load_saved_data()
+        self.load_render_history()
+
+        self.view_model.dataChanged.connect(self.view_data_changed)
+        self.file_format_combo.currentTextChanged.connect(self.load_render_history)
 
     def setup_ui(self):
         self.setWindowTitle("Render Submission")
@@ -69,6 +366,57 @@ class Render_submission_dialog(QtWidgets.QDialog):
         self.concurrent_tasks_spin.setValue(2)
         global_layout.addRow("Concurrent Tasks:", self.concurrent_tasks_spin)
 
+        # Submit Workers - how many views are sent to Deadline at once
+        self.submit_workers_spin = QtWidgets.QSpinBox()
+        self.submit_workers_spin.setRange(1, 32)
+        self.submit_workers_spin.setValue(SUBMIT_MAX_WORKERS)
+        self.submit_workers_spin.setToolTip(
+            "More than 1 submits views in parallel with deadlinecommand. "
+            + PAYLOAD_WARNING
+        )
+        global_layout.addRow("Submit Workers:", self.submit_workers_spin)
+
+        # Bulk submit - send every view to Deadline in one call
+        self.bulk_submit_check = QtWidgets.QCheckBox("One Deadline call per batch")
+        self.bulk_submit_check.setChecked(False)
+        self.bulk_submit_check.setToolTip(PAYLOAD_WARNING)
+        global_layout.addRow("Bulk Submit:", self.bulk_submit_check)
+
+        # Skip views whose job was already submitted unchanged
+        self.skip_unchanged_check = QtWidgets.QCheckBox(
+            f"Don't resubmit views submitted unchanged in the last "
+            f"{kroger_history.SUBMISSION_CACHE_HOURS:g} hours"
+        )
+        self.skip_unchanged_check.setChecked(False)
+        self.skip_unchanged_check.setToolTip(
+            "Only submits made with this on are remembered. Jobs count from the "
+            "moment they are submitted, a job that failed or was deleted on the "
+            "farm is skipped too"
+        )
+        global_layout.addRow("Skip Unchanged:", self.skip_unchanged_check)
+
+        # Re-render only what is missing from the output directories
+        self.missing_frames_check = QtWidgets.QCheckBox(
+            "Only render frames that are missing or empty on disk"
+        )
+        self.missing_frames_check.setChecked(False)
+        self.missing_frames_check.setToolTip(PAYLOAD_WARNING)
+        global_layout.addRow("Missing Frames Only:", self.missing_frames_check)
+
+        # Pack short views into shared jobs of about this many minutes
+        self.pack_target_spin = QtWidgets.QSpinBox()
+        self.pack_target_spin.setRange(0, 600)
+        self.pack_target_spin.setSingleStep(5)
+        self.pack_target_spin.setSuffix(" min")
+        self.pack_target_spin.setSpecialValueText("Off")
+        self.pack_target_spin.setToolTip(
+            "Render short views together in jobs of about this length, so the "
+            "script is loaded once per job instead of once per view. "
+            + PAYLOAD_WARNING
+        )
+        self.pack_target_spin.setValue(0)
+        global_layout.addRow("Pack Views:", self.pack_target_spin)
+
         # Pool
         self.pool_edit = QtWidgets.QLineEdit("local")
         global_layout.addRow("Pool:", self.pool_edit)
@@ -81,6 +429,11 @@ class Render_submission_dialog(QtWidgets.QDialog):
         self.file_format_combo = QtWidgets.QComboBox()
         self.file_format_combo.addItems(["dpx", "exr"])
         self.file_format_combo.setCurrentText("dpx")
+        if self.multiview:
+            # Only exr holds several views per file
+            self.file_format_combo.setCurrentText("exr")
+            self.file_format_combo.setEnabled(False)
+            self.file_format_combo.setToolTip("Multi-view output is always exr")
         global_layout.addRow("File Format:", self.file_format_combo)
 
         # Colorspace
@@ -110,16 +463,18 @@ class Render_submission_dialog(QtWidgets.QDialog):
         table_layout.addLayout(selection_buttons)
 
         # Create the table
-        self.view_table = QtWidgets.QTableWidget()
-        self.view_table.setColumnCount(4)
-        self.view_table.setHorizontalHeaderLabels(
-            ["View Name", "Frame Range", "Priority", "Render"]
+        self.view_model = View_table_model(
+            [
+                ("view", "View Name", "text"),
+                ("frame_range", "Frame Range", "edit"),
+                ("priority", "Priority", "priority"),
+                ("render", "Render", "check"),
+                ("estimate", "Est. Time", "text"),
+            ],
+            self,
         )
-
-        # Table settings
-        self.view_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.view_table.setAlternatingRowColors(True)
-        self.view_table.verticalHeader().setVisible(False)
+        self.view_table = QtWidgets.QTableView()
+        setup_view_table(self.view_table, self.view_model)
 
         # Resize columns
         header = self.view_table.horizontalHeader()
@@ -133,6 +488,9 @@ class Render_submission_dialog(QtWidgets.QDialog):
         header.setSectionResizeMode(
             3, QtWidgets.QHeaderView.ResizeToContents
         )  # Render checkbox
+        header.setSectionResizeMode(
+            4, QtWidgets.QHeaderView.ResizeToContents
+        )  # Estimated farm time
 
         # Set specific column widths
         self.view_table.setColumnWidth(0, 120)  # View Name - wider
@@ -140,6 +498,18 @@ class Render_submission_dialog(QtWidgets.QDialog):
 
         table_layout.addWidget(self.view_table)
 
+        # Estimates from the local render history
+        estimate_layout = QtWidgets.QHBoxLayout()
+        self.estimate_label = QtWidgets.QLabel()
+        estimate_layout.addWidget(self.estimate_label)
+        estimate_layout.addStretch()
+        self.use_suggested_chunk_btn = QtWidgets.QPushButton("Use Suggested Chunk Size")
+        self.use_suggested_chunk_btn.setEnabled(False)
+        self.use_suggested_chunk_btn.clicked.connect(self.use_suggested_chunk_size)
+        estimate_layout.addWidget(self.use_suggested_chunk_btn)
+        table_layout.addLayout(estimate_layout)
+        self.suggested_chunk_size = None
+
         layout.addWidget(table_group)
 
         # Test button for applying settings
@@ -147,6 +517,13 @@ class Render_submission_dialog(QtWidgets.QDialog):
         self.apply_settings_btn = QtWidgets.QPushButton("Apply Settings to nodes")
         self.apply_settings_btn.clicked.connect(lambda: self.apply_settings(debug=True))
         test_layout.addWidget(self.apply_settings_btn)
+        self.profile_btn = QtWidgets.QPushButton("Profile Sample Frames")
+        self.profile_btn.setToolTip(
+            "Render a few frames of each selected view in the background and "
+            "suggest chunk size and concurrent tasks"
+        )
+        self.profile_btn.clicked.connect(self.profile_sample_frames)
+        test_layout.addWidget(self.profile_btn)
         test_layout.addStretch()
         layout.addLayout(test_layout)
 
@@ -166,48 +543,25 @@ class Render_submission_dialog(QtWidgets.QDialog):
         """Populate the table with current script views"""
 
         views = nuke.views()
-        self.view_table.setRowCount(len(views))
 
         # Get default frame range
         first_frame = int(nuke.root().firstFrame())
         last_frame = int(nuke.root().lastFrame())
         default_range = f"{first_frame}-{last_frame}"
 
-        for row, view_name in enumerate(views):
-            # Column 0: View Name (read-only)
-            name_item = QtWidgets.QTableWidgetItem(view_name)
-            name_item.setFlags(name_item.flags() & ~QtCore.Qt.ItemIsEditable)
-            # Remove the gray background - keep default
-            self.view_table.setItem(row, 0, name_item)
-
-            # Column 1: Frame Range (editable)
-            range_item = QtWidgets.QTableWidgetItem(default_range)
-            self.view_table.setItem(row, 1, range_item)
-
-            # Column 2: Priority (spin box)
-            priority_spin = QtWidgets.QSpinBox()
-            priority_spin.setRange(1, 100)
-            priority_spin.setValue(95)
-            priority_spin.setAlignment(QtCore.Qt.AlignCenter)
-            self.view_table.setCellWidget(row, 2, priority_spin)
-
-            # Column 3: Render checkbox
-            checkbox = QtWidgets.QCheckBox()
-            # Default "main" views to unchecked, others to checked
-            default_checked = view_name.lower() != "main"
-            checkbox.setChecked(default_checked)
-
-            # Center the checkbox in the cell
-            checkbox_widget = QtWidgets.QWidget()
-            checkbox_layout = QtWidgets.QHBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(QtCore.Qt.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-
-            self.view_table.setCellWidget(row, 3, checkbox_widget)
-
-        # Auto-resize rows to content
-        self.view_table.resizeRowsToContents()
+        self.view_model.set_rows(
+            [
+                {
+                    "view": view_name,
+                    "frame_range": default_range,
+                    "priority": 95,
+                    # Default "main" views to unchecked, others to checked
+                    "render": view_name.lower() != "main",
+                    "estimate": "-",
+                }
+                for view_name in views
+            ]
+        )
 
     def load_saved_data(self):
         """Load previously saved data into the dialog"""
@@ -228,13 +582,28 @@ class Render_submission_dialog(QtWidgets.QDialog):
         if "concurrent_tasks" in self.saved_data:
             self.concurrent_tasks_spin.setValue(self.saved_data["concurrent_tasks"])
 
+        if "submit_workers" in self.saved_data:
+            self.submit_workers_spin.setValue(self.saved_data["submit_workers"])
+
+        if "bulk_submit" in self.saved_data:
+            self.bulk_submit_check.setChecked(self.saved_data["bulk_submit"])
+
+        if "skip_unchanged" in self.saved_data:
+            self.skip_unchanged_check.setChecked(self.saved_data["skip_unchanged"])
+
+        if "missing_frames_only" in self.saved_data:
+            self.missing_frames_check.setChecked(self.saved_data["missing_frames_only"])
+
+        if "pack_target_minutes" in self.saved_data:
+            self.pack_target_spin.setValue(self.saved_data["pack_target_minutes"])
+
         if "pool" in self.saved_data:
             self.pool_edit.setText(self.saved_data["pool"])
 
         if "group" in self.saved_data:
             self.group_edit.setText(self.saved_data["group"])
 
-        if "file_format" in self.saved_data:
+        if "file_format" in self.saved_data and not self.multiview:
             self.file_format_combo.setCurrentText(self.saved_data["file_format"])
 
         if "colorspace" in self.saved_data:
@@ -245,73 +614,114 @@ class Render_submission_dialog(QtWidgets.QDialog):
             view_data = self.saved_data["view_data"]
             selected_views = self.saved_data.get("selected_views", [])
 
-            for row in range(self.view_table.rowCount()):
-                view_name = self.view_table.item(row, 0).text()
-
-                if view_name in view_data:
-                    # Set frame range
-                    frame_range = view_data[view_name].get("frame_range", "")
-                    if frame_range:
-                        range_item = self.view_table.item(row, 1)
-                        if range_item:
-                            range_item.setText(frame_range)
-
-                    # Set priority
-                    priority = view_data[view_name].get("priority", 95)
-                    priority_widget = self.view_table.cellWidget(row, 2)
-                    if priority_widget:
-                        priority_widget.setValue(priority)
-
-                # Set checkbox state
-                checkbox = self.get_checkbox_from_row(row)
-                if checkbox:
-                    checkbox.setChecked(view_name in selected_views)
-
-    def get_checkbox_from_row(self, row):
-        """Get the checkbox widget from a specific row"""
-        checkbox_widget = self.view_table.cellWidget(row, 3)
-        if checkbox_widget:
-            return checkbox_widget.layout().itemAt(0).widget()
-        return None
+            # Only views that differ from the globals are saved
+            global_view_info = {
+                "frame_range": self.saved_data.get("global_frame_range", ""),
+                "priority": self.saved_data.get("global_priority", 95),
+            }
+
+            selected_views = set(selected_views)
+            for row in self.view_model.rows:
+                view_info = view_data.get(row["view"], global_view_info)
+
+                frame_range = view_info.get("frame_range", "")
+                if frame_range:
+                    row["frame_range"] = frame_range
+                row["priority"] = view_info.get("priority", 95)
+                row["render"] = row["view"] in selected_views
+
+            for key in ("frame_range", "priority", "render"):
+                self.view_model.column_changed(key)
+
+    def load_render_history(self):
+        """Look up per-frame render times for the current file format"""
+        script = os.path.basename(nuke.root().name()).split(".")[0]
+        try:
+            record_farm_frame_times(self.kroger_node, script)
+            self.history_seconds = kroger_history.seconds_per_frame(
+                script, self.file_format_combo.currentText()
+            )
+        except Exception as e:
+            print(f"Error reading render history: {e}")
+            self.history_seconds = {}
+        self.update_estimates()
+
+    def view_data_changed(self, top_left, bottom_right, roles=None):
+        """Re-estimate when a frame range or render checkbox changes"""
+        for key in ("frame_range", "render"):
+            column = self.view_model.column_keys.index(key)
+            if top_left.column() <= column <= bottom_right.column():
+                self.update_estimates()
+                return
+
+    def update_estimates(self):
+        """Fill the Est. Time column, the total and the suggested chunk size"""
+        total_seconds = 0.0
+        estimated_views = 0
+        chunk_sizes = []
+
+        for row in self.view_model.rows:
+            per_frame = self.history_seconds.get(row["view"])
+
+            if per_frame is None:
+                row["estimate"] = "-"
+                continue
+
+            try:
+                frame_count = len(parse_frame_range(row["frame_range"]))
+            except ValueError:
+                row["estimate"] = "?"
+                continue
+
+            seconds = frame_count * per_frame
+            row["estimate"] = kroger_history.format_duration(seconds)
+
+            if row["render"]:
+                total_seconds += seconds
+                estimated_views += 1
+                chunk_sizes.append(kroger_history.suggest_chunk_size(per_frame))
 
-    def get_priority_from_row(self, row):
-        """Get the priority spinbox value from a specific row"""
-        priority_widget = self.view_table.cellWidget(row, 2)
-        if priority_widget:
-            return priority_widget.value()
-        return 95
+        self.view_model.column_changed("estimate")
+
+        if not estimated_views:
+            self.estimate_label.setText("No render history for the selected views")
+            self.suggested_chunk_size = None
+        else:
+            text = (
+                f"Estimated farm time: {kroger_history.format_duration(total_seconds)}"
+                f" ({estimated_views} view{'s' if estimated_views != 1 else ''})"
+            )
+            if kroger_history.FARM_COST_PER_HOUR:
+                cost = total_seconds / 3600 * kroger_history.FARM_COST_PER_HOUR
+                text += f", cost {cost:.2f}"
+            chunk_sizes.sort()
+            self.suggested_chunk_size = chunk_sizes[len(chunk_sizes) // 2]
+            text += f", suggested chunk size {self.suggested_chunk_size}"
+            self.estimate_label.setText(text)
+
+        self.use_suggested_chunk_btn.setEnabled(self.suggested_chunk_size is not None)
+
+    def use_suggested_chunk_size(self):
+        if self.suggested_chunk_size is not None:
+            self.chunk_size_spin.setValue(self.suggested_chunk_size)
 
     def select_all_views(self):
         """Check all render checkboxes"""
-        for row in range(self.view_table.rowCount()):
-            checkbox = self.get_checkbox_from_row(row)
-            if checkbox:
-                checkbox.setChecked(True)
+        self.view_model.set_column_values("render", True)
 
     def select_none_views(self):
         """Uncheck all render checkboxes"""
-        for row in range(self.view_table.rowCount()):
-            checkbox = self.get_checkbox_from_row(row)
-            if checkbox:
-                checkbox.setChecked(False)
+        self.view_model.set_column_values("render", False)
 
     def apply_global_range(self):
         """Apply global frame range to all view rows"""
         global_range = self.global_range_edit.text().strip()
-
-        for row in range(self.view_table.rowCount()):
-            range_item = self.view_table.item(row, 1)
-            if range_item:
-                range_item.setText(global_range)
+        self.view_model.set_column_values("frame_range", global_range)
 
     def apply_global_priority(self):
         """Apply global priority to all view rows"""
         global_priority = self.global_priority_spin.value()
-
-        for row in range(self.view_table.rowCount()):
-            priority_widget = self.view_table.cellWidget(row, 2)
-            if priority_widget:
-                priority_widget.setValue(global_priority)
+        self.view_model.set_column_values("priority", global_priority)
 
     def get_selected_data(self):
         """Extract user selections from the dialog"""
@@ -326,6 +736,11 @@ class Render_submission_dialog(QtWidgets.QDialog):
         global_priority = self.global_priority_spin.value()
         chunk_size = self.chunk_size_spin.value()
         concurrent_tasks = self.concurrent_tasks_spin.value()
+        submit_workers = self.submit_workers_spin.value()
+        bulk_submit = self.bulk_submit_check.isChecked()
+        skip_unchanged = self.skip_unchanged_check.isChecked()
+        missing_frames_only = self.missing_frames_check.isChecked()
+        pack_target_minutes = self.pack_target_spin.value()
         pool = self.pool_edit.text().strip()
         group = self.group_edit.text().strip()
         file_format = self.file_format_combo.currentText()
@@ -334,16 +749,12 @@ class Render_submission_dialog(QtWidgets.QDialog):
         selected_views = []
         view_data = {}
 
-        for row in range(self.view_table.rowCount()):
-            view_name = self.view_table.item(row, 0).text()
-            frame_range = self.view_table.item(row, 1).text().strip()
-            priority = self.get_priority_from_row(row)
-
-            # Get checkbox state
-            checkbox = self.get_checkbox_from_row(row)
-            is_checked = checkbox.isChecked() if checkbox else False
+        for row in self.view_model.rows:
+            view_name = row["view"]
+            frame_range = row["frame_range"].strip()
+            priority = row["priority"]
 
-            if is_checked:
+            if row["render"]:
                 selected_views.append(view_name)
 
             # Store all view data regardless of checkbox state
@@ -355,6 +766,11 @@ class Render_submission_dialog(QtWidgets.QDialog):
             "global_priority": global_priority,
             "chunk_size": chunk_size,
             "concurrent_tasks": concurrent_tasks,
+            "submit_workers": submit_workers,
+            "bulk_submit": bulk_submit,
+            "skip_unchanged": skip_unchanged,
+            "missing_frames_only": missing_frames_only,
+            "pack_target_minutes": pack_target_minutes,
             "pool": pool,
             "group": group,
             "file_format": file_format,
@@ -390,26 +806,74 @@ class Render_submission_dialog(QtWidgets.QDialog):
                 )
                 return False
 
-            # Basic frame range validation
-            if "-" not in frame_range and not frame_range.isdigit():
+            try:
+                parse_frame_range(frame_range)
+            except ValueError as e:
                 QtWidgets.QMessageBox.warning(
                     self,
                     "Validation Error",
-                    f"Invalid frame range for '{view_name}': {frame_range}\n"
-                    "Use format: 1001-1100 or single frame: 1001",
+                    f"Invalid frame range for '{view_name}': {frame_range}\n{e}\n"
+                    "Use format: 1001-1100, 1001-1100x2, 1001,1010,1020-1030 "
+                    "or single frame: 1001",
                 )
                 return False
 
+        # Without an exact-frame mode gaps and steps are rendered too
+        if not (self.multiview or sends_exact_frames(data)):
+            spanned = []
+            for view_name in data["selected_views"]:
+                frames = parse_frame_range(data["view_data"][view_name]["frame_range"])
+                if len(frames_to_render(frames, exact=False)) != len(frames):
+                    spanned.append(view_name)
+            if spanned:
+                reply = QtWidgets.QMessageBox.warning(
+                    self,
+                    "Frame Ranges",
+                    f"The frame ranges of {', '.join(spanned)} have gaps or steps. "
+                    "They render every frame from first to last unless Bulk Submit "
+                    "or Missing Frames Only is on.\n\nRender the whole span?",
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                    QtWidgets.QMessageBox.No,
+                )
+                if reply != QtWidgets.QMessageBox.Yes:
+                    return False
+
+        # Output paths, knobs and colorspace of the generated nodes
+        if self.kroger_node is not None:
+            view_to_node = get_view_index(self.kroger_node).mapping()
+            problems = run_preflight(view_to_node, data)
+            if problems:
+                details = "\n".join(
+                    f"{view_name}: {'; '.join(view_problems)}"
+                    for view_name, view_problems in problems.items()
+                )
+                reply = QtWidgets.QMessageBox.warning(
+                    self,
+                    "Pre-flight Problems",
+                    f"{len(problems)} view{'s' if len(problems) != 1 else ''} "
+                    f"may fail on the farm:\n\n{details}\n\nSubmit anyway?",
+                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                    QtWidgets.QMessageBox.No,
+                )
+                if reply != QtWidgets.QMessageBox.Yes:
+                    return False
+
         return True
 
     def apply_settings(self, debug=False):
-        """Test applying settings to nodes without submitting"""
+        """Apply the dialog settings to the generated nodes without submitting
+
+        Returns an Apply_settings_result, debug prints it and warns about a
+        missing selection or node reference.
+        """
         if not self.validate_data():
             return
 
-        data = self.get_selected_data()
+        return self._apply_settings(self.get_selected_data(), debug)
+
+    def _apply_settings(self, data, debug=False):
+        """apply_settings for already validated data, None if it failed"""
         selected_views = data["selected_views"]
-        view_data = data["view_data"]
 
         if debug:
             if not selected_views:
@@ -423,123 +887,124 @@ class Render_submission_dialog(QtWidgets.QDialog):
                 return
 
         try:
-            # Find the generated nodes inside the kroger write group
-            with self.kroger_node:
-                all_nodes = nuke.allNodes()
-                generated_nodes = [
-                    node for node in all_nodes if node.Class() != "Input"
-                ]
-                print(f"found {len(generated_nodes)} generated nodes")
-
-                # Create a mapping of view names to nodes
-                view_to_node = {}
-                for node in generated_nodes:
-                    view_name_knob = node.knob("view_name_knob")
-                    if view_name_knob:
-                        view_name = view_name_knob.getValue()
-                        view_to_node[view_name] = node
-                        print(f"  mapped view '{view_name}' to node {node.name()}")
-                    else:
-                        print(f"  node {node.name()} has no view_name_knob")
+            # Look up the generated nodes inside the kroger write group
+            view_to_node = get_view_index(self.kroger_node).mapping()
+            result = apply_settings_to_nodes(view_to_node, data)
 
-                print(f"final view_to_node mapping: {list(view_to_node.keys())}")
+            # Print results to console
+            if debug:
+                print("\n=== Apply Settings Test Results ===")
+                print(result.summary())
+                print("=== Test Complete ===\n")
 
-            results = []
-            print(f"applying settings to {len(selected_views)} selected views...")
+            return result
 
-            # Apply settings to each selected view
-            for view_name in selected_views:
-                if view_name not in view_to_node:
-                    results.append(f"❌ {view_name}: Node not found")
-                    continue
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(
+                self, "Test Apply Error", f"An error occurred:\n{str(e)}"
+            )
 
-                node = view_to_node[view_name]
-                node_results = []
+    def profile_sample_frames(self):
+        """Profile sample frames of the selected views and offer the proposed settings"""
+        import time
+        import kroger_profile
 
-                try:
-                    # Get frame range for this specific view
-                    frame_range = view_data[view_name]["frame_range"]
-                    view_priority = view_data[view_name]["priority"]
-
-                    # Parse frame range
-                    if "-" in frame_range:
-                        start_frame, end_frame = frame_range.split("-", 1)
-                        start_frame = start_frame.strip()
-                        end_frame = end_frame.strip()
-                    else:
-                        # Single frame
-                        start_frame = end_frame = frame_range.strip()
+        if not self.validate_data():
+            return
 
-                    # Check if view_name_knob still exists before setting values
-                    print(
-                        f"before setting values: view_name_knob exists = {node.knob('view_name_knob') is not None}"
-                    )
+        if not self.kroger_node:
+            QtWidgets.QMessageBox.warning(
+                self, "Profile", "No kroger write node reference!"
+            )
+            return
 
-                    # Test applying each setting and report results
-                    knob_tests = [
-                        ("file_type", data["file_format"]),
-                        ("Render Start", int(start_frame)),
-                        ("Render End", int(end_frame)),
-                        ("deadlinePriority", view_priority),
-                        ("concurrentTasks", data["concurrent_tasks"]),  # Fixed spelling
-                        ("deadlineChunkSize", data["chunk_size"]),
-                        ("deadlinePool", data["pool"]),
-                        ("deadlineGroup", data["group"]),
-                        ("colorspace", data["colorspace"]),
-                    ]
+        # The background processes render the script as saved on disk
+        if nuke.root().name() == "Root":
+            QtWidgets.QMessageBox.warning(
+                self, "Profile", "Please save the script before profiling."
+            )
+            return
+        if nuke.root().modified():
+            nuke.scriptSave()
 
-                    for knob_name, value in knob_tests:
-                        if node.knob(knob_name):
-                            try:
-                                node[knob_name].setValue(value)
-                                node_results.append(f"✅ {knob_name}: {value}")
-                                print(f"  ✅ {view_name}.{knob_name}: {value}")
-                            except Exception as e:
-                                node_results.append(
-                                    f"❌ {knob_name}: Failed to set ({e})"
-                                )
-                                print(
-                                    f"  ❌ {view_name}.{knob_name}: Failed to set ({e})"
-                                )
-                        else:
-                            node_results.append(f"⚠️ {knob_name}: Knob not found")
-                            print(f"  ⚠️ {view_name}.{knob_name}: Knob not found")
-
-                    # Check if view_name_knob still exists after setting values
-                    knob_exists_after = node.knob("view_name_knob") is not None
-                    print(
-                        f"after setting values: view_name_knob exists = {knob_exists_after}"
-                    )
+        data = self.get_selected_data()
+        view_to_node = get_view_index(self.kroger_node).mapping()
+        jobs = [
+            (
+                view_name,
+                find_render_write(view_to_node[view_name]).fullName(),
+                parse_frame_range(data["view_data"][view_name]["frame_range"]),
+            )
+            for view_name in data["selected_views"]
+            if view_name in view_to_node
+        ]
 
-                    # Re-add the view_name_knob if it was removed
-                    if not knob_exists_after:
-                        print(f"re-adding view_name_knob for {view_name}")
-                        view_name_knob = nuke.String_Knob(
-                            "view_name_knob", "Render View"
-                        )
-                        view_name_knob.setValue(view_name)
-                        node.addKnob(view_name_knob)
-                        print(
-                            f"re-added view_name_knob: {node.knob('view_name_knob') is not None}"
-                        )
-
-                    results.append(f"📁 {view_name}:")
-                    results.extend([f"   {result}" for result in node_results])
+        progress = QtWidgets.QProgressDialog(
+            f"Rendering sample frames for {len(jobs)} views...", None, 0, 0, self
+        )
+        progress.setWindowTitle("Profile")
+        progress.setWindowModality(QtCore.Qt.WindowModal)
+        progress.show()
 
-                except Exception as e:
-                    results.append(f"❌ {view_name}: Error - {str(e)}")
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                kroger_profile.profile_views, nuke.root().name(), jobs
+            )
+            while not future.done():
+                QtWidgets.QApplication.processEvents()
+                time.sleep(0.05)
+        progress.close()
 
-            # Print results to console
-            if debug and results:
-                print("\n=== Apply Settings Test Results ===")
-                for result_line in results:
-                    print(result_line)
-                print("=== Test Complete ===\n")
+        profiles, errors = future.result()
+        proposal = kroger_profile.propose_settings(profiles)
 
+        # Sample times seed the render history estimates
+        script = os.path.basename(nuke.root().name()).split(".")[0]
+        try:
+            for view_name, _, frames in jobs:
+                if view_name not in profiles:
+                    continue
+                samples = kroger_profile.sample_frames(frames)
+                kroger_history.record_frame_times(
+                    script,
+                    view_name,
+                    data["file_format"],
+                    dict.fromkeys(samples, profiles[view_name]["per_frame_seconds"]),
+                )
         except Exception as e:
-            QtWidgets.QMessageBox.critical(
-                self, "Test Apply Error", f"An error occurred:\n{str(e)}"
+            print(f"Error recording render history: {e}")
+        self.load_render_history()
+
+        lines = []
+        for view_name, profile in profiles.items():
+            memory = profile["peak_memory"]
+            memory_text = f"{memory / 1024**3:.1f} GB" if memory else "unknown"
+            lines.append(
+                f"{view_name}: {profile['per_frame_seconds']:.1f}s/frame, "
+                f"{profile['startup_seconds']:.1f}s startup, {memory_text} peak"
             )
+        for view_name, error in errors.items():
+            lines.append(f"{view_name}: failed ({error})")
+
+        if proposal["chunk_size"] is None:
+            QtWidgets.QMessageBox.warning(self, "Profile", "\n".join(lines))
+            return
+
+        concurrent_tasks = (
+            proposal["concurrent_tasks"] or self.concurrent_tasks_spin.value()
+        )
+        reply = QtWidgets.QMessageBox.question(
+            self,
+            "Profile",
+            "\n".join(lines)
+            + f"\n\nProposed chunk size: {proposal['chunk_size']}"
+            + f"\nProposed concurrent tasks: {concurrent_tasks}"
+            + "\n\nApply these values?",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+        )
+        if reply == QtWidgets.QMessageBox.Yes:
+            self.chunk_size_spin.setValue(proposal["chunk_size"])
+            self.concurrent_tasks_spin.setValue(concurrent_tasks)
 
     def accept(self):
         """Override accept to validate and confirm before closing"""
@@ -547,18 +1012,60 @@ class Render_submission_dialog(QtWidgets.QDialog):
             # Get the data to check how many renders will be submitted
             data = self.get_selected_data()
             num_renders = len(data["selected_views"])
+            exact = self.multiview or sends_exact_frames(data)
+            num_tasks = sum(
+                len(
+                    plan_chunks(
+                        frames_to_render(
+                            parse_frame_range(
+                                data["view_data"][view_name]["frame_range"]
+                            ),
+                            exact,
+                        ),
+                        data["chunk_size"],
+                    )
+                )
+                for view_name in data["selected_views"]
+            )
+
+            message = (
+                f"About to submit {num_renders} render{'s' if num_renders != 1 else ''} "
+                f"({num_tasks} task{'s' if num_tasks != 1 else ''}), continue?"
+            )
+            if sends_exact_frames(data) or data.get("pack_target_minutes"):
+                message += f"\n\n{PAYLOAD_WARNING}."
 
             # Show confirmation dialog
             reply = QtWidgets.QMessageBox.question(
                 self,
                 "Confirm Submission",
-                f"About to submit {num_renders} render{'s' if num_renders != 1 else ''}, continue?",
+                message,
                 QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
                 QtWidgets.QMessageBox.No,  # Default to No for safety
             )
 
+            # Already validated, apply without running the pre-flight again
             if reply == QtWidgets.QMessageBox.Yes:
-                self.apply_settings()
+                result = self._apply_settings(data)
+                if result is None:
+                    return
+                print(result.summary())
+
+                # The farm renders what is on the nodes, stale values included
+                problems = result.problems()
+                if problems:
+                    reply = QtWidgets.QMessageBox.warning(
+                        self,
+                        "Apply Settings",
+                        "Some settings could not be applied, those views would "
+                        "render with their old values:\n\n"
+                        + "\n".join(problems)
+                        + "\n\nSubmit anyway?",
+                        QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No,
+                        QtWidgets.QMessageBox.No,
+                    )
+                    if reply != QtWidgets.QMessageBox.Yes:
+                        return
                 super().accept()
 
             # If No, do nothing and keep dialog open
@@ -598,21 +1105,30 @@ class Batch_publish_dialog(QtWidgets.QDialog):
         table_layout.addLayout(selection_buttons)
 
 
-        self.view_table = QtWidgets.QTableWidget()
-        self.view_table.setColumnCount(2)
-        self.view_table.setHorizontalHeaderLabels(["View Name", "Publish"])
-
+        # Published versions are only known with a publish root configured
+        self.check_published = kroger_publish_index.get_publish_index() is not None
 
-        self.view_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
-        self.view_table.setAlternatingRowColors(True)
-        self.view_table.verticalHeader().setVisible(False)
+        self.view_model = View_table_model(
+            [
+                ("view", "View Name", "text"),
+                ("status", "Status", "text"),
+                ("publish", "Publish", "check"),
+            ],
+            self,
+        )
+        self.view_table = QtWidgets.QTableView()
+        setup_view_table(self.view_table, self.view_model)
 
 
         header = self.view_table.horizontalHeader()
         header.setSectionResizeMode(0, QtWidgets.QHeaderView.Stretch)  # View Name
         header.setSectionResizeMode(
             1, QtWidgets.QHeaderView.ResizeToContents
+        )  # Status
+        header.setSectionResizeMode(
+            2, QtWidgets.QHeaderView.ResizeToContents
         )  # Publish checkbox
+        self.view_table.setColumnHidden(1, not self.check_published)
 
         table_layout.addWidget(self.view_table)
         layout.addWidget(table_group)
@@ -624,7 +1140,10 @@ class Batch_publish_dialog(QtWidgets.QDialog):
         warning_label.setAlignment(QtCore.Qt.AlignCenter)
         layout.addWidget(warning_label)
 
-        warning_label2 = QtWidgets.QLabel("If you get failures check the external nuke shell window for errors.\nIf you try to publish a version that already exixts, it will fail.")
+        warning_text = "If you get failures check the external nuke shell window for errors."
+        if self.check_published:
+            warning_text += "\nViews whose version is already published are unchecked and will be skipped."
+        warning_label2 = QtWidgets.QLabel(warning_text)
         warning_label2.setAlignment(QtCore.Qt.AlignCenter)
         layout.addWidget(warning_label2)
 
@@ -645,82 +1164,40 @@ class Batch_publish_dialog(QtWidgets.QDialog):
         if not self.kroger_node:
             return
 
-        views = []
         try:
             # Get views from the generated nodes inside the kroger write group
-            with self.kroger_node:
-                all_nodes = nuke.allNodes()
-                generated_nodes = [
-                    node
-                    for node in all_nodes
-                    if node.Class() != "Input" and node.knob("view_name_knob")
-                ]
-
-                for node in generated_nodes:
-                    view_name_knob = node.knob("view_name_knob")
-                    if view_name_knob:
-                        view_name = view_name_knob.getValue()
-                        if view_name not in views:
-                            views.append(view_name)
+            views = get_view_index(self.kroger_node).views()
+            conflicts = published_conflicts(self.kroger_node)
         except Exception as e:
             print(f"Error getting views: {e}")
             return
 
-        self.view_table.setRowCount(len(views))
-
-        for row, view_name in enumerate(views):
-            # Column 0: View Name (read-only)
-            name_item = QtWidgets.QTableWidgetItem(view_name)
-            name_item.setFlags(name_item.flags() & ~QtCore.Qt.ItemIsEditable)
-            self.view_table.setItem(row, 0, name_item)
-
-            # Column 1: Publish checkbox
-            checkbox = QtWidgets.QCheckBox()
-            # Default all views to checked
-            checkbox.setChecked(True)
-
-            # Center the checkbox in the cell
-            checkbox_widget = QtWidgets.QWidget()
-            checkbox_layout = QtWidgets.QHBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(QtCore.Qt.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-
-            self.view_table.setCellWidget(row, 1, checkbox_widget)
-
-
-        self.view_table.resizeRowsToContents()
-
-    def get_checkbox_from_row(self, row):
-        """Get the checkbox widget from a specific row"""
-        checkbox_widget = self.view_table.cellWidget(row, 1)
-        if checkbox_widget:
-            return checkbox_widget.layout().itemAt(0).widget()
-        return None
+        # Default all views to checked, except those that would fail to publish
+        version = current_publish_version()
+        rows = []
+        for view_name in views:
+            row = {"view": view_name, "status": "", "publish": True}
+            if view_name in conflicts:
+                row.update(
+                    status=f"v{version:03d} published",
+                    publish=False,
+                    tooltip=f"Already published: {conflicts[view_name]}",
+                    foreground=QtGui.QColor("#e07b39"),
+                )
+            rows.append(row)
+        self.view_model.set_rows(rows)
 
     def select_all_views(self):
         """Check all publish checkboxes"""
-        for row in range(self.view_table.rowCount()):
-            checkbox = self.get_checkbox_from_row(row)
-            if checkbox:
-                checkbox.setChecked(True)
+        self.view_model.set_column_values("publish", True)
 
     def select_none_views(self):
         """Uncheck all publish checkboxes"""
-        for row in range(self.view_table.rowCount()):
-            checkbox = self.get_checkbox_from_row(row)
-            if checkbox:
-                checkbox.setChecked(False)
+        self.view_model.set_column_values("publish", False)
 
     def get_selected_views(self):
         """Get list of selected view names"""
-        selected_views = []
-        for row in range(self.view_table.rowCount()):
-            view_name = self.view_table.item(row, 0).text()
-            checkbox = self.get_checkbox_from_row(row)
-            if checkbox and checkbox.isChecked():
-                selected_views.append(view_name)
-        return selected_views
+        return self.view_model.checked_views("publish")
 
     def validate_data(self):
         """Validate that at least one view is selected"""
@@ -751,187 +1228,2171 @@ class Batch_publish_dialog(QtWidgets.QDialog):
                 super().accept()
 
 
-def load_saved_data_from_node(kroger_node=None):
-    """Load saved data from the node's hidden knob"""
-    try:
-        krogerWrite = kroger_node if kroger_node else nuke.thisNode()
-        if krogerWrite.knob("dialog_data"):
-            data_str = krogerWrite["dialog_data"].getValue()
-            if data_str:
-                # Safely evaluate the string as a Python dictionary
-                return ast.literal_eval(data_str)
-    except (ValueError, SyntaxError) as e:
-        print(f"Error loading saved data: {e}")
-    return {}
+class Apply_settings_result:
+    """What apply_settings_to_nodes changed, per view"""
 
+    def __init__(self):
+        self.changed = {}  # view -> {knob name: (old value, new value)}
+        self.unchanged = 0  # knobs that already had the wanted value
+        self.missing_knobs = {}  # view -> [knob names]
+        self.missing_views = []
+        self.errors = {}  # view -> {knob name or None: message}
 
-def save_data_to_node(data, kroger_node=None):
-    """Save data to the node's hidden knob"""
-    try:
-        krogerWrite = kroger_node if kroger_node else nuke.thisNode()
-        if krogerWrite.knob("dialog_data"):
-            krogerWrite["dialog_data"].setValue(str(data))
-    except Exception as e:
-        print(f"Error saving data: {e}")
+    @property
+    def changed_count(self):
+        return sum(len(knobs) for knobs in self.changed.values())
 
+    @property
+    def ok(self):
+        return not self.missing_views and not self.errors
 
-def submit_button_callback():
-    """Callback function for the button"""
-    
-    kroger_node = nuke.thisNode()
+    def summary(self):
+        """Readable report, one line per change or problem"""
+        lines = [
+            f"{self.changed_count} knobs changed on {len(self.changed)} views, "
+            f"{self.unchanged} already up to date"
+        ]
+        for view_name, knobs in self.changed.items():
+            for knob_name, (old, new) in knobs.items():
+                lines.append(f"  {view_name}.{knob_name}: {old!r} -> {new!r}")
+        lines.extend(self.problems())
+        return "\n".join(lines)
+
+    def problems(self):
+        """One line per missing node, missing knob or failed knob write"""
+        lines = []
+        for view_name in self.missing_views:
+            lines.append(f"  {view_name}: node not found")
+        for view_name, knob_names in self.missing_knobs.items():
+            lines.append(f"  {view_name}: knobs not found: {', '.join(knob_names)}")
+        for view_name, knob_errors in self.errors.items():
+            for knob_name, message in knob_errors.items():
+                target = f"{view_name}.{knob_name}" if knob_name else view_name
+                lines.append(f"  {target}: {message}")
+        return lines
+
+
+def sends_exact_frames(data):
+    """True when a submit with data sends each view's exact frame list
+
+    The default deadlineNetworkSubmit path renders Render Start to Render End,
+    gaps and steps included, see submit_view_nodes.
+    """
+    return bool(
+        data.get("bulk_submit")
+        or data.get("missing_frames_only")
+        or data.get("submit_workers", SUBMIT_MAX_WORKERS) > 1
+    )
+
+
+def frames_to_render(frames, exact=True):
+    """The frames a view renders, the whole first-to-last span unless exact"""
+    if exact or not frames:
+        return frames
+    return list(range(frames[0], frames[-1] + 1))
+
+
+def render_settings_for_view(data, view_name):
+    """Knob values the dialog data asks for on a view's generated node"""
+    view_info = data["view_data"][view_name]
+
+    # Render Start/End span the whole frame set, only a bulk submit sends the
+    # exact frame list to Deadline
+    frames = parse_frame_range(view_info["frame_range"])
+
+    return {
+        "file_type": data["file_format"],
+        "Render Start": frames[0],
+        "Render End": frames[-1],
+        "deadlinePriority": view_info["priority"],
+        "concurrentTasks": data["concurrent_tasks"],
+        "deadlineChunkSize": data["chunk_size"],
+        "deadlinePool": data["pool"],
+        "deadlineGroup": data["group"],
+        "colorspace": data["colorspace"],
+    }
+
+
+def render_settings_for_views(data, view_names):
+    """Knob values for a node rendering several views, e.g. a multi-view node
+
+    Render Start/End cover every view's frames and the highest priority wins.
+    """
+    settings = [render_settings_for_view(data, view_name) for view_name in view_names]
+    merged = dict(settings[0])
+    merged["Render Start"] = min(values["Render Start"] for values in settings)
+    merged["Render End"] = max(values["Render End"] for values in settings)
+    merged["deadlinePriority"] = max(values["deadlinePriority"] for values in settings)
+    return merged
+
+
+def job_view_names(job_name):
+    """Views a job renders, a job for several views is named after all of them"""
+    return job_name.split(JOB_VIEW_SEPARATOR)
+
+
+def _knob_values_equal(current, wanted):
+    if isinstance(current, (int, float)) and isinstance(wanted, (int, float)):
+        return float(current) == float(wanted)
+    return str(current) == str(wanted)
+
+
+def apply_settings_to_nodes(view_to_node, data, views=None):
+    """Write the dialog settings to the generated nodes of the selected views
+
+    Current values are read once per knob and only knobs whose value differs
+    are set, so re-applying unchanged settings costs a read per knob.
+    views defaults to data["selected_views"]. Returns an Apply_settings_result.
+    """
+    result = Apply_settings_result()
+    with kroger_trace.span("knob apply"):
+        _apply_settings_to_nodes(view_to_node, data, views, result)
+    kroger_trace.count("knobs changed", result.changed_count)
+    kroger_trace.count("knobs unchanged", result.unchanged)
+    return result
+
+
+def _apply_settings_to_nodes(view_to_node, data, views, result):
+    # A multi-view node is set once for all of its selected views
+    node_views = {}
+    for view_name in data["selected_views"] if views is None else views:
+        node = view_to_node.get(view_name)
+        if node is None:
+            result.missing_views.append(view_name)
+            continue
+        node_views.setdefault(node.fullName(), (node, []))[1].append(view_name)
 
-    
-    saved_data = load_saved_data_from_node(kroger_node)
+    for node, view_names in node_views.values():
+        view_name = JOB_VIEW_SEPARATOR.join(view_names)
+        try:
+            wanted_values = render_settings_for_views(data, view_names)
+        except (KeyError, ValueError) as e:
+            result.errors.setdefault(view_name, {})[None] = f"Bad settings ({e})"
+            continue
 
-    dialog = Render_submission_dialog(saved_data=saved_data, kroger_node=kroger_node)
+        changes = {}
+        for knob_name, value in wanted_values.items():
+            knob = node.knob(knob_name)
+            if knob is None:
+                result.missing_knobs.setdefault(view_name, []).append(knob_name)
+                continue
+
+            current = knob.value()
+            if _knob_values_equal(current, value):
+                result.unchanged += 1
+                continue
+
+            try:
+                knob.setValue(value)
+                changes[knob_name] = (current, value)
+            except Exception as e:
+                result.errors.setdefault(view_name, {})[knob_name] = (
+                    f"Failed to set ({e})"
+                )
 
-    if dialog.exec_() == QtWidgets.QDialog.Accepted:
-        data = dialog.get_selected_data()
-        print("Dialog accepted with data:")
-        print(data)
+        if changes:
+            result.changed[view_name] = changes
+
+            # Setting some knobs has been seen to drop the view tag, put it back
+            if node.knob("view_name_knob") is None:
+                view_name_knob = nuke.String_Knob("view_name_knob", "Render View")
+                view_name_knob.setValue(" ".join(view_names))
+                node.addKnob(view_name_knob)
+
+
+def preflight_view_state(view_name, node, data):
+    """Everything the pre-flight checks need about one view, read on the main thread"""
+    if node is None:
+        return {"view": view_name, "node": None}
+
+    render_write = find_render_write(node)
+    create_directories = render_write.knob("create_directories")
+    return {
+        "view": view_name,
+        "node": node.fullName(),
+        "output_path": nuke.filename(render_write) or "",
+        "create_directories": bool(create_directories and create_directories.value()),
+        "missing_knobs": [name for name in RENDER_SETTING_KNOBS if not node.knob(name)],
+        "multiview": len(generated_node_views(node)) > 1,
+        "file_format": data["file_format"],
+        "colorspace": data["colorspace"],
+    }
+
+
+def preflight_check(state):
+    """Problems that would make a view fail or render wrong on the farm
+
+    Only looks at the file system and state, so it is safe on worker threads.
+    Returns a list of readable problems, empty if the view looks fine.
+    """
+    if state["node"] is None:
+        return ["no generated node, refresh nodes"]
+
+    problems = []
+    if state["missing_knobs"]:
+        problems.append(f"missing knobs: {', '.join(state['missing_knobs'])}")
+
+    if state.get("multiview") and state["file_format"] != "exr":
+        problems.append(
+            f"multi-view output needs exr, {state['file_format']} holds one view per file"
+        )
 
-    
-        save_data_to_node(data, kroger_node)
+    allowed = FORMAT_COLORSPACES.get(state["file_format"])
+    if allowed is not None and state["colorspace"] not in allowed:
+        problems.append(
+            f"{state['colorspace']} is not a {state['file_format']} colorspace, "
+            f"use one of {', '.join(allowed)}"
+        )
 
-    
-        submit_renders(data, kroger_node)
+    output_path = state["output_path"]
+    if not output_path:
+        problems.append("no output path")
+        return problems
+
+    directory = os.path.dirname(output_path)
+    existing = directory
+    while existing and not os.path.isdir(existing):
+        parent = os.path.dirname(existing)
+        if parent == existing:
+            break
+        existing = parent
+
+    if not existing or not os.path.isdir(existing):
+        problems.append(f"output location {directory} does not exist")
+        return problems
+    if existing != directory and not state["create_directories"]:
+        problems.append(
+            f"output directory {directory} does not exist and the Write "
+            "does not create directories"
+        )
+    if not os.access(existing, os.W_OK):
+        problems.append(f"{existing} is not writable")
 
-    else:
-        print("Dialog cancelled")
-        
-        data = dialog.get_selected_data()
-        save_data_to_node(data, kroger_node)
+    try:
+        free_gb = shutil.disk_usage(existing).free / 1024**3
+        if free_gb < PREFLIGHT_MIN_FREE_GB:
+            problems.append(f"only {free_gb:.1f} GB free on {existing}")
+    except OSError as e:
+        problems.append(f"cannot read free space of {existing} ({e})")
 
+    return problems
 
-def batch_publish_button_callback():
-    """Callback function for the batch publish button"""
-    
-    kroger_node = nuke.thisNode()
-    # print(kroger_node.name())
 
-    dialog = Batch_publish_dialog(kroger_node=kroger_node)
+# json of a pre-flight state -> (checked at, problems)
+_preflight_cache = {}
 
-    if dialog.exec_() == QtWidgets.QDialog.Accepted:
-        selected_views = dialog.get_selected_views()
-        print(f"Batch publishing selected views: {selected_views}")
-        print(kroger_node.name())
 
-        
-        batch_publish(selected_views=selected_views, kroger_node=kroger_node)
-    else:
-        print("Batch publish dialog cancelled")
+def run_preflight(view_to_node, data, views=None, max_workers=PREFLIGHT_MAX_WORKERS):
+    """Check the selected views before anything goes to the farm
 
+    Node state is gathered on the main thread and the checks run on a thread
+    pool. Results are cached by node state for PREFLIGHT_CACHE_SECONDS, so
+    checking the same views again is instant. Returns {view: [problems]} for
+    views with problems.
+    """
+    views = data["selected_views"] if views is None else views
+    with kroger_trace.span("preflight", views=len(views)):
+        states = [
+            preflight_view_state(view_name, view_to_node.get(view_name), data)
+            for view_name in views
+        ]
 
-def submit_renders(data, krogerWrite):
-    print("submitting renders with data:")
-    """Submit the selected renders to the farm"""
-    import os
-    from datetime import datetime
+        now = time.monotonic()
+        results = {}
+        to_check = {}
+        for state in states:
+            key = json.dumps(state, sort_keys=True)
+            cached = _preflight_cache.get(key)
+            if cached and now - cached[0] < PREFLIGHT_CACHE_SECONDS:
+                results[state["view"]] = cached[1]
+            else:
+                to_check[key] = state
+
+        if to_check:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(to_check)))
+            ) as executor:
+                checked = dict(
+                    zip(to_check, executor.map(preflight_check, to_check.values()))
+                )
+            # Drop expired states so the cache doesn't grow for the whole session
+            for key in [
+                key
+                for key, (checked_at, _) in _preflight_cache.items()
+                if now - checked_at >= PREFLIGHT_CACHE_SECONDS
+            ]:
+                del _preflight_cache[key]
+            for key, problems in checked.items():
+                _preflight_cache[key] = (now, problems)
+                results[to_check[key]["view"]] = problems
+
+    kroger_trace.count("preflight cache hits", len(states) - len(to_check))
+    return {view: problems for view, problems in results.items() if problems}
+
+
+class Submission_signals(QtCore.QObject):
+    """Carries progress from the submission thread to the Qt main thread"""
+
+    progress = QtCore.Signal(str, str)
+    finished = QtCore.Signal(object)
+
+
+class Submission_progress_dialog(QtWidgets.QDialog):
+    """Shows per-view submission state and lets the user cancel remaining views"""
+
+    STATE_COLORS = {
+        "queued": None,
+        "submitting": "#d9a400",
+        "done": "#3c9a3c",
+        "failed": "#c83232",
+        "cancelled": "#808080",
+        "unchanged": "#808080",
+        "complete": "#808080",
+    }
+
+    def __init__(self, view_names, parent=None):
+        super().__init__(parent)
+        self.cancel_event = threading.Event()
+        self.signals = Submission_signals()
+        self.signals.progress.connect(self.set_view_state)
+        self.signals.finished.connect(self.submission_finished)
+        self.rows = {}
+        self.setup_ui(view_names)
 
-    try:
-        import hornet_deadline_utils
-    except ImportError:
-        nuke.message("Error: hornet_deadline_utils module not found!")
-        return
+    def setup_ui(self, view_names):
+        self.setWindowTitle("Submitting Renders")
+        self.setMinimumSize(350, 300)
 
-    print("krogerWrite node found:", krogerWrite.name())
-    selected_views = data["selected_views"]
-    view_data = data["view_data"]
+        layout = QtWidgets.QVBoxLayout(self)
 
-    if not selected_views:
-        nuke.message("No views selected for rendering!")
-        return
+        self.view_table = QtWidgets.QTableWidget(len(view_names), 2)
+        self.view_table.setHorizontalHeaderLabels(["View Name", "State"])
+        self.view_table.verticalHeader().setVisible(False)
+        self.view_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.view_table.horizontalHeader().setSectionResizeMode(
+            0, QtWidgets.QHeaderView.Stretch
+        )
 
-    succeeded = 0
-    failed = 0
-    script = os.path.basename(nuke.toNode("root").name()).split(".")[0]
-    now = datetime.now().strftime("%H-%M-%S")
-    batch_name = f"{script}_{now}"
+        for row, view_name in enumerate(view_names):
+            self.rows[view_name] = row
+            self.view_table.setItem(row, 0, QtWidgets.QTableWidgetItem(view_name))
+            self.view_table.setItem(row, 1, QtWidgets.QTableWidgetItem("queued"))
 
+        layout.addWidget(self.view_table)
 
-    with krogerWrite:
-        all_nodes = nuke.allNodes()
-        generated_nodes = [
-            node
-            for node in all_nodes
-            if node.Class() != "Input" and "view_name_knob" in node.knobs()
-        ]
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setRange(0, len(view_names))
+        self.progress_bar.setValue(0)
+        layout.addWidget(self.progress_bar)
+
+        self.status_label = QtWidgets.QLabel("Submitting...")
+        layout.addWidget(self.status_label)
 
-        if generated_nodes.count == 0:
-            nuke.message("No generated nodes found in kroger write group!")
+        button_box = QtWidgets.QDialogButtonBox()
+        self.cancel_btn = button_box.addButton(
+            "Cancel Remaining", QtWidgets.QDialogButtonBox.RejectRole
+        )
+        self.cancel_btn.clicked.connect(self.cancel_remaining)
+        self.close_btn = button_box.addButton(QtWidgets.QDialogButtonBox.Close)
+        self.close_btn.setEnabled(False)
+        self.close_btn.clicked.connect(self.close)
+        layout.addWidget(button_box)
+
+    def set_view_state(self, view_name, state):
+        row = self.rows.get(view_name)
+        if row is None:
             return
 
-        
+        state_item = self.view_table.item(row, 1)
+        state_item.setText(state)
+        color = self.STATE_COLORS.get(state)
+        if color:
+            state_item.setForeground(QtGui.QBrush(QtGui.QColor(color)))
+
+        finished = sum(
+            1
+            for r in range(self.view_table.rowCount())
+            if self.view_table.item(r, 1).text()
+            in ("done", "failed", "cancelled", "unchanged", "complete")
+        )
+        self.progress_bar.setValue(finished)
+
+    def cancel_remaining(self):
+        """Queued views are skipped, views already submitting finish"""
+        self.cancel_event.set()
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("Cancelling remaining views...")
+
+    def submission_finished(self, summary):
+        self.cancel_btn.setEnabled(False)
+        self.close_btn.setEnabled(True)
+        if summary:
+            self.status_label.setText(
+                f"{summary['succeeded']} submitted, {summary['failed']} failed, "
+                f"{summary['cancelled']} cancelled, "
+                f"{summary.get('unchanged', 0)} unchanged, "
+                f"{summary.get('complete', 0)} already rendered"
+            )
+        else:
+            self.status_label.setText("Nothing was submitted")
+
+    def reject(self):
+        # Escape cancels the remaining views instead of hiding the dialog mid-run
+        if self.close_btn.isEnabled():
+            super().reject()
+        else:
+            self.cancel_remaining()
+
+
+# Keeps running progress dialogs alive until they are closed
+_progress_dialogs = []
+
+
+def submit_renders_in_background(data, krogerWrite):
+    """Run submit_renders on a worker thread with a progress dialog
+
+    Returns the dialog, the thread keeps Nuke responsive while views are sent.
+    """
+    dialog = Submission_progress_dialog(data["selected_views"])
+    dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+    _progress_dialogs.append(dialog)
+    dialog.destroyed.connect(lambda: _progress_dialogs.remove(dialog))
+
+    def run():
+        summary = None
+        try:
+            summary = submit_renders(
+                data,
+                krogerWrite,
+                on_progress=dialog.signals.progress.emit,
+                cancel_event=dialog.cancel_event,
+            )
+        except Exception as e:
+            print(f"Error submitting renders: {e}")
+        dialog.signals.finished.emit(summary)
+
+    dialog.show()
+    threading.Thread(target=run, name="kroger_write_submit", daemon=True).start()
+    return dialog
+
+
+_FRAME_RANGE_TOKEN = re.compile(r"^(-?\d+)(?:-(-?\d+)(?:x(\d+))?)?$")
+
+
+# Whitespace around the "-" of A-B and the "x" of A-BxS, removed before the
+# expression is split into tokens. A space before "-" only belongs to a range
+# with a space after it too, "1 -5" is frame 1 and frame -5
+_FRAME_RANGE_DASH = re.compile(r"(?<=\d)(?:\s+-\s+|-\s*)(?=-?\d)")
+_FRAME_RANGE_STEP = re.compile(r"(?<=\d)\s*x\s*(?=\d)")
+
+
+def parse_frame_range(frame_range):
+    """Expand a Nuke style frame range expression into a sorted list of frames
+
+    Accepts single frames (holds), A-B ranges, stepped A-BxS ranges and
+    negative frames, separated by commas or spaces:
+
+        "1001-1100x2, 1150, 1200-1210"
+        "-10--1 5"
+
+    Spaces around "-" and "x" are allowed, "1001 - 1100" is one range, while
+    "1 -5" is two frames.
+    Reversed ranges are normalized and duplicates removed. Raises ValueError
+    for anything it can't parse.
+    """
+    frame_range = _FRAME_RANGE_DASH.sub("-", frame_range)
+    frame_range = _FRAME_RANGE_STEP.sub("x", frame_range)
+    tokens = [token for token in re.split(r"[,\s]+", frame_range.strip()) if token]
+    if not tokens:
+        raise ValueError("Frame range is empty")
+
+    frames = set()
+    for token in tokens:
+        match = _FRAME_RANGE_TOKEN.match(token)
+        if not match:
+            raise ValueError(f"Can't parse '{token}'")
+
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) is not None else start
+        step = int(match.group(3)) if match.group(3) is not None else 1
+        if step < 1:
+            raise ValueError(f"Step must be at least 1 in '{token}'")
+        if start > end:
+            start, end = end, start
+
+        if len(frames) + (end - start) // step + 1 > MAX_FRAMES_PER_RANGE:
+            raise ValueError(f"More than {MAX_FRAMES_PER_RANGE} frames")
+        frames.update(range(start, end + 1, step))
+
+    return sorted(frames)
+
+
+def compact_frame_range(frames):
+    """Format sorted frames as the shortest A-BxS,C,D-E expression
+
+    The result is valid for parse_frame_range and for Deadline's Frames field.
+    """
+    frames = sorted(set(frames))
+    parts = []
+    index = 0
+    while index < len(frames):
+        start = frames[index]
+        if index + 1 == len(frames):
+            parts.append(str(start))
+            break
+
+        step = frames[index + 1] - start
+        end_index = index + 1
+        while (
+            end_index + 1 < len(frames)
+            and frames[end_index + 1] - frames[end_index] == step
+        ):
+            end_index += 1
+
+        run_length = end_index - index + 1
+        end = frames[end_index]
+        if step == 1:
+            parts.append(f"{start}-{end}")
+        elif run_length >= 3:
+            parts.append(f"{start}-{end}x{step}")
+        else:
+            # Two frames with a gap read better as a list
+            parts.append(str(start))
+            end_index = index
+        index = end_index + 1
+
+    return ",".join(parts)
+
+
+def frame_intervals(frames):
+    """Collapse sorted frames into a list of contiguous (start, end) intervals"""
+    intervals = []
+    for frame in frames:
+        if intervals and frame == intervals[-1][1] + 1:
+            intervals[-1][1] = frame
+        else:
+            intervals.append([frame, frame])
+    return [tuple(interval) for interval in intervals]
+
+
+def plan_chunks(frames, chunk_size):
+    """Split frames into the tasks Deadline will create for a chunk size"""
+    chunk_size = max(1, int(chunk_size))
+    return [frames[i : i + chunk_size] for i in range(0, len(frames), chunk_size)]
+
+
+_FRAME_PADDING = re.compile(r"#+|%0?\d*d")
+
+
+def sequence_frame_pattern(output_path, view_name=None):
+    """Split a Write file path into (directory, file name regex)
+
+    The regex captures the frame number of a file in the sequence, it is None
+    for paths without frame padding (#### or %04d). %V and %v are filled in
+    for view_name.
+    """
+    if view_name:
+        output_path = output_path.replace("%V", view_name).replace("%v", view_name[:1])
+    directory, file_name = os.path.split(output_path)
+
+    padding = _FRAME_PADDING.search(file_name)
+    if padding is None:
+        return directory, None
+    return directory, re.compile(
+        re.escape(file_name[: padding.start()])
+        + r"(-?\d+)"
+        + re.escape(file_name[padding.end() :])
+        + "$"
+    )
+
+
+def frame_file_path(output_path, view_name, frame):
+    """The file a Write path renders for one view and frame"""
+    output_path = output_path.replace("%V", view_name).replace("%v", view_name[:1])
+
+    def pad(match):
+        padding = match.group(0)
+        if padding.startswith("#"):
+            return f"{frame:0{len(padding)}d}"
+        return padding % frame
+
+    return _FRAME_PADDING.sub(pad, output_path, count=1)
+
+
+def scan_rendered_frames(output_paths, stat_field="st_size"):
+    """{view: {frame: file size}} of the frames already on disk
+
+    output_paths is {view: Write file path}. Each output directory is listed
+    once with os.scandir, however many views render into it. stat_field picks
+    another os.stat value than the size, e.g. "st_mtime".
+    """
+    views_by_directory = {}
+    for view_name, output_path in output_paths.items():
+        directory, pattern = sequence_frame_pattern(output_path, view_name)
+        if pattern is not None:
+            views_by_directory.setdefault(directory, []).append((view_name, pattern))
+
+    rendered = {view_name: {} for view_name in output_paths}
+    for directory, view_patterns in views_by_directory.items():
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    for view_name, pattern in view_patterns:
+                        match = pattern.match(entry.name)
+                        if match:
+                            rendered[view_name][int(match.group(1))] = getattr(
+                                entry.stat(), stat_field
+                            )
+                            break
+        except OSError:
+            continue
+    return rendered
+
+
+def farm_frame_seconds(mtimes, submitted_at, chunk_size):
+    """{frame: seconds} from the modification times of a view's rendered frames
+
+    mtimes is {frame: mtime}. A task writes its frames one after the other, so
+    the time between two consecutive frames of the same chunk is the render
+    time of the second one. Chunks of one frame can't be measured this way.
+    Frames written before submitted_at are ignored.
+    """
+    frames = sorted(frame for frame, mtime in mtimes.items() if mtime >= submitted_at)
+    frame_seconds = {}
+    for previous, frame in zip(frames, frames[1:]):
+        if frame != previous + 1 or (frame - frames[0]) % max(chunk_size, 1) == 0:
+            continue
+        seconds = mtimes[frame] - mtimes[previous]
+        if seconds > 0:
+            frame_seconds[frame] = seconds
+    return frame_seconds
+
+
+def record_farm_frame_times(kroger_node, script):
+    """Add the farm render times of finished submissions to the history
+
+    Looks at the latest unmeasured submission of each view of the group and
+    once all its frames are on disk, records the times from the files'
+    modification times, see farm_frame_seconds. Main thread only.
+    """
+    latest = {}
+    for submission in kroger_history.unmeasured_submissions(script):
+        latest.setdefault(submission["view"], submission)
+
+    view_to_node = get_view_index(kroger_node).mapping()
+    view_nodes = [
+        (view_name, view_to_node[view_name])
+        for view_name in latest
+        if view_name in view_to_node
+    ]
+    if not view_nodes:
+        return
+
+    with kroger_trace.span("farm times", views=len(view_nodes)):
+        mtimes = scan_rendered_frames(_render_output_paths(view_nodes), "st_mtime")
+    for view_name, _ in view_nodes:
+        submission = latest[view_name]
+        view_mtimes = mtimes.get(view_name, {})
+        finished = [
+            frame
+            for frame, mtime in view_mtimes.items()
+            if mtime >= submission["submitted_at"]
+        ]
+        if not finished or len(finished) < submission["frame_count"]:
+            continue
+
+        frame_seconds = farm_frame_seconds(
+            view_mtimes, submission["submitted_at"], submission["chunk_size"]
+        )
+        if frame_seconds:
+            kroger_history.record_frame_times(
+                script,
+                view_name,
+                submission["file_format"],
+                frame_seconds,
+                submission_id=submission["id"],
+            )
+
+
+def combine_multiview_jobs(view_nodes, data):
+    """Submit each multi-view node as one job instead of once per view
+
+    A multi-view node writes every view into the same file per frame, so its
+    selected views have to render together: the (view_name, node) pairs of a
+    node become one (job name, node) pair named after the views (see
+    job_view_names), rendering the union of their frames. Jobs of multi-view
+    nodes are flagged "multiview" in the returned copy of data, they have to
+    go through job payloads to choose their views. Main thread only.
+    """
+    groups = {}
+    for view_name, node in view_nodes:
+        groups.setdefault(node.fullName(), (node, []))[1].append(view_name)
+
+    view_data = dict(data["view_data"])
+    jobs = []
+    for node, view_names in groups.values():
+        if len(generated_node_views(node)) < 2:
+            jobs.extend((view_name, node) for view_name in view_names)
+            continue
+
+        view_infos = [view_data.get(view_name, {}) for view_name in view_names]
+        frame_ranges = [view_info.get("frame_range", "") for view_info in view_infos]
+        frame_range = ""
+        if all(frame_ranges):
+            frame_range = compact_frame_range(
+                frame
+                for view_frame_range in frame_ranges
+                for frame in parse_frame_range(view_frame_range)
+            )
+
+        job_name = JOB_VIEW_SEPARATOR.join(view_names)
+        view_data[job_name] = {
+            "frame_range": frame_range,
+            "priority": max(
+                view_info.get("priority", data.get("global_priority", 95))
+                for view_info in view_infos
+            ),
+            "multiview": True,
+        }
+        jobs.append((job_name, node))
+
+    return jobs, dict(data, view_data=view_data)
+
+
+def pack_views(view_nodes, data, target_seconds, seconds_per_frame=None):
+    """Bin-pack views into shared jobs of about target_seconds of rendering
+
+    Each view is estimated as its frame count times its seconds per frame
+    from the render history, then packed first-fit decreasing. Only views
+    with one contiguous frame range can share a job, multi-view jobs and
+    views longer than the target are left alone. Returns (a list of packs,
+    each a list of (view_name, node) with two or more views, the
+    (view_name, node) pairs that stay jobs of their own).
+    """
+    if seconds_per_frame is None:
+        try:
+            seconds_per_frame = kroger_history.seconds_per_frame(
+                data.get("job_name", ""), data.get("file_format")
+            )
+        except (sqlite3.Error, OSError) as e:
+            print(f"Error reading render history: {e}")
+            seconds_per_frame = {}
+
+    candidates = []
+    single = []
+    for view_name, node in view_nodes:
+        view_info = data["view_data"].get(view_name, {})
+        frame_range = view_info.get("frame_range", "")
+        frames = parse_frame_range(frame_range) if frame_range else []
+        if view_info.get("multiview") or len(frame_intervals(frames)) != 1:
+            single.append((view_name, node))
+            continue
+
+        per_frame = seconds_per_frame.get(view_name) or PACK_DEFAULT_SECONDS_PER_FRAME
+        cost = len(frames) * per_frame
+        if cost >= target_seconds:
+            single.append((view_name, node))
+        else:
+            candidates.append((cost, view_name, node))
+
+    # First-fit decreasing: the longest views are placed first, each into the
+    # first job that still has room
+    bins = []  # [remaining seconds, [(view_name, node)]]
+    for cost, view_name, node in sorted(candidates, key=lambda item: -item[0]):
+        for job in bins:
+            if cost <= job[0]:
+                job[0] -= cost
+                job[1].append((view_name, node))
+                break
+        else:
+            bins.append([target_seconds - cost, [(view_name, node)]])
+
+    packs = []
+    for _, pack in bins:
+        if len(pack) > 1:
+            packs.append(pack)
+        else:
+            single.extend(pack)
+    return packs, single
+
+
+def _render_output_paths(view_nodes):
+    return {
+        view_name: nuke.filename(find_render_write(node)) or ""
+        for view_name, node in view_nodes
+    }
+
+
+def limit_to_missing_frames(view_nodes, data):
+    """Cut each view's frame range down to the frames missing or empty on disk
+
+    Returns (view_nodes that still have frames to render, a copy of data with
+    the reduced frame ranges, [views that are fully rendered]). Safe to call
+    from a worker thread.
+    """
+    with kroger_trace.span("missing frame scan", views=len(view_nodes)):
+        output_paths = run_in_main_thread(_render_output_paths, view_nodes)
+        rendered = scan_rendered_frames(output_paths)
+
+    view_data = dict(data["view_data"])
+    to_render = []
+    complete = []
+    for view_name, node in view_nodes:
+        view_info = view_data.get(view_name, {})
+        if not view_info.get("frame_range"):
+            to_render.append((view_name, node))
+            continue
+
+        frames = parse_frame_range(view_info["frame_range"])
+        on_disk = rendered.get(view_name, {})
+        missing = [frame for frame in frames if on_disk.get(frame, 0) <= 0]
+        if not missing:
+            print(f"  {view_name}: all {len(frames)} frames rendered, skipping")
+            complete.append(view_name)
+            continue
+
+        print(f"  {view_name}: {len(missing)} of {len(frames)} frames missing")
+        view_data[view_name] = dict(view_info, frame_range=compact_frame_range(missing))
+        to_render.append((view_name, node))
+
+    return to_render, dict(data, view_data=view_data), complete
+
+
+class View_node_index:
+    """Lookup of view name -> generated node for one kroger write group
+
+    The mapping is built on first use and kept until a node inside the group is
+    created, deleted or renamed, see install_view_index_callbacks. Those
+    callbacks can miss changes (knobChanged only runs for open panels), so
+    get_view_index also drops a cached mapping when the group's node count
+    changed or one of its nodes was deleted. Lookups are plain dict lookups.
+    """
+
+    def __init__(self, kroger_node):
+        self.kroger_node = kroger_node
+        self._view_to_node = None
+        self._node_count = None
+
+    def _build(self):
         view_to_node = {}
-        for node in generated_nodes:
-            view_name_knob = node.knob("view_name_knob")
-            if view_name_knob:
-                view_name = view_name_knob.getValue()
-                view_to_node[view_name] = node
+        with kroger_trace.span("node scan"), self.kroger_node:
+            nodes = nuke.allNodes()
+            for node in nodes:
+                if node.Class() == "Input":
+                    continue
+                for view_name in generated_node_views(node):
+                    view_to_node[view_name] = node
+        kroger_trace.count("nodes indexed", len(view_to_node))
+        self._view_to_node = view_to_node
+        self._node_count = len(nodes)
+
+    def revalidate(self):
+        """Drop the mapping if nodes were added or deleted behind our back"""
+        if self._view_to_node is None:
+            return
+        with self.kroger_node:
+            node_count = len(nuke.allNodes())
+        if node_count != self._node_count or not all(
+            node_exists(node) for node in self._view_to_node.values()
+        ):
+            self.invalidate()
+
+    def mapping(self):
+        """Return the view -> node dict, rebuilding it if it was invalidated"""
+        if self._view_to_node is None:
+            self._build()
+        return self._view_to_node
+
+    def get(self, view_name):
+        return self.mapping().get(view_name)
+
+    def views(self):
+        return list(self.mapping().keys())
+
+    def nodes(self):
+        return list(self.mapping().values())
+
+    def invalidate(self):
+        self._view_to_node = None
+
+
+# kroger write group full name -> View_node_index
+_view_indexes = {}
+_view_index_callbacks_installed = False
+
+
+def node_exists(node):
+    """False for a node that was deleted, Nuke raises ValueError on any access"""
+    try:
+        node.name()
+    except ValueError:
+        return False
+    return True
+
+
+def get_view_index(kroger_node):
+    """Return the shared View_node_index for a kroger write group
+
+    Checked once here, so call it once per operation and keep the index.
+    """
+    install_view_index_callbacks()
+
+    key = kroger_node.fullName()
+    index = _view_indexes.get(key)
+    # A group renamed or deleted outside the callbacks leaves its index under
+    # a name another group may now have
+    if index is None or not (
+        node_exists(index.kroger_node) and index.kroger_node == kroger_node
+    ):
+        index = View_node_index(kroger_node)
+        _view_indexes[key] = index
+    else:
+        index.revalidate()
+    return index
+
+
+def _invalidate_view_index_for_node(node):
+    """Invalidate the index of the group node lives in, and drop the group's own"""
+    full_name = node.fullName()
+    _view_indexes.pop(full_name, None)
+
+    if "." in full_name:
+        index = _view_indexes.get(full_name.rsplit(".", 1)[0])
+        if index is not None:
+            index.invalidate()
+
+
+def _on_node_created_or_destroyed():
+    _invalidate_view_index_for_node(nuke.thisNode())
+
+
+def _on_knob_changed():
+    if nuke.thisKnob().name() in ("name", "view_name_knob"):
+        _invalidate_view_index_for_node(nuke.thisNode())
+
+
+def install_view_index_callbacks():
+    """Register the callbacks that keep the view indexes up to date"""
+    global _view_index_callbacks_installed
+    if _view_index_callbacks_installed:
+        return
+
+    nuke.addOnCreate(_on_node_created_or_destroyed)
+    nuke.addOnDestroy(_on_node_created_or_destroyed)
+    nuke.addKnobChanged(_on_knob_changed)
+    _view_index_callbacks_installed = True
+
+
+def encode_dialog_data(data, compress=None):
+    """Serialize dialog data for the dialog_data knob
+
+    The format is "kw2:" followed by compact JSON:
+
+        {"version": 2, "globals": {...}, "selected_views": [...],
+         "view_overrides": {view: {"frame_range": ..., "priority": ...}}}
+
+    Per-view values are only stored when they differ from the global range and
+    priority. Above DIALOG_DATA_COMPRESS_THRESHOLD characters (or with
+    compress=True) the JSON is zlib compressed and base64 encoded behind "kw2z:".
+    """
+    global_range = data.get("global_frame_range")
+    global_priority = data.get("global_priority")
+
+    view_overrides = {}
+    for view_name, view_info in data.get("view_data", {}).items():
+        override = {}
+        for key, value in view_info.items():
+            if key == "frame_range" and value == global_range:
+                continue
+            if key == "priority" and value == global_priority:
+                continue
+            override[key] = value
+        if override:
+            view_overrides[view_name] = override
+
+    payload = {
+        "version": DIALOG_DATA_VERSION,
+        "globals": {
+            key: value
+            for key, value in data.items()
+            if key not in ("selected_views", "view_data")
+        },
+        "selected_views": list(data.get("selected_views", [])),
+        "view_overrides": view_overrides,
+    }
+    text = json.dumps(payload, separators=(",", ":"))
+
+    if compress or (compress is None and len(text) > DIALOG_DATA_COMPRESS_THRESHOLD):
+        packed = base64.b64encode(zlib.compress(text.encode("utf-8"), 9))
+        return DIALOG_DATA_COMPRESSED_PREFIX + packed.decode("ascii")
+    return DIALOG_DATA_PREFIX + text
+
+
+def decode_dialog_data(data_str):
+    """Parse a dialog_data knob value back into the dialog data dict
+
+    Reads the versioned format written by encode_dialog_data as well as the
+    str(dict) format of older scripts. Raises ValueError if the value is
+    malformed or doesn't match the schema.
+    """
+    if data_str.startswith(DIALOG_DATA_COMPRESSED_PREFIX):
+        try:
+            packed = data_str[len(DIALOG_DATA_COMPRESSED_PREFIX) :]
+            text = zlib.decompress(base64.b64decode(packed)).decode("utf-8")
+        except zlib.error as e:
+            raise ValueError(f"corrupt compressed dialog data: {e}")
+        payload = json.loads(text)
+    elif data_str.startswith(DIALOG_DATA_PREFIX):
+        payload = json.loads(data_str[len(DIALOG_DATA_PREFIX) :])
+    else:
+        # Legacy str(dict) format
+        data = ast.literal_eval(data_str)
+        if not isinstance(data, dict):
+            raise ValueError("legacy dialog data is not a dictionary")
+        return data
+
+    if not isinstance(payload, dict):
+        raise ValueError("dialog data is not a dictionary")
+    if payload.get("version") != DIALOG_DATA_VERSION:
+        raise ValueError(f"unsupported dialog data version: {payload.get('version')}")
+
+    data = dict(payload.get("globals", {}))
+    for key, expected_type in DIALOG_DATA_SCHEMA.items():
+        if key in data and not isinstance(data[key], expected_type):
+            raise ValueError(
+                f"dialog data '{key}' should be {expected_type.__name__}, "
+                f"got {type(data[key]).__name__}"
+            )
+
+    selected_views = payload.get("selected_views", [])
+    view_overrides = payload.get("view_overrides", {})
+    if not isinstance(selected_views, list) or not isinstance(view_overrides, dict):
+        raise ValueError("dialog data views are malformed")
+
+    # Views without overrides use the global values
+    view_data = {}
+    for view_name in list(selected_views) + list(view_overrides):
+        view_info = {
+            "frame_range": data.get("global_frame_range", ""),
+            "priority": data.get("global_priority", 95),
+        }
+        override = view_overrides.get(view_name, {})
+        if not isinstance(override, dict):
+            raise ValueError(f"dialog data for view '{view_name}' is malformed")
+        view_info.update(override)
+        view_data[view_name] = view_info
+
+    data["selected_views"] = selected_views
+    data["view_data"] = view_data
+    return data
+
+
+def load_saved_data_from_node(kroger_node=None):
+    """Load saved data from the node's hidden knob"""
+    try:
+        krogerWrite = kroger_node if kroger_node else nuke.thisNode()
+        if krogerWrite.knob("dialog_data"):
+            data_str = krogerWrite["dialog_data"].getValue()
+            if data_str:
+                return decode_dialog_data(data_str)
+    except (ValueError, SyntaxError) as e:
+        print(f"Error loading saved data: {e}")
+    return {}
+
+
+def save_data_to_node(data, kroger_node=None):
+    """Save data to the node's hidden knob"""
+    try:
+        krogerWrite = kroger_node if kroger_node else nuke.thisNode()
+        if krogerWrite.knob("dialog_data"):
+            krogerWrite["dialog_data"].setValue(encode_dialog_data(data))
+    except Exception as e:
+        print(f"Error saving data: {e}")
+
+
+def submit_button_callback():
+    """Callback function for the button"""
+    
+    kroger_node = nuke.thisNode()
+
+    
+    saved_data = load_saved_data_from_node(kroger_node)
+
+    dialog = Render_submission_dialog(saved_data=saved_data, kroger_node=kroger_node)
+
+    if dialog.exec_() == QtWidgets.QDialog.Accepted:
+        data = dialog.get_selected_data()
+        print("Dialog accepted with data:")
+        print(data)
+
+    
+        save_data_to_node(data, kroger_node)
+
+    
+        submit_renders_in_background(data, kroger_node)
+
+    else:
+        print("Dialog cancelled")
+        
+        data = dialog.get_selected_data()
+        save_data_to_node(data, kroger_node)
+
+
+def batch_publish_button_callback():
+    """Callback function for the batch publish button"""
+    
+    kroger_node = nuke.thisNode()
+    # print(kroger_node.name())
+
+    dialog = Batch_publish_dialog(kroger_node=kroger_node)
+
+    if dialog.exec_() == QtWidgets.QDialog.Accepted:
+        selected_views = dialog.get_selected_views()
+        print(f"Batch publishing selected views: {selected_views}")
+        print(kroger_node.name())
+
+        
+        batch_publish(selected_views=selected_views, kroger_node=kroger_node)
+    else:
+        print("Batch publish dialog cancelled")
+
+
+def verify_renders(kroger_node, max_workers=kroger_verify.VERIFY_MAX_WORKERS):
+    """Check the rendered frames of a kroger write group's views
+
+    Views and frame ranges come from the saved dialog data, views without a
+    saved range use their node's Render Start to Render End. Returns
+    ({view: {frame: problem}}, {view: frame count}).
+    """
+    data = load_saved_data_from_node(kroger_node)
+    view_to_node = get_view_index(kroger_node).mapping()
+    view_names = data.get("selected_views") or list(view_to_node)
+
+    frame_paths = {}
+    with kroger_trace.span("verify paths"):
+        for view_name in view_names:
+            node = view_to_node.get(view_name)
+            if node is None:
+                continue
+            frame_range = data.get("view_data", {}).get(view_name, {}).get("frame_range")
+            if frame_range:
+                frames = parse_frame_range(frame_range)
+            else:
+                frames = list(
+                    range(
+                        int(_knob_value(node, "Render Start", nuke.root().firstFrame())),
+                        int(_knob_value(node, "Render End", nuke.root().lastFrame())) + 1,
+                    )
+                )
+            output_path = nuke.filename(find_render_write(node)) or ""
+            frame_paths[view_name] = {
+                frame: frame_file_path(output_path, view_name, frame) for frame in frames
+            }
+
+    with kroger_trace.span("verify frames"):
+        bad_frames = kroger_verify.verify_views(frame_paths, max_workers)
+    return bad_frames, {view: len(paths) for view, paths in frame_paths.items()}
+
+
+def format_verify_report(bad_frames, frame_counts):
+    """One line per view, bad frames as a range ready to resubmit"""
+    lines = []
+    for view_name, frame_count in frame_counts.items():
+        bad = bad_frames.get(view_name, {})
+        if not bad:
+            lines.append(f"{view_name}: OK ({frame_count} frames)")
+            continue
+
+        problem_counts = {}
+        for problem in bad.values():
+            kind = problem.split(",")[0].split(" (")[0]
+            problem_counts[kind] = problem_counts.get(kind, 0) + 1
+        problems = ", ".join(f"{kind} x{count}" for kind, count in problem_counts.items())
+        lines.append(
+            f"{view_name}: {len(bad)} of {frame_count} bad, "
+            f"resubmit {compact_frame_range(bad)} ({problems})"
+        )
+    return "\n".join(lines)
+
+
+def verify_button_callback():
+    """Callback for the verify renders button"""
+    kroger_node = nuke.thisNode()
+
+    with kroger_trace.trace("verify"):
+        bad_frames, frame_counts = verify_renders(kroger_node)
+    report = format_verify_report(bad_frames, frame_counts)
+    print(f"Render verification for {kroger_node.name()}:\n{report}")
+
+    bad_views = [view_name for view_name, bad in bad_frames.items() if bad]
+    if not bad_views:
+        show_message(f"All {len(frame_counts)} views rendered completely.\n\n{report}")
+        return
+
+    if nuke.GUI and nuke.ask(
+        f"{report}\n\nSet the frame ranges of the {len(bad_views)} bad views to "
+        "their bad frames for resubmission?"
+    ):
+        data = load_saved_data_from_node(kroger_node)
+        view_data = data.setdefault("view_data", {})
+        for view_name in bad_views:
+            view_info = view_data.setdefault(
+                view_name, {"priority": data.get("global_priority", 95)}
+            )
+            view_info["frame_range"] = compact_frame_range(bad_frames[view_name])
+        data["selected_views"] = bad_views
+        save_data_to_node(data, kroger_node)
+
+
+class Submission_cancelled(Exception):
+    """Result error for views that were not submitted because of a cancel"""
+
+
+def run_in_main_thread(function, *args):
+    """Call function on Nuke's main thread and return its result
+
+    Node graph access from worker threads has to go through here.
+    """
+    if threading.current_thread() is threading.main_thread():
+        return function(*args)
+    return nuke.executeInMainThreadWithResult(function, args=args)
+
+
+def show_message(text):
+    """Show text in a message box, or print it when Nuke has no GUI (nuke -t)"""
+    if nuke.GUI:
+        nuke.message(text)
+    else:
+        print(text)
+
+
+def _submit_in_group_context(deadline_module, node, batch_name):
+    with node.begin():
+        deadline_module.deadlineNetworkSubmit(
+            batch=batch_name,
+            silent=True,
+            node=node,
+        )
+
+
+def submit_views_parallel(
+    view_nodes,
+    batch_name,
+    data,
+    deadline_module,
+    max_workers=SUBMIT_MAX_WORKERS,
+    on_progress=None,
+    cancel_event=None,
+):
+    """Submit (view_name, node) pairs to Deadline, optionally on worker threads
+
+    Returns a list of (view_name, error) tuples in the same order as view_nodes,
+    error is None for views that were submitted successfully and a
+    Submission_cancelled for views skipped after cancel_event was set.
+    on_progress(view_name, state) is called with "submitting", "done", "failed"
+    or "cancelled", from whichever thread did the work.
+
+    With max_workers=1 views are submitted one after another with
+    deadlineNetworkSubmit inside each node's group context on the main
+    thread, as before. deadlineNetworkSubmit reads the node graph, so it is
+    never called from a worker. With more workers every job payload is built
+    on the main thread first (see build_job_payload), and the workers only
+    run one deadlinecommand per view.
+    """
+
+    def report(view_name, state):
+        if on_progress is not None:
+            on_progress(view_name, state)
+
+    def submit_one(view_name, submit):
+        if cancel_event is not None and cancel_event.is_set():
+            report(view_name, "cancelled")
+            raise Submission_cancelled("submission cancelled")
+
+        report(view_name, "submitting")
+        try:
+            with kroger_trace.span("submit view", view=view_name):
+                submit()
+        except Exception:
+            report(view_name, "failed")
+            raise
+        report(view_name, "done")
+
+    results = []
+
+    if max_workers <= 1 or len(view_nodes) <= 1:
+        for view_name, node in view_nodes:
+            try:
+                submit_one(
+                    view_name,
+                    lambda: run_in_main_thread(
+                        _submit_in_group_context, deadline_module, node, batch_name
+                    ),
+                )
+                results.append((view_name, None))
+            except Exception as e:
+                results.append((view_name, e))
+        return results
+
+    temp_dir = tempfile.mkdtemp(prefix="kroger_write_")
+    try:
+        # Every knob is read here, the workers only talk to Deadline
+        with kroger_trace.span("build payloads", jobs=len(view_nodes)):
+            arguments = run_in_main_thread(
+                _write_payload_files, view_nodes, batch_name, data, temp_dir
+            )
+        deadline_command = deadline_command_path()
+
+        def submit_payload(job_arguments):
+            command = [deadline_command, "-SubmitMultipleJobs"] + job_arguments
+            process = subprocess.run(command, capture_output=True, text=True)
+            job_results = _parse_multi_job_output(process.stdout + process.stderr)
+            if not job_results or not job_results[0][0]:
+                raise RuntimeError(
+                    f"Deadline rejected the job:\n{(process.stdout + process.stderr).strip()}"
+                )
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(view_nodes))) as executor:
+            futures = [
+                executor.submit(
+                    submit_one,
+                    view_name,
+                    lambda index=index: submit_payload(arguments[index * 3 : index * 3 + 3]),
+                )
+                for index, (view_name, _) in enumerate(view_nodes)
+            ]
+
+            for (view_name, _), future in zip(view_nodes, futures):
+                try:
+                    future.result()
+                    results.append((view_name, None))
+                except Exception as e:
+                    results.append((view_name, e))
+    except Exception as e:
+        for view_name, _ in view_nodes[len(results) :]:
+            report(view_name, "failed")
+            results.append((view_name, e))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return results
+
 
-        print("View to node mapping:")
-        print(view_to_node)
+def find_render_write(node):
+    """Return the Write node that does the rendering for a generated node"""
+    if node.Class() == "Write":
+        return node
+
+    with node:
+        write_nodes = nuke.allNodes("Write")
+
+    return write_nodes[0] if write_nodes else node
+
+
+def _knob_value(node, knob_name, default=None):
+    """Return a knob's value, or default if the node doesn't have the knob"""
+    knob = node.knob(knob_name)
+    if knob is None:
+        return default
+    return knob.value()
+
+
+def build_job_payload(view_name, node, batch_name, data):
+    """Build the Deadline job-info and plugin-info dicts for one generated node
+
+    Render settings are read from the node's knobs, which apply_settings has
+    already written, falling back to the dialog data if a knob is missing.
+
+    hornet_deadline_utils only exposes deadlineNetworkSubmit, not the payload
+    it builds, so this is our own job description and may differ from the
+    studio submitter: NukeX and GPU rendering are off, and no extra info,
+    environment or submitter defaults are added. Only the opt-in engines use
+    it (bulk submit, missing frames only, job packing, more than one submit
+    worker) and multi-view jobs, which deadlineNetworkSubmit can't describe.
+    """
+    write_node = find_render_write(node)
+    script_path = nuke.root().name()
+    script = os.path.basename(script_path).split(".")[0]
+
+    # Send the exact frame list when the view has one, else the node's range
+    frame_range = data["view_data"].get(view_name, {}).get("frame_range", "")
+    if frame_range:
+        frames = compact_frame_range(parse_frame_range(frame_range))
+    else:
+        start_frame = int(_knob_value(node, "Render Start", nuke.root().firstFrame()))
+        end_frame = int(_knob_value(node, "Render End", nuke.root().lastFrame()))
+        frames = f"{start_frame}-{end_frame}"
+
+    job_info = {
+        "Plugin": "Nuke",
+        "Name": f"{script} - {node.name()}",
+        "BatchName": batch_name,
+        "Frames": frames,
+        "ChunkSize": int(_knob_value(node, "deadlineChunkSize", data["chunk_size"])),
+        "Priority": int(
+            _knob_value(
+                node,
+                "deadlinePriority",
+                data["view_data"].get(view_name, {}).get("priority", 95),
+            )
+        ),
+        "ConcurrentTasks": int(
+            _knob_value(node, "concurrentTasks", data["concurrent_tasks"])
+        ),
+        "Pool": _knob_value(node, "deadlinePool", data["pool"]),
+        "Group": _knob_value(node, "deadlineGroup", data["group"]),
+    }
+
+    output_path = nuke.filename(write_node)
+    if output_path:
+        job_info["OutputDirectory0"] = os.path.dirname(output_path)
+        job_info["OutputFilename0"] = os.path.basename(output_path)
+
+    plugin_info = {
+        "SceneFile": script_path,
+        "Version": f"{nuke.NUKE_VERSION_MAJOR}.{nuke.NUKE_VERSION_MINOR}",
+        "WriteNode": write_node.fullName(),
+        "Views": view_name,
+        "BatchMode": True,
+        "NukeX": False,
+        "UseGpu": False,
+    }
+
+    return job_info, plugin_info
+
+
+def build_packed_job_payload(view_nodes, batch_name, data):
+    """Build the Deadline payload of one job that renders several views
+
+    Every view's render Write is a WriteNode{i} of the job with its own
+    start and end frame, the job's frames are exactly the frames of all the
+    views, so there are no empty tasks between ranges that don't touch.
+    Views is left out, the OneView in front of each Write already picks its
+    view and listing them all would render every Write once per view.
+    Render settings come from the first view, the job takes the highest
+    priority.
+    """
+    job_info, plugin_info = build_job_payload(*view_nodes[0], batch_name, data)
+    script = os.path.basename(nuke.root().name()).split(".")[0]
+
+    for key in [key for key in job_info if key.startswith("Output")]:
+        del job_info[key]
+    del plugin_info["WriteNode"]
+    del plugin_info["Views"]
+
+    all_frames = set()
+    priorities = []
+    for index, (view_name, node) in enumerate(view_nodes):
+        frames = parse_frame_range(data["view_data"][view_name]["frame_range"])
+        all_frames.update(frames)
+        priorities.append(
+            int(
+                _knob_value(
+                    node, "deadlinePriority", data["view_data"][view_name]["priority"]
+                )
+            )
+        )
+
+        write_node = find_render_write(node)
+        plugin_info[f"WriteNode{index}"] = write_node.fullName()
+        plugin_info[f"WriteNode{index}StartFrame"] = frames[0]
+        plugin_info[f"WriteNode{index}EndFrame"] = frames[-1]
+
+        output_path = nuke.filename(write_node)
+        if output_path:
+            job_info[f"OutputDirectory{index}"] = os.path.dirname(output_path)
+            job_info[f"OutputFilename{index}"] = os.path.basename(output_path)
+
+    job_info["Name"] = f"{script} - {len(view_nodes)} views packed"
+    job_info["Frames"] = compact_frame_range(all_frames)
+    job_info["Priority"] = max(priorities)
+    return job_info, plugin_info
+
+
+def deadline_command_path():
+    """Locate deadlinecommand, preferring the DEADLINE_PATH install"""
+    deadline_bin = os.environ.get("DEADLINE_PATH", "")
+    if deadline_bin:
+        for name in ("deadlinecommand", "deadlinecommand.exe"):
+            candidate = os.path.join(deadline_bin, name)
+            if os.path.isfile(candidate):
+                return candidate
+
+    return shutil.which("deadlinecommand") or "deadlinecommand"
+
+
+def _write_info_file(path, info):
+    with open(path, "w", encoding="utf-8") as info_file:
+        for key, value in info.items():
+            info_file.write(f"{key}={value}\n")
+
+
+def _parse_multi_job_output(output):
+    """Split deadlinecommand -SubmitMultipleJobs output into (success, job_id) per job"""
+    results = []
+    for line in output.splitlines():
+        line = line.strip()
+        if line.startswith("Result="):
+            results.append([line == "Result=Success", None])
+        elif line.startswith("JobID=") and results:
+            results[-1][1] = line.split("=", 1)[1]
+    return [tuple(result) for result in results]
+
+
+def _write_payload_files(view_nodes, batch_name, data, temp_dir):
+    """Save the script and write job/plugin info files, returns deadlinecommand args"""
+    if nuke.root().modified():
+        nuke.scriptSave()
+
+    packs = data.get("packed_jobs", {})
+    arguments = []
+    for index, (view_name, node) in enumerate(view_nodes):
+        if view_name in packs:
+            job_info, plugin_info = build_packed_job_payload(
+                packs[view_name], batch_name, data
+            )
+        else:
+            job_info, plugin_info = build_job_payload(view_name, node, batch_name, data)
+        job_file = os.path.join(temp_dir, f"job_info_{index}.job")
+        plugin_file = os.path.join(temp_dir, f"plugin_info_{index}.job")
+        _write_info_file(job_file, job_info)
+        _write_info_file(plugin_file, plugin_info)
+        arguments.extend(["-job", job_file, plugin_file])
+    return arguments
+
+
+def submit_views_bulk(view_nodes, batch_name, data, on_progress=None, cancel_event=None):
+    """Submit (view_name, node) pairs to Deadline in a single deadlinecommand call
+
+    Payloads for every view are built up front and handed to
+    deadlinecommand -SubmitMultipleJobs, so the per-call startup is paid once
+    per batch. Returns (view_name, error) tuples and reports progress like
+    submit_views_parallel.
+    """
+
+    def report(state):
+        if on_progress is not None:
+            for view_name, _ in view_nodes:
+                on_progress(view_name, state)
+
+    if not view_nodes:
+        return []
+
+    if cancel_event is not None and cancel_event.is_set():
+        report("cancelled")
+        error = Submission_cancelled("submission cancelled")
+        return [(view_name, error) for view_name, _ in view_nodes]
+
+    report("submitting")
+    temp_dir = tempfile.mkdtemp(prefix="kroger_write_")
+    try:
+        # Payloads read knobs, so they are built on the main thread
+        command = [deadline_command_path(), "-SubmitMultipleJobs"]
+        with kroger_trace.span("build payloads", jobs=len(view_nodes)):
+            command += run_in_main_thread(
+                _write_payload_files, view_nodes, batch_name, data, temp_dir
+            )
+
+        print(f"bulk submitting {len(view_nodes)} jobs in one deadlinecommand call...")
+        with kroger_trace.span("bulk submit", jobs=len(view_nodes)):
+            process = subprocess.run(command, capture_output=True, text=True)
+        output = process.stdout + process.stderr
+    except Exception as e:
+        report("failed")
+        return [(view_name, e) for view_name, _ in view_nodes]
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    job_results = _parse_multi_job_output(output)
+    if len(job_results) != len(view_nodes):
+        report("failed")
+        error = RuntimeError(
+            f"deadlinecommand returned {len(job_results)} results for "
+            f"{len(view_nodes)} jobs:\n{output.strip()}"
+        )
+        return [(view_name, error) for view_name, _ in view_nodes]
+
+    results = []
+    for (view_name, _), (success, job_id) in zip(view_nodes, job_results):
+        if success:
+            print(f"  {view_name}: job {job_id}")
+            results.append((view_name, None))
+        else:
+            results.append((view_name, RuntimeError("Deadline rejected the job")))
+        if on_progress is not None:
+            on_progress(view_name, "done" if success else "failed")
+    return results
+
+
+def submit_renders(
+    data,
+    krogerWrite,
+    deadline_module=None,
+    max_workers=None,
+    on_progress=None,
+    cancel_event=None,
+):
+    """Submit the selected renders to the farm
+
+    deadline_module defaults to hornet_deadline_utils, max_workers defaults to the
+    "submit_workers" value saved from the dialog. Safe to call from a worker
+    thread, node graph access and messages are run on the main thread.
+    on_progress and cancel_event are passed on to the submit engines.
+
+    Returns a dict of succeeded, failed and cancelled counts, or None if nothing
+    was submitted. The whole submission is recorded as a kroger_trace trace.
+    """
+    with kroger_trace.trace("submit"):
+        return _submit_renders(
+            data, krogerWrite, deadline_module, max_workers, on_progress, cancel_event
+        )
+
+
+def _submit_renders(
+    data, krogerWrite, deadline_module, max_workers, on_progress, cancel_event
+):
+    print("submitting renders with data:")
+    import os
+    from datetime import datetime
+
+    def notify(text):
+        run_in_main_thread(show_message, text)
+
+    def report(view_name, state):
+        if on_progress is not None:
+            on_progress(view_name, state)
+
+    # Progress of a multi-view job is shown on each of its views
+    view_progress = on_progress
+    if view_progress is not None:
+
+        def on_progress(job_name, state):
+            for view_name in job_view_names(job_name):
+                view_progress(view_name, state)
+
+    if deadline_module is None and not data.get("bulk_submit"):
+        try:
+            import hornet_deadline_utils as deadline_module
+        except ImportError:
+            notify("Error: hornet_deadline_utils module not found!")
+            return
+
+    if max_workers is None:
+        max_workers = data.get("submit_workers", SUBMIT_MAX_WORKERS)
+
+    selected_views = data["selected_views"]
+
+    if not selected_views:
+        notify("No views selected for rendering!")
+        return
+
+    def scan_node_graph():
+        print("krogerWrite node found:", krogerWrite.name())
+        script = os.path.basename(nuke.toNode("root").name()).split(".")[0]
+        return script, dict(get_view_index(krogerWrite).mapping())
+
+    failed = 0
+    script, view_to_node = run_in_main_thread(scan_node_graph)
+    now = datetime.now().strftime("%H-%M-%S")
+    batch_name = f"{script}_{now}"
+
+
+    if not view_to_node:
+        notify("No generated nodes found in kroger write group!")
+        return
+
+    print("View to node mapping:")
+    print(view_to_node)
 
     
+    view_nodes = []
     for view_name in selected_views:
         if view_name not in view_to_node:
             print(f"Warning: No node found for view '{view_name}', skipping...")
+            report(view_name, "failed")
             failed += 1
             continue
 
         node = view_to_node[view_name]
-        print(node.fullName())
-        try:
-            
-            with node.begin():
-                hornet_deadline_utils.deadlineNetworkSubmit(
-                    # deadlineNetworkSubmit(
-                    batch=batch_name,
-                    silent=True,
-                    node=node,
-                )
+        view_nodes.append((view_name, node))
+
+    view_nodes, data = run_in_main_thread(combine_multiview_jobs, view_nodes, data)
+
+    complete = []
+    if data.get("missing_frames_only"):
+        view_nodes, data, complete = limit_to_missing_frames(view_nodes, data)
+        for view_name in complete:
+            report(view_name, "complete")
+
+    view_nodes, unchanged, fingerprints = run_in_main_thread(
+        split_unchanged_views, view_nodes, data
+    )
+    for view_name in unchanged:
+        report(view_name, "unchanged")
+
+    submit_results = submit_view_nodes(
+        view_nodes,
+        batch_name,
+        data,
+        deadline_module,
+        max_workers,
+        on_progress,
+        cancel_event,
+    )
+    counts = record_submit_results(
+        script, batch_name, data, submit_results, fingerprints
+    )
+    counts["failed"] += failed
+    counts["unchanged"] = len(unchanged)
+    counts["unchanged_views"] = sorted(unchanged)
+    counts["complete"] = len(complete)
+
+    notify(submission_message(counts))
+
+    print(
+        f"Submission complete: {counts['succeeded']} succeeded, "
+        f"{counts['failed']} failed, {counts['cancelled']} cancelled"
+    )
+    return counts
+
+
+def submit_view_nodes(
+    view_nodes,
+    batch_name,
+    data,
+    deadline_module=None,
+    max_workers=SUBMIT_MAX_WORKERS,
+    on_progress=None,
+    cancel_event=None,
+):
+    """Submit (view_name, node) pairs of one kroger write group under batch_name
+
+    Picks the engine from the group's dialog data: everything in one
+    deadlinecommand call with bulk_submit or missing_frames_only (the exact
+    frame lists can't go through the Render Start/End knobs), otherwise
+    deadlineNetworkSubmit with multi-view jobs sent as job payloads. A view
+    with gaps in its frame range still goes through deadlineNetworkSubmit and
+    renders its whole span, bulk_submit sends the exact frames. With data["pack_target_minutes"]
+    short views are packed into shared jobs first, see pack_views. Returns
+    (view_name, error) tuples.
+    """
+    submit_results = []
+    if data.get("pack_target_minutes"):
+        packs, view_nodes = pack_views(
+            view_nodes, data, data["pack_target_minutes"] * 60
+        )
+        if packs:
+            submit_results = submit_packed_views(
+                packs, batch_name, data, on_progress, cancel_event
+            )
+
+    if data.get("bulk_submit") or data.get("missing_frames_only"):
+        return submit_results + submit_views_bulk(
+            view_nodes, batch_name, data, on_progress, cancel_event
+        )
+
+    # deadlineNetworkSubmit renders Render Start to Render End of every view
+    # of the node, so multi-view jobs go through a job payload with their views
+    network_views = []
+    payload_views = []
+    for view_name, node in view_nodes:
+        view_info = data["view_data"].get(view_name, {})
+        frame_range = view_info.get("frame_range", "")
+        if view_info.get("multiview"):
+            payload_views.append((view_name, node))
+            continue
+        if frame_range and len(frame_intervals(parse_frame_range(frame_range))) > 1:
+            print(
+                f"{view_name}: frame range {frame_range} has gaps, the whole "
+                "span is rendered, use bulk submit for the exact frames"
+            )
+        network_views.append((view_name, node))
+
+    print(f"submitting {len(network_views)} views with {max_workers} workers...")
+    submit_results += submit_views_parallel(
+        network_views,
+        batch_name,
+        data,
+        deadline_module,
+        max_workers,
+        on_progress,
+        cancel_event,
+    )
+    if payload_views:
+        print(f"submitting {len(payload_views)} views with frame lists...")
+        submit_results += submit_views_bulk(
+            payload_views, batch_name, data, on_progress, cancel_event
+        )
+    return submit_results
+
+
+def submit_packed_views(packs, batch_name, data, on_progress=None, cancel_event=None):
+    """Submit packs of (view_name, node) pairs as one job each
+
+    The jobs go out in one deadlinecommand call, each named after its views
+    (see job_view_names). Returns a (view_name, error) tuple per view.
+    """
+    jobs = {
+        JOB_VIEW_SEPARATOR.join(view_name for view_name, _ in pack): pack
+        for pack in packs
+    }
+    print(
+        f"packed {sum(len(pack) for pack in packs)} views into {len(packs)} jobs: "
+        + "; ".join(jobs)
+    )
+    job_results = submit_views_bulk(
+        [(job_name, pack[0][1]) for job_name, pack in jobs.items()],
+        batch_name,
+        dict(data, packed_jobs=jobs),
+        on_progress,
+        cancel_event,
+    )
+    return [
+        (view_name, error)
+        for job_name, error in job_results
+        for view_name in job_view_names(job_name)
+    ]
+
+
+def record_submit_results(script, batch_name, data, submit_results, fingerprints=None):
+    """Log submit results and add the submitted views to the render history
+
+    fingerprints ({view: fingerprint}) of the views that went through are
+    remembered, see split_unchanged_views. A multi-view job gets a history
+    row per view, render time estimates look views up by name. Returns a
+    dict of succeeded, failed and cancelled counts.
+    """
+    succeeded = 0
+    failed = 0
+    cancelled = 0
 
+    history_rows = []
+    submitted = []
+    for view_name, error in submit_results:
+        if error is None:
             succeeded += 1
             print(f"Successfully submitted: {view_name}")
-
-        except Exception as e:
-            print(f"Failed to submit view '{view_name}': {str(e)}")
+            submitted.append(view_name)
+            frame_range = data["view_data"].get(view_name, {}).get("frame_range", "")
+            frame_count = len(parse_frame_range(frame_range)) if frame_range else 0
+            history_rows.extend(
+                {
+                    "script": script,
+                    "batch_name": batch_name,
+                    "view": job_view,
+                    "frame_count": frame_count,
+                    "chunk_size": data.get("chunk_size", 1),
+                    "file_format": data.get("file_format"),
+                }
+                for job_view in job_view_names(view_name)
+            )
+        elif isinstance(error, Submission_cancelled):
+            print(f"Cancelled: {view_name}")
+            cancelled += 1
+        else:
+            print(f"Failed to submit view '{view_name}': {str(error)}")
             failed += 1
 
-    # Show results
-    if succeeded > 0:
+    try:
+        with kroger_trace.span("record history"):
+            kroger_history.record_submissions(history_rows)
+            if fingerprints:
+                kroger_history.record_fingerprints(
+                    [
+                        {
+                            "fingerprint": fingerprints[view_name],
+                            "script": script,
+                            "batch_name": batch_name,
+                            "view": view_name,
+                        }
+                        for view_name in submitted
+                        if view_name in fingerprints
+                    ]
+                )
+    except Exception as e:
+        print(f"Error recording render history: {e}")
+
+    kroger_trace.count("views submitted", succeeded)
+    kroger_trace.count("views failed", failed)
+    kroger_trace.count("views cancelled", cancelled)
+    return {"succeeded": succeeded, "failed": failed, "cancelled": cancelled}
+
+
+def submission_message(counts):
+    """Summary of a submission for the user"""
+    succeeded = counts["succeeded"]
+    failed = counts["failed"]
+    unchanged = counts.get("unchanged", 0)
+    complete = counts.get("complete", 0)
+    if succeeded == 0 and failed == 0 and complete > 0 and unchanged == 0:
+        message = "Every frame is already rendered, no renders were submitted."
+    elif succeeded == 0 and failed == 0 and unchanged > 0:
+        message = "Nothing changed since the last submission, no renders were submitted."
+    elif succeeded > 0:
         if failed > 0:
-            nuke.message(
-                f"Submitted {succeeded} render{'s' if succeeded != 1 else ''} to farm.\n{failed} submission{'s' if failed != 1 else ''} failed."
-            )
+            message = f"Submitted {succeeded} render{'s' if succeeded != 1 else ''} to farm.\n{failed} submission{'s' if failed != 1 else ''} failed."
         else:
-            nuke.message(
-                f"Successfully submitted {succeeded} render{'s' if succeeded != 1 else ''} to farm!"
-            )
+            message = f"Successfully submitted {succeeded} render{'s' if succeeded != 1 else ''} to farm!"
     else:
-        nuke.message("No renders were submitted successfully.")
+        message = "No renders were submitted successfully."
+    if counts["cancelled"] > 0:
+        message += f"\n{counts['cancelled']} cancelled."
+    if counts.get("unchanged_views"):
+        message += f"\nUnchanged, not resubmitted: {', '.join(counts['unchanged_views'])}"
+    elif unchanged > 0 and (succeeded or failed):
+        message += f"\n{unchanged} unchanged view{'s' if unchanged != 1 else ''} skipped."
+    if complete > 0 and (succeeded or failed or unchanged):
+        message += f"\n{complete} fully rendered view{'s' if complete != 1 else ''} skipped."
+    return message
+
+
+# (script path, modification time, size) -> content hash
+_script_hashes = {}
+
+
+def script_content_hash(script_path):
+    """sha256 of a saved script, or None if it isn't on disk"""
+    try:
+        stat = os.stat(script_path)
+    except OSError:
+        return None
+
+    key = (script_path, stat.st_mtime_ns, stat.st_size)
+    if key not in _script_hashes:
+        content_hash = hashlib.sha256()
+        with open(script_path, "rb") as script_file:
+            for block in iter(lambda: script_file.read(1024 * 1024), b""):
+                content_hash.update(block)
+        _script_hashes.clear()
+        _script_hashes[key] = content_hash.hexdigest()
+    return _script_hashes[key]
+
+
+def submission_fingerprint(view_name, node, data, script_hash):
+    """Fingerprint of the job a view would submit
+
+    Covers the saved script, the view's frame list, the generated node's
+    render settings and its output path.
+    """
+    frame_range = data["view_data"].get(view_name, {}).get("frame_range", "")
+    frames = compact_frame_range(parse_frame_range(frame_range)) if frame_range else ""
+    knob_values = {name: _knob_value(node, name) for name in RENDER_SETTING_KNOBS}
+    output_path = nuke.filename(find_render_write(node)) or ""
+
+    job = json.dumps(
+        [script_hash, view_name, frames, output_path, knob_values],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(job.encode("utf-8")).hexdigest()
+
+
+def split_unchanged_views(view_nodes, data):
+    """Find the (view_name, node) pairs whose exact job was submitted recently
+
+    Returns (view_nodes to submit, {view: batch name} of skipped views,
+    {view: fingerprint}). Does nothing with data["skip_unchanged"] off, so
+    only submits made with it on are remembered. Saves the script if it has
+    unsaved changes, the hash is of the saved file. Main thread only.
+    """
+    if not view_nodes or not data.get("skip_unchanged", False):
+        return view_nodes, {}, {}
+
+    with kroger_trace.span("fingerprint", views=len(view_nodes)):
+        if nuke.root().modified():
+            nuke.scriptSave()
+        script_hash = script_content_hash(nuke.root().name())
+        if script_hash is None:
+            return view_nodes, {}, {}
+
+        fingerprints = {
+            view_name: submission_fingerprint(view_name, node, data, script_hash)
+            for view_name, node in view_nodes
+        }
+
+    try:
+        already_submitted = kroger_history.submitted_fingerprints(fingerprints.values())
+    except Exception as e:
+        print(f"Error reading submission cache: {e}")
+        already_submitted = {}
+
+    to_submit = []
+    unchanged = {}
+    for view_name, node in view_nodes:
+        batch_name = already_submitted.get(fingerprints[view_name])
+        if batch_name is None:
+            to_submit.append((view_name, node))
+        else:
+            print(f"  {view_name}: unchanged since batch {batch_name}, skipping")
+            unchanged[view_name] = batch_name
+
+    return to_submit, unchanged, fingerprints
+
+
+def scan_kroger_writes():
+    """Find every kroger write group and its generated nodes in one node graph pass
+
+    Returns a list of (kroger write group, {view: generated node},
+    {generated node full name: render Write node}) in script order.
+    """
+    groups = {}
+    view_nodes = {}
+    render_writes = {}
+
+    with kroger_trace.span("node scan"), nuke.root():
+        all_nodes = nuke.allNodes(recurseGroups=True)
+
+    for node in all_nodes:
+        full_name = node.fullName()
+        parent_name = full_name.rsplit(".", 1)[0] if "." in full_name else ""
+
+        if node.knob("dialog_data") is not None and node.knob("write_nodes_list"):
+            groups[full_name] = node
+            view_nodes.setdefault(full_name, {})
+
+        views = generated_node_views(node)
+        if views and node.Class() != "Input":
+            for view_name in views:
+                view_nodes.setdefault(parent_name, {})[view_name] = node
+            if node.Class() == "Write":
+                render_writes[full_name] = node
+        elif node.Class() == "Write" and parent_name not in render_writes:
+            render_writes[parent_name] = node
+
+    kroger_trace.count("nodes scanned", len(all_nodes))
+    return [
+        (group, view_nodes[full_name], render_writes)
+        for full_name, group in groups.items()
+    ]
+
+
+def submit_all_kroger_writes(deadline_module=None, dry_run=False):
+    """Submit every kroger write group in the script under one batch name
+
+    Each group is submitted with the settings saved from its dialog, applied
+    to its generated nodes first as accepting the dialog does. A view whose
+    output path was already submitted by another group is skipped, as are
+    views submitted unchanged recently. dry_run applies the settings and
+    counts the views as skipped instead of submitting them. Returns a dict of
+    succeeded, failed, cancelled, unchanged, complete, duplicates and skipped
+    counts, None if nothing could be submitted.
+    """
+    from datetime import datetime
+
+    with kroger_trace.trace("submit all"):
+        kroger_writes = scan_kroger_writes()
+        if not kroger_writes:
+            show_message("No kroger write nodes found in the script!")
+            return
+
+        script = os.path.basename(nuke.root().name()).split(".")[0]
+        batch_name = f"{script}_{datetime.now().strftime('%H-%M-%S')}"
+
+        totals = {
+            "succeeded": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "unchanged": 0,
+            "unchanged_views": [],
+            "complete": 0,
+            "duplicates": 0,
+            "skipped": 0,
+        }
+        submitted_targets = set()
+        skipped_groups = []
+
+        for kroger_node, view_to_node, render_writes in kroger_writes:
+            data = load_saved_data_from_node(kroger_node)
+            if not data.get("selected_views"):
+                print(f"{kroger_node.fullName()}: no saved submission settings")
+                skipped_groups.append(kroger_node.name())
+                totals["skipped"] += 1
+                continue
+
+            if deadline_module is None and not data.get("bulk_submit") and not dry_run:
+                try:
+                    import hornet_deadline_utils as deadline_module
+                except ImportError:
+                    show_message("Error: hornet_deadline_utils module not found!")
+                    return
+
+            result = apply_settings_to_nodes(view_to_node, data)
+            print(f"{kroger_node.fullName()}: {result.summary()}")
+            failed_views = {
+                failed_view
+                for job_name in result.errors
+                for failed_view in job_view_names(job_name)
+            }
+
+            view_nodes = []
+            for view_name in data["selected_views"]:
+                node = view_to_node.get(view_name)
+                if node is None or view_name in failed_views:
+                    print(f"  {view_name}: not submitted, see above")
+                    totals["failed"] += 1
+                    continue
+
+                render_write = render_writes.get(node.fullName(), node)
+                target = (view_name, nuke.filename(render_write) or node.fullName())
+                if target in submitted_targets:
+                    print(f"  {view_name}: {target[1]} already submitted, skipping")
+                    totals["duplicates"] += 1
+                    continue
 
-    print(f"Submission complete: {succeeded} succeeded, {failed} failed")
+                submitted_targets.add(target)
+                view_nodes.append((view_name, node))
+
+            view_nodes, data = combine_multiview_jobs(view_nodes, data)
+
+            if dry_run:
+                print(
+                    f"{kroger_node.fullName()}: would submit "
+                    f"{', '.join(view_name for view_name, _ in view_nodes)}"
+                )
+                totals["skipped"] += len(view_nodes)
+                continue
+
+            if data.get("missing_frames_only"):
+                view_nodes, data, complete = limit_to_missing_frames(view_nodes, data)
+                totals["complete"] += len(complete)
+
+            # The farm renders the script as saved, with the settings applied
+            if nuke.root().modified():
+                nuke.scriptSave()
+
+            view_nodes, unchanged, fingerprints = split_unchanged_views(view_nodes, data)
+            totals["unchanged"] += len(unchanged)
+            totals["unchanged_views"].extend(sorted(unchanged))
+
+            submit_results = submit_view_nodes(
+                view_nodes,
+                batch_name,
+                data,
+                deadline_module,
+                data.get("submit_workers", SUBMIT_MAX_WORKERS),
+            )
+            counts = record_submit_results(
+                script, batch_name, data, submit_results, fingerprints
+            )
+            for key, value in counts.items():
+                totals[key] += value
+
+        message = submission_message(totals)
+        if totals["duplicates"]:
+            message += f"\n{totals['duplicates']} duplicate outputs skipped."
+        if skipped_groups:
+            message += f"\nNo saved settings: {', '.join(skipped_groups)}"
+        if dry_run:
+            message += f"\nDry run, {totals['skipped']} views not submitted."
+        show_message(message)
+        return totals
 
 
 def update_write_nodes_list(kroger_node=None):
     """Update the list of write nodes and their views in the properties panel"""
     try:    
         krogerWrite = kroger_node if kroger_node else nuke.thisNode()
-        views_list = []
-
-        
-        with krogerWrite:
-            all_nodes = nuke.allNodes()
-        
-            generated_nodes = [node for node in all_nodes if node.Class() != "Input"]
-
-            for generated_node in generated_nodes:
-        
-                view_name_knob = generated_node.knob("view_name_knob")
-                if view_name_knob:
-                    view_name = view_name_knob.getValue()
-                    views_list.append(view_name)
+        views_list = get_view_index(krogerWrite).views()
 
         
         write_nodes_list_knob = krogerWrite.knob("write_nodes_list")
@@ -949,30 +3410,39 @@ def update_write_nodes_list(kroger_node=None):
         print(f"Error updating write nodes list: {e}")
 
 
-def regenerate_write_nodes():
-    """Delete all existing generated nodes and recreate them based on current views"""
+@kroger_trace.trace("regenerate")
+def regenerate_write_nodes(full=False):
+    """Bring the generated nodes in line with the current views and aspect
+
+    By default only the view pairs that changed are touched, see
+    refresh_write_nodes. full=True deletes every generated node and recreates
+    them all.
+    """
     try:
         krogerWrite = nuke.thisNode()
         print("regenerating write nodes...")
 
-        with krogerWrite:
-        
-            all_nodes = nuke.allNodes()
-            generated_nodes = [node for node in all_nodes if node.Class() != "Input"]
-            print(f"deleting {len(generated_nodes)} existing nodes...")
-
-            for generated_node in generated_nodes:
-                nuke.delete(generated_node)
-
-        
         import quick_write
 
         sub_write_node_generator = quick_write._quick_write_node
 
+        if full:
+            with krogerWrite:
         
-        create_write_nodes_for_views(krogerWrite, sub_write_node_generator)
+                all_nodes = nuke.allNodes()
+                generated_nodes = [node for node in all_nodes if node.Class() != "Input"]
+                print(f"deleting {len(generated_nodes)} existing nodes...")
 
-        
+                for generated_node in generated_nodes:
+                    nuke.delete(generated_node)
+
+            get_view_index(krogerWrite).invalidate()
+
+            create_write_nodes_for_views(krogerWrite, sub_write_node_generator)
+        else:
+            refresh_write_nodes(krogerWrite, sub_write_node_generator)
+
+    
         update_write_nodes_list(krogerWrite)
         print("nodes regenerated successfully")
 
@@ -980,9 +3450,199 @@ def regenerate_write_nodes():
         print(f"error regenerating nodes: {e}")
 
 
-def create_write_nodes_for_views(krogerWrite, sub_write_node_generator):
-    """Create generated nodes for all current views"""
-    with krogerWrite:
+def get_aspect_value(krogerWrite):
+    """Return the group's aspect knob value with spaces replaced, or an empty string"""
+    aspect_value = ""
+    if krogerWrite.knob("aspect"):
+        aspect_value = krogerWrite["aspect"].getValue().strip()
+
+        if aspect_value and not aspect_value.isspace():
+            aspect_value = aspect_value.replace(" ", "_")
+        else:
+            aspect_value = ""
+
+    return aspect_value
+
+
+def get_variant_name(view, aspect_value):
+    if aspect_value:
+        return f"{view}_{aspect_value}"
+    return view
+
+
+def get_output_mode(krogerWrite):
+    """The group's output mode, per view for groups made before the knob existed"""
+    output_mode_knob = krogerWrite.knob("output_mode")
+    if output_mode_knob and output_mode_knob.value() in OUTPUT_MODES:
+        return output_mode_knob.value()
+    return OUTPUT_MODE_PER_VIEW
+
+
+def generated_node_views(node):
+    """Views a generated node renders, all of them for a multi-view node"""
+    view_name_knob = node.knob("view_name_knob")
+    return view_name_knob.getValue().split() if view_name_knob else []
+
+
+def create_generated_node(view, variant_name, oneview, position, sub_write_node_generator):
+    """Create the write node for one view, tagged with its view and variant"""
+    generated_node = sub_write_node_generator(variant_name, inpanel=False)
+
+
+    if generated_node.knob("views"):
+        generated_node["views"].setValue(view)
+        print(f"  set quick_write views to '{view}'")
+
+    view_name_knob = nuke.String_Knob("view_name_knob", "Render View")
+    view_name_knob.setValue(view)
+    generated_node.addKnob(view_name_knob)
+
+    # Lets refresh_write_nodes tell when the aspect has changed
+    _tag_variant(generated_node, variant_name)
+
+    generated_node.setInput(
+        0, oneview
+    )  # Connect to OneView instead of source_node
+    generated_node.setXYpos(position[0], position[1])
+    generated_node.hideControlPanel()
+    return generated_node
+
+
+def create_multiview_node(views, variant_name, source_node, position, sub_write_node_generator):
+    """Create the one write node that renders every view into multi-view EXRs
+
+    It takes the group input directly, its view_name_knob lists all the views.
+    """
+    generated_node = create_generated_node(
+        " ".join(views), variant_name, source_node, position, sub_write_node_generator
+    )
+    if generated_node.knob("file_type"):
+        generated_node["file_type"].setValue("exr")
+    return generated_node
+
+
+def _tag_variant(node, variant_name):
+    """Record the variant a generated node was made for, see refresh_write_nodes"""
+    variant_name_knob = node.knob("variant_name_knob")
+    if variant_name_knob is None:
+        variant_name_knob = nuke.String_Knob("variant_name_knob", "Variant")
+        variant_name_knob.setVisible(False)
+        node.addKnob(variant_name_knob)
+    variant_name_knob.setValue(variant_name)
+
+
+def retarget_generated_node(node, old_variant, new_variant, sub_write_node_generator):
+    """Point an existing generated node at a new variant, in place
+
+    The generator's nodes for the old and the new variant are built and
+    compared: every knob of the node and of its render Write that still has
+    the old variant's generated value takes the new variant's, knobs that
+    were changed by hand are kept. The node keeps its connections and
+    everything else, only the two reference nodes are deleted again.
+    """
+    old_reference = sub_write_node_generator(old_variant, inpanel=False)
+    new_reference = sub_write_node_generator(new_variant, inpanel=False)
+    try:
+        for target, old_source, new_source in (
+            (node, old_reference, new_reference),
+            (
+                find_render_write(node),
+                find_render_write(old_reference),
+                find_render_write(new_reference),
+            ),
+        ):
+            for knob_name, new_knob in new_source.knobs().items():
+                old_knob = old_source.knob(knob_name)
+                knob = target.knob(knob_name)
+                if knob_name in ("name", "xpos", "ypos") or old_knob is None or knob is None:
+                    continue
+                old_value = old_knob.value()
+                new_value = new_knob.value()
+                if _knob_values_equal(old_value, new_value):
+                    continue
+                if _knob_values_equal(knob.value(), old_value):
+                    knob.setValue(new_value)
+        new_name = new_reference.name()
+    finally:
+        nuke.delete(old_reference)
+        nuke.delete(new_reference)
+
+    node.setName(new_name)
+    _tag_variant(node, new_variant)
+    return node
+
+
+# Open undo_group blocks, only the outermost one begins and ends an undo group
+_undo_depth = 0
+
+
+@contextlib.contextmanager
+def undo_group(name):
+    """Make everything done inside the block a single undo step
+
+    Nested blocks join the outermost one.
+    """
+    global _undo_depth
+    if _undo_depth:
+        _undo_depth += 1
+        try:
+            yield
+        finally:
+            _undo_depth -= 1
+        return
+
+    undo = nuke.Undo()
+    undo.begin(name)
+    _undo_depth = 1
+    try:
+        yield
+    finally:
+        _undo_depth = 0
+        undo.end()
+
+
+def create_oneview(view, source_node, position, bulk=True):
+    """Create the OneView that picks view out of source_node
+
+    bulk uses nuke.nodes, which skips createNode's interactive work: it
+    doesn't deselect every node in the group, auto-place or open a panel.
+    Only the OneViews are built this way, the write nodes come from the
+    quick_write generator, so the saving is limited to half of each pair.
+    """
+    if bulk:
+        oneview = nuke.nodes.OneView(view=view, xpos=position[0], ypos=position[1])
+    else:
+        oneview = nuke.createNode("OneView", inpanel=False)
+        oneview["view"].setValue(view)
+        oneview.setXYpos(position[0], position[1])
+        oneview.hideControlPanel()
+    oneview.setInput(0, source_node)
+    return oneview
+
+
+def create_view_pair(
+    view, variant_name, source_node, position, sub_write_node_generator, bulk=True
+):
+    """Create a OneView and write node pair below position, returns the next position"""
+    x, y = position[0], position[1]
+
+    oneview = create_oneview(view, source_node, (x, y), bulk)
+
+    y += 100
+
+    create_generated_node(view, variant_name, oneview, (x, y), sub_write_node_generator)
+    return [x, y + 100]  # Move position for next pair of nodes
+
+
+def create_write_nodes_for_views(krogerWrite, sub_write_node_generator, bulk=True):
+    """Create generated nodes for all current views
+
+    In the multi-view exr output mode that is a single write node for all
+    views, otherwise a OneView and write node pair per view. All the nodes
+    are created in one undo step. bulk=False creates the OneViews with
+    createNode and logs every view, as this used to.
+    """
+    with undo_group("Create kroger write nodes"), krogerWrite:
 
         input_nodes = [node for node in nuke.allNodes() if node.Class() == "Input"]
         if not input_nodes:
@@ -994,60 +3654,167 @@ def create_write_nodes_for_views(krogerWrite, sub_write_node_generator):
             int(source_node["xpos"].getValue()),
             int(source_node["ypos"].getValue()),
         ]
-        xOffset = 100
         yOffset = 100
         init_position[1] += yOffset
 
 
-        aspect_value = ""
-        if krogerWrite.knob("aspect"):
-            aspect_value = krogerWrite["aspect"].getValue().strip()
+        aspect_value = get_aspect_value(krogerWrite)
 
-            if aspect_value and not aspect_value.isspace():
-                aspect_value = aspect_value.replace(" ", "_")
-            else:
-                aspect_value = ""
 
+        views = nuke.views()
+        if get_output_mode(krogerWrite) == OUTPUT_MODE_MULTIVIEW:
+            print(f"creating one multi-view node for {len(views)} views")
+            create_multiview_node(
+                views,
+                get_variant_name(MULTIVIEW_VARIANT, aspect_value),
+                source_node,
+                init_position,
+                sub_write_node_generator,
+            )
+            return
+
+        if bulk:
+            print(
+                f"creating nodes for {len(views)} views"
+                + (f" with aspect '{aspect_value}'" if aspect_value else " (no aspect)")
+            )
 
-        for view in nuke.views():
+        for view in views:
 
-            if aspect_value:
-                variant_name = f"{view}_{aspect_value}"
+            variant_name = get_variant_name(view, aspect_value)
+            if not bulk and aspect_value:
                 print(
                     f"creating node for view '{view}' with aspect '{aspect_value}' -> variant: '{variant_name}'"
                 )
-            else:
-                variant_name = view
+            elif not bulk:
                 print(f"creating node for view '{view}' (no aspect)")
 
+            init_position = create_view_pair(
+                view,
+                variant_name,
+                source_node,
+                init_position,
+                sub_write_node_generator,
+                bulk,
+            )
+
 
-            oneview = nuke.createNode("OneView", inpanel=False)
-            oneview["view"].setValue(view)
-            oneview.setInput(0, source_node)
-            oneview.setXYpos(init_position[0], init_position[1])
-            oneview.hideControlPanel()
+def refresh_write_nodes(krogerWrite, sub_write_node_generator):
+    """Create, delete or retarget only the view pairs that differ from the script
 
-            init_position[1] += yOffset
+    - pairs for views that no longer exist are deleted
+    - views without a pair get a new one below the existing nodes
+    - write nodes whose variant changed (new aspect) are retargeted in place,
+      see retarget_generated_node, so knobs set by hand are kept
+    - write nodes made before variants were recorded are taken to be current
+      and only tagged with their variant
+    - everything else is left untouched
 
+    In the multi-view exr output mode the single multi-view node is kept,
+    retargeted or recreated the same way, keyed by its list of views. All the
+    changes are one undo step.
+    """
+    with undo_group("Refresh kroger write nodes"), krogerWrite:
+        all_nodes = nuke.allNodes()
+
+        input_nodes = [node for node in all_nodes if node.Class() == "Input"]
+        if not input_nodes:
+            print("Warning: No Input node found")
+            return
 
-            generated_node = sub_write_node_generator(variant_name, inpanel=False)
+        source_node = input_nodes[0]
+        aspect_value = get_aspect_value(krogerWrite)
+        multiview = get_output_mode(krogerWrite) == OUTPUT_MODE_MULTIVIEW
+        if multiview:
+            wanted = {
+                " ".join(nuke.views()): get_variant_name(MULTIVIEW_VARIANT, aspect_value)
+            }
+        else:
+            wanted = {view: get_variant_name(view, aspect_value) for view in nuke.views()}
 
+        existing = {}
+        stale = []
+        for node in all_nodes:
+            view_name_knob = node.knob("view_name_knob")
+            if node.Class() == "Input" or not view_name_knob:
+                continue
+            view = view_name_knob.getValue()
+            if view not in wanted or view in existing:
+                stale.append(node)
+            else:
+                existing[view] = node
 
-            if generated_node.knob("views"):
-                generated_node["views"].setValue(view)
-                print(f"  set quick_write views to '{view}'")
+        for node in stale:
+            print(f"  removing {node.name()}")
+            nuke.delete(node)
 
-            view_name_knob = nuke.String_Knob("view_name_knob", "Render View")
-            view_name_knob.setValue(view)
-            generated_node.addKnob(view_name_knob)
-            generated_node.setInput(
-                0, oneview
-            )  # Connect to OneView instead of source_node
-            generated_node.setXYpos(init_position[0], init_position[1])
-            init_position[1] += yOffset  # Move position for next pair of nodes
-            generated_node.hideControlPanel()
+        created = retargeted = 0
+        next_position = [
+            int(source_node["xpos"].getValue()),
+            max(
+                [int(source_node["ypos"].getValue())]
+                + [node.ypos() for node in nuke.allNodes()]
+            )
+            + 100,
+        ]
 
+        for view, variant_name in wanted.items():
+            node = existing.get(view)
+
+            if node is None and multiview:
+                print(f"  adding multi-view node -> variant '{variant_name}'")
+                create_multiview_node(
+                    view.split(),
+                    variant_name,
+                    source_node,
+                    next_position,
+                    sub_write_node_generator,
+                )
+                created += 1
+                continue
+            if node is None:
+                print(f"  adding pair for view '{view}' -> variant '{variant_name}'")
+                next_position = create_view_pair(
+                    view, variant_name, source_node, next_position, sub_write_node_generator
+                )
+                created += 1
+                continue
+
+            variant_name_knob = node.knob("variant_name_knob")
+            if variant_name_knob is None:
+                # Predates variant tracking, its variant is unknown
+                _tag_variant(node, variant_name)
+                continue
+            if variant_name_knob.getValue() == variant_name:
+                continue
+
+            print(f"  retargeting view '{view}' -> variant '{variant_name}'")
+            retarget_generated_node(
+                node, variant_name_knob.getValue(), variant_name, sub_write_node_generator
+            )
+            retargeted += 1
+
+        # Remove OneViews that no longer feed a generated node
+        used_oneviews = set()
+        for node in nuke.allNodes():
+            if node.knob("view_name_knob") and node.input(0) is not None:
+                used_oneviews.add(node.input(0).name())
+        orphans = [
+            node
+            for node in nuke.allNodes("OneView")
+            if node.name() not in used_oneviews
+        ]
+        for node in orphans:
+            nuke.delete(node)
 
+    get_view_index(krogerWrite).invalidate()
+    print(
+        f"refresh: {created} created, {retargeted} retargeted, "
+        f"{len(stale)} removed, {len(wanted) - created - retargeted} unchanged"
+    )
+
+
+@undo_group("Create kroger write")
 def kroger_write_node(sub_write_node_generator=None):
     if sub_write_node_generator is None:
         import quick_write
@@ -1064,6 +3831,14 @@ def kroger_write_node(sub_write_node_generator=None):
     aspect_knob.setValue("16x9")  # Default aspect ratio
     krogerWrite.addKnob(aspect_knob)
 
+    # Per view pairs, or one write node rendering multi-view EXRs
+    output_mode_knob = nuke.Enumeration_Knob("output_mode", "Output", OUTPUT_MODES)
+    output_mode_knob.setTooltip(
+        "multi-view exr renders every view into one EXR per frame from a single "
+        "write node. Refresh nodes after changing this."
+    )
+    krogerWrite.addKnob(output_mode_knob)
+
 
     divider1 = nuke.Text_Knob("divider1", "")
     krogerWrite.addKnob(divider1)
@@ -1093,6 +3868,11 @@ def kroger_write_node(sub_write_node_generator=None):
     krogerWrite.addKnob(batch_publish_knob)
 
 
+    verify_knob = nuke.PyScript_Knob("verify_renders_button", "Verify Renders")
+    verify_knob.setValue("kroger_write.verify_button_callback()")
+    krogerWrite.addKnob(verify_knob)
+
+
     divider2 = nuke.Text_Knob("divider2", "")
     krogerWrite.addKnob(divider2)
 
@@ -1129,6 +3909,42 @@ def kroger_write_node(sub_write_node_generator=None):
 """
 
 
+def current_publish_version():
+    """Version the open script would publish as, from its file name, or None"""
+    _, version_parser = kroger_publish_index.publish_layout()
+    return version_parser(nuke.root().name())
+
+
+def published_conflicts(kroger_node, views=None, version=None):
+    """{view: published path} for views whose version is already published
+
+    Views are matched to the publish area by their variant name. version
+    defaults to the open script's. Empty when there is no publish root or the
+    script has no version.
+    """
+    index = kroger_publish_index.get_publish_index()
+    if version is None:
+        version = current_publish_version()
+    if index is None or version is None:
+        return {}
+
+    view_to_node = get_view_index(kroger_node).mapping()
+    view_variants = {}
+    for view_name in views if views is not None else view_to_node:
+        node = view_to_node.get(view_name)
+        if node is not None:
+            view_variants[view_name] = _knob_value(node, "variant_name_knob", view_name)
+
+    with kroger_trace.span("published index"):
+        found = index.conflicts(set(view_variants.values()), version)
+    return {
+        view_name: found[variant]
+        for view_name, variant in view_variants.items()
+        if variant in found
+    }
+
+
+@kroger_trace.trace("publish")
 def batch_publish(
     selected_views=None,
     review=True,
@@ -1137,16 +3953,33 @@ def batch_publish(
     burnin=True,
     silent=True,
     kroger_node=None,
+    publish_module=None,
+    skip_published=True,
 ):
-    try:
-        import hornet_publish_utils  # noqa: F401
+    """Publish the generated write nodes of the selected views
+
+    publish_module defaults to hornet_publish_utils. All nodes go to one
+    batch_publish_write_nodes call on the main thread with PUBLISH_DELAY
+    between nodes. It touches the node graph and shows one summary popup
+    per call, so it can't run on worker threads or once per node, and it
+    reports failed nodes in that popup rather than raising, so nothing is
+    retried here. With skip_published, nodes whose version is already in the
+    publish area are left out, as their publish would fail. Without a publish
+    root, see kroger_publish_index, nothing is skipped.
+
+    Returns (nodes sent to publish, error): error is what the call raised, in
+    which case any of the nodes may or may not have been published. None if
+    nothing was published.
+    """
+    if publish_module is None:
+        try:
+            import hornet_publish_utils as publish_module
 
-        print("[OK] Successfully imported hornet_publish_utils")
-    except ImportError as e:
-        error_msg = f"[ERROR] Error importing hornet_publish_utils: {e}"
-        print(error_msg)
-        nuke.message(error_msg)
-        return
+            print("[OK] Successfully imported hornet_publish_utils")
+        except ImportError as e:
+            error_msg = f"[ERROR] Error importing hornet_publish_utils: {e}"
+            show_message(error_msg)
+            return
 
     try:
         # Get the current node
@@ -1182,7 +4015,7 @@ def batch_publish(
                     if view_name_knob:
                         view_name = view_name_knob.getValue()
                         print(f"    Node view: '{view_name}'")
-                        if view_name not in selected_views:
+                        if not set(view_name.split()) & set(selected_views):
                             print(
                                 f"    [SKIP] Skipping {node_name} - view '{view_name}' not in selected views"
                             )
@@ -1193,6 +4026,19 @@ def batch_publish(
                 publis_nodes.append(node)
                 print(f"    [OK] Added {node_name} to publish list")
 
+        already_published = {}
+        if skip_published and publis_nodes:
+            conflicts = published_conflicts(krogerWrite)
+            for node in publis_nodes:
+                for view_name in generated_node_views(node):
+                    if view_name in conflicts:
+                        already_published[node.name()] = conflicts[view_name]
+            for node_name, path in already_published.items():
+                print(f"  [SKIP] {node_name} - version already published: {path}")
+            publis_nodes = [
+                node for node in publis_nodes if node.name() not in already_published
+            ]
+
         print(f"Final publish list: {len(publis_nodes)} nodes")
         for i, node in enumerate(publis_nodes):
             view_knob = node.knob("view_name_knob")
@@ -1200,9 +4046,14 @@ def batch_publish(
             print(f"  {i + 1}. {node.name()} (view: {view_name})")
 
         if not publis_nodes:
-            error_msg = "[ERROR] No publish nodes found matching criteria"
-            print(error_msg)
-            nuke.message(error_msg)
+            if already_published:
+                error_msg = (
+                    f"[ERROR] All {len(already_published)} selected nodes are "
+                    "already published at this version"
+                )
+            else:
+                error_msg = "[ERROR] No publish nodes found matching criteria"
+            show_message(error_msg)
             return
 
         print("Starting batch publish with hornet_publish_utils...")
@@ -1211,17 +4062,38 @@ def batch_publish(
         )
         print(f"   Parameters: burnin={burnin}, silent={silent}")
 
-        hornet_publish_utils.batch_publish_write_nodes(
-            publis_nodes,
-            delay=0.25,
-            review=review,
-            review_farm=review_farm,
-            integrate_farm=integrate_farm,
-            burnin=burnin,
-            silent=silent,
-        )
+        error = None
+        try:
+            with kroger_trace.span("publish nodes", nodes=len(publis_nodes)):
+                publish_module.batch_publish_write_nodes(
+                    publis_nodes,
+                    delay=PUBLISH_DELAY,
+                    review=review,
+                    review_farm=review_farm,
+                    integrate_farm=integrate_farm,
+                    burnin=burnin,
+                    silent=silent,
+                )
+        except Exception as e:
+            error = e
 
-        print("[OK] Batch publish completed successfully")
+        skipped_text = ""
+        if already_published:
+            skipped_text = (
+                f"\nSkipped as already published: {', '.join(already_published)}"
+            )
+        if error is not None:
+            # The call stopped part way, earlier nodes may have published
+            print(f"[ERROR] Batch publish stopped: {error}")
+            show_message(
+                f"Batch publish of {len(publis_nodes)} nodes stopped with an error, "
+                f"some may have published:\n{error}{skipped_text}"
+            )
+        elif already_published:
+            show_message(f"Sent {len(publis_nodes)} nodes to publish.{skipped_text}")
+        else:
+            print(f"[OK] Batch publish ran for {len(publis_nodes)} nodes")
+        return publis_nodes, error
 
     except Exception as e:
         error_msg = f"[ERROR] Batch publish error: {str(e)}"
@@ -1231,5 +4103,5 @@ def batch_publish(
 
         print("   Full traceback:")
         traceback.print_exc()
-        nuke.message(error_msg)
+        show_message(error_msg)
         return
@@ -1,9 +1,36 @@
 
 try:
+    import importlib.util
+    import sys
+
+    import __main__
     import nuke
-    import quick_write
-    import kroger_write
-    # from kroger_write import submit_button_callback
+
+
+    def lazy_import(name):
+        """Return module name, imported on first attribute access
+
+        Keeps Nuke startup from paying for kroger_write (and PySide2) until
+        a Kroger command or knob is actually used.
+        """
+        if name in sys.modules:
+            return sys.modules[name]
+
+        spec = importlib.util.find_spec(name)
+        if spec is None:
+            raise ImportError(f"No module named '{name}'")
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+        return module
+
+
+    # Knob and toolbar commands like "kroger_write.submit_button_callback()"
+    # run in __main__, so the lazy modules live there
+    __main__.quick_write = quick_write = lazy_import("quick_write")
+    __main__.kroger_write = kroger_write = lazy_import("kroger_write")
 
 
     nodes_toolbar = nuke.toolbar("Nodes")
@@ -17,6 +44,12 @@ try:
         "kroger_write.kroger_write_node(quick_write._quick_write_node)",
         tooltip="Create a kroger write node that generates write nodes for all views",
 )
-    
+
+    project_toolbar.addCommand(
+        "Submit All Kroger Writes",
+        "kroger_write.submit_all_kroger_writes()",
+        tooltip="Submit every kroger write node in the script with its saved settings",
+    )
+
 except Exception as e:
-    print(f"Error loading Kroger tools: {e}")
\ No newline at end of file
+    print(f"Error loading Kroger tools: {e}")
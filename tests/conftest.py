@@ -0,0 +1,13 @@
+"""Run the tests against the nuke, PySide2 and studio stand-ins in benchmarks"""
+
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BENCHMARKS_DIR = os.path.join(REPO_DIR, "benchmarks")
+
+sys.path[:0] = [REPO_DIR, os.path.join(BENCHMARKS_DIR, "stubs")]
+try:
+    import PySide2  # noqa: F401
+except ImportError:
+    sys.path.append(os.path.join(BENCHMARKS_DIR, "qt_stubs"))
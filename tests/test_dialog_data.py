@@ -0,0 +1,86 @@
+import base64
+import zlib
+
+import pytest
+
+import kroger_write
+
+
+def dialog_data(view_count=3):
+    views = [f"view{index}" for index in range(view_count)]
+    view_data = {view: {"frame_range": "1001-1100", "priority": 60} for view in views}
+    view_data["view0"] = {"frame_range": "1001-1010", "priority": 80}
+    return {
+        "global_frame_range": "1001-1100",
+        "global_priority": 60,
+        "chunk_size": 5,
+        "file_format": "exr",
+        "selected_views": views,
+        "view_data": view_data,
+    }
+
+
+def test_round_trip():
+    data = dialog_data()
+    encoded = kroger_write.encode_dialog_data(data)
+    assert encoded.startswith(kroger_write.DIALOG_DATA_PREFIX)
+    assert kroger_write.decode_dialog_data(encoded) == data
+
+
+def test_only_overrides_are_stored():
+    encoded = kroger_write.encode_dialog_data(dialog_data())
+    assert "view0" in encoded
+    assert "view1" not in encoded.split('"view_overrides"')[1]
+    assert "view2" not in encoded.split('"view_overrides"')[1]
+
+
+def test_unselected_views_with_global_values_are_dropped():
+    data = dialog_data()
+    data["selected_views"] = ["view1"]
+    decoded = kroger_write.decode_dialog_data(kroger_write.encode_dialog_data(data))
+    assert sorted(decoded["view_data"]) == ["view0", "view1"]
+
+
+def test_compressed_round_trip():
+    data = dialog_data()
+    encoded = kroger_write.encode_dialog_data(data, compress=True)
+    assert encoded.startswith(kroger_write.DIALOG_DATA_COMPRESSED_PREFIX)
+    assert kroger_write.decode_dialog_data(encoded) == data
+
+
+def test_large_data_is_compressed():
+    data = dialog_data(500)
+    data["view_data"] = {
+        view: {"frame_range": f"{index}-{index + 10}", "priority": 60}
+        for index, view in enumerate(data["view_data"])
+    }
+    encoded = kroger_write.encode_dialog_data(data)
+    assert encoded.startswith(kroger_write.DIALOG_DATA_COMPRESSED_PREFIX)
+    assert kroger_write.decode_dialog_data(encoded) == data
+
+
+def test_legacy_format():
+    data = {"chunk_size": 5, "selected_views": ["left"], "view_data": {}}
+    assert kroger_write.decode_dialog_data(str(data)) == data
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "[1, 2]",
+        kroger_write.DIALOG_DATA_PREFIX + '{"version": 1}',
+        kroger_write.DIALOG_DATA_PREFIX + '{"version": 2, "globals": {"chunk_size": "5"}}',
+        kroger_write.DIALOG_DATA_PREFIX + '{"version": 2, "selected_views": "left"}',
+        kroger_write.DIALOG_DATA_COMPRESSED_PREFIX
+        + base64.b64encode(b"not zlib").decode("ascii"),
+    ],
+)
+def test_malformed_data_is_rejected(encoded):
+    with pytest.raises(ValueError):
+        kroger_write.decode_dialog_data(encoded)
+
+
+def test_truncated_compressed_data_is_rejected():
+    packed = base64.b64encode(zlib.compress(b'{"version": 2}')[:-4]).decode("ascii")
+    with pytest.raises(ValueError):
+        kroger_write.decode_dialog_data(kroger_write.DIALOG_DATA_COMPRESSED_PREFIX + packed)
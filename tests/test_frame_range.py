@@ -0,0 +1,66 @@
+import pytest
+
+import kroger_write
+
+
+@pytest.mark.parametrize(
+    "expression, frames",
+    [
+        ("1001", [1001]),
+        ("1001-1005", [1001, 1002, 1003, 1004, 1005]),
+        ("1001-1010x3", [1001, 1004, 1007, 1010]),
+        ("1001,1005 1003", [1001, 1003, 1005]),
+        ("1005-1001", [1001, 1002, 1003, 1004, 1005]),
+        ("-3--1", [-3, -2, -1]),
+        ("1001 - 1003", [1001, 1002, 1003]),
+        ("1001- 1003", [1001, 1002, 1003]),
+        ("1001-1005 x 2", [1001, 1003, 1005]),
+        ("-3 - -1", [-3, -2, -1]),
+        ("1 -5", [-5, 1]),
+        ("-10 -1", [-10, -1]),
+        ("1001-1003, 1002", [1001, 1002, 1003]),
+    ],
+)
+def test_parse_frame_range(expression, frames):
+    assert kroger_write.parse_frame_range(expression) == frames
+
+
+@pytest.mark.parametrize("expression", ["", " , ", "a-b", "1001-", "1-10x0", "1--"])
+def test_parse_frame_range_rejects(expression):
+    with pytest.raises(ValueError):
+        kroger_write.parse_frame_range(expression)
+
+
+def test_parse_frame_range_limits_frame_count():
+    with pytest.raises(ValueError):
+        kroger_write.parse_frame_range(f"1-{kroger_write.MAX_FRAMES_PER_RANGE + 1}")
+
+
+@pytest.mark.parametrize(
+    "frames, expression",
+    [
+        ([1001], "1001"),
+        ([1001, 1002, 1003], "1001-1003"),
+        ([1001, 1003, 1005, 1007], "1001-1007x2"),
+        ([1, 2, 3, 10, 20], "1-3,10,20"),
+        ([-2, -1, 0], "-2-0"),
+    ],
+)
+def test_compact_frame_range(frames, expression):
+    assert kroger_write.compact_frame_range(frames) == expression
+
+
+@pytest.mark.parametrize(
+    "expression",
+    ["1001-1100", "1001-1100x2, 1150, 1200-1210", "-10--1 5", "1 3 7 8 9 20-40x5"],
+)
+def test_compact_frame_range_round_trip(expression):
+    frames = kroger_write.parse_frame_range(expression)
+    compact = kroger_write.compact_frame_range(frames)
+    assert kroger_write.parse_frame_range(compact) == frames
+
+
+def test_frames_to_render_spans_gaps_unless_exact():
+    frames = kroger_write.parse_frame_range("1001-1009x2")
+    assert kroger_write.frames_to_render(frames) == frames
+    assert kroger_write.frames_to_render(frames, exact=False) == list(range(1001, 1010))
@@ -0,0 +1,44 @@
+import kroger_write
+
+
+def data_for(frame_ranges, **view_flags):
+    return {
+        "view_data": {
+            view: dict({"frame_range": frame_range}, **view_flags.get(view, {}))
+            for view, frame_range in frame_ranges.items()
+        }
+    }
+
+
+def test_short_views_share_jobs():
+    data = data_for({"a": "1-10", "b": "1-10", "c": "1-10", "d": "1-10"})
+    view_nodes = [(view, view) for view in data["view_data"]]
+    packs, single = kroger_write.pack_views(
+        view_nodes, data, target_seconds=25, seconds_per_frame=dict.fromkeys("abcd", 1)
+    )
+    assert sorted(sorted(view for view, _ in pack) for pack in packs) == [
+        ["a", "b"],
+        ["c", "d"],
+    ]
+    assert single == []
+
+
+def test_long_gapped_and_multiview_views_stay_single():
+    data = data_for(
+        {"long": "1-100", "gapped": "1-5,10-15", "multi": "1-5", "short": "1-5"},
+        multi={"multiview": True},
+    )
+    view_nodes = [(view, view) for view in data["view_data"]]
+    packs, single = kroger_write.pack_views(
+        view_nodes, data, target_seconds=50, seconds_per_frame=dict.fromkeys(data["view_data"], 1)
+    )
+    assert packs == []
+    assert sorted(view for view, _ in single) == ["gapped", "long", "multi", "short"]
+
+
+def test_views_without_history_use_the_default_estimate():
+    data = data_for({"a": "1-2", "b": "1-2"})
+    view_nodes = [(view, view) for view in data["view_data"]]
+    target = kroger_write.PACK_DEFAULT_SECONDS_PER_FRAME * 4
+    packs, single = kroger_write.pack_views(view_nodes, data, target, seconds_per_frame={})
+    assert [sorted(view for view, _ in pack) for pack in packs] == [["a", "b"]]
@@ -0,0 +1,89 @@
+import struct
+
+import pytest
+
+import kroger_verify
+
+
+def dpx_file(image_size=64, endian=">"):
+    magic = b"SDPX" if endian == ">" else b"XPDS"
+    image_offset = kroger_verify.DPX_GENERIC_HEADER_SIZE
+    header = magic + struct.pack(
+        f"{endian}I8sI", image_offset, b"V2.0\0\0\0\0", image_offset + image_size
+    )
+    return header.ljust(image_offset, b"\0") + b"\1" * image_size
+
+
+def exr_attribute(name, attribute_type, value):
+    return (
+        name.encode() + b"\0" + attribute_type.encode() + b"\0"
+        + struct.pack("<i", len(value)) + value
+    )
+
+
+def exr_file(height=2, chunk_bytes=8):
+    """Single part, uncompressed scanline EXR with one line per chunk"""
+    header = (
+        kroger_verify.EXR_MAGIC
+        + struct.pack("<I", 2)
+        + exr_attribute("compression", "compression", b"\0")
+        + exr_attribute("dataWindow", "box2i", struct.pack("<4i", 0, 0, 0, height - 1))
+        + b"\0"
+    )
+    chunks_start = len(header) + height * 8
+    chunk_size = 8 + chunk_bytes
+    offsets = [chunks_start + line * chunk_size for line in range(height)]
+    chunks = b"".join(
+        struct.pack("<ii", line, chunk_bytes) + b"\1" * chunk_bytes
+        for line in range(height)
+    )
+    return header + struct.pack(f"<{height}Q", *offsets) + chunks
+
+
+@pytest.mark.parametrize("endian", [">", "<"])
+def test_complete_dpx(endian):
+    assert kroger_verify.check_dpx(dpx_file(endian=endian)) is None
+
+
+def test_truncated_dpx():
+    data = dpx_file()
+    assert kroger_verify.check_dpx(data[:100]) == "truncated header"
+    assert kroger_verify.check_dpx(data[:-10]).startswith("truncated,")
+    assert kroger_verify.check_dpx(b"JUNK" + data[4:]) == "not a DPX file"
+
+
+def test_complete_exr():
+    assert kroger_verify.check_exr(exr_file()) is None
+
+
+def test_truncated_exr_header():
+    data = exr_file()
+    assert kroger_verify.check_exr(data[:6]) == "truncated header"
+    assert kroger_verify.check_exr(data[:30]) == "truncated header"
+    assert kroger_verify.check_exr(b"JUNK" + data[4:]) == "not an EXR file"
+
+
+def test_truncated_exr_data():
+    data = exr_file()
+    assert kroger_verify.check_exr(data[:-4]).startswith("truncated, last chunk")
+
+
+def test_exr_with_unfinished_offset_table():
+    data = bytearray(exr_file())
+    table = data.index(struct.pack("<Q", len(data) - 16))
+    data[table : table + 8] = bytes(8)
+    assert kroger_verify.check_exr(bytes(data)).startswith("incomplete offset table")
+
+
+def test_verify_frame(tmp_path):
+    complete = tmp_path / "frame.1001.exr"
+    complete.write_bytes(exr_file())
+    empty = tmp_path / "frame.1002.exr"
+    empty.write_bytes(b"")
+    truncated = tmp_path / "frame.1003.dpx"
+    truncated.write_bytes(dpx_file()[:-1])
+
+    assert kroger_verify.verify_frame(str(complete)) is None
+    assert kroger_verify.verify_frame(str(empty)) == "empty"
+    assert kroger_verify.verify_frame(str(truncated)).startswith("truncated")
+    assert kroger_verify.verify_frame(str(tmp_path / "frame.1004.exr")) == "missing"